@@ -0,0 +1,116 @@
+'''
+File name: artifact.py
+    Model artifacts: versioned bundles of a trained model and everything needed
+    for forecasting with it (preprocessing, feature schema, recent history).
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# Python packages
+import os
+from joblib import dump, load
+
+'''
+Constants
+'''
+# Version of the artifact bundle layout, artifacts of other versions are
+# rejected when loaded
+C_ARTIFACT_VERSION = 1
+
+# Keys of an artifact bundle
+C_ARTIFACT_KEYS = ('version', 'created', 'input_file', 'model_family', 'model',
+    'model_params', 'normalize', 'standardize', 'scaler', 'columns', 'dtypes',
+    'lag_features', 'lags', 'rolling_windows', 'data_hash', 'history')
+
+# Loaded artifacts per absolute file name: (modification time, bundle)
+_loaded = {}
+
+
+def saveArtifact(bundle, file_name):
+    '''
+    Saves an artifact bundle. The directory of the file is created if it does
+    not exist.
+
+    Args:
+        bundle (dictionary): The artifact, keys are C_ARTIFACT_KEYS (except
+            version, which is added):
+            created (string): Creation time stamp.
+            input_file (string): The input data file of the model.
+            model_family (string): One of trafficForecast.C_SUPPORTED_MODELS.
+            model (MODEL): The trained model.
+            model_params (dictionary): The parameters of the model.
+            normalize, standardize (booleans): Preprocessing flags.
+            scaler (StandardScaler): The fitted scaler, None if not standardized.
+            columns (list of strings): The columns of the model input, the
+                requests column is the last.
+            dtypes (dictionary): The schema types of the columns.
+            lag_features (boolean): If the lag features are part of the input.
+            lags, rolling_windows (tuples of integers): The lag features.
+            data_hash (string): Hash of the training data.
+            history (DataFrame): The last time steps of the input data (date
+                tokens and requests), the forecasts start after them.
+
+        file_name (string): The artifact file.
+
+    Raises:
+        ValueError: When the bundle keys are not the C_ARTIFACT_KEYS.
+
+    Returns:
+        -
+    '''
+
+    bundle = dict(bundle, version = C_ARTIFACT_VERSION)
+
+    if set(bundle.keys()) != set(C_ARTIFACT_KEYS):
+        raise ValueError('bundle argument error. Keys given are ' +
+            str(sorted(bundle.keys())) + ', where expected keys are ' +
+            str(sorted(C_ARTIFACT_KEYS)))
+
+    directory = os.path.dirname(file_name)
+
+    if directory != '':
+        os.makedirs(directory, exist_ok = True)
+
+    # Written aside and renamed, readers never see a partial file
+    dump(bundle, file_name + '.tmp')
+    os.replace(file_name + '.tmp', file_name)
+
+
+def loadArtifact(file_name):
+    '''
+    Loads an artifact bundle. The bundle is read from the disk once, and again
+    only when the file is modified (e.g. replaced by a newer artifact).
+
+    Args:
+        file_name (string): The artifact file.
+
+    Raises:
+        ValueError: When the artifact version is not C_ARTIFACT_VERSION.
+
+    Returns:
+        dictionary: The artifact bundle, see saveArtifact().
+    '''
+
+    key = os.path.abspath(file_name)
+    modified = os.stat(key).st_mtime_ns
+
+    if key in _loaded and _loaded[key][0] == modified:
+        return _loaded[key][1]
+
+    bundle = load(key)
+
+    if bundle.get('version') != C_ARTIFACT_VERSION:
+        raise ValueError('file_name argument error. Artifact version is \'' +
+            str(bundle.get('version')) + '\', where supported version is \'' +
+            str(C_ARTIFACT_VERSION) + '\'')
+
+    _loaded[key] = (modified, bundle)
+
+    return bundle
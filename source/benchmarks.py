@@ -0,0 +1,434 @@
+'''
+File name: benchmarks.py
+    Benchmarks for the performance critical parts of the traffic forecast
+    project.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# My packages
+import dataIO as dio
+import windowing as wd
+import trafficForecast as tf
+from rnn import RNN
+from dataFactory import DataFactory
+
+# Python packages
+import os, sys, argparse, time, tempfile
+import numpy as np
+
+'''
+Constants
+'''
+# Examples text to be shown with the -h input option
+C_EXAMPLES = 'Usage Example:\nBenchmark the date tokenization of the raw input ' +\
+    'data file.\n\n$python benchmarks.py -b tokenization -f ../data/input/'       +\
+    'traffic_stats.csv\n\nBenchmark the load time of a processed data file for ' +\
+    'each supported storage format.\n\n$python benchmarks.py -b storage -f '      +\
+    '../data/processed/traffic_stats_HOURLY_CHs.csv\n\nBenchmark the lag feat'   +\
+    'ures windowing of a processed data file.\n\n$python benchmarks.py -b '      +\
+    'windowing -f ../data/processed/traffic_stats_HOURLY_CHs.csv\n\nBenchmark' +\
+    ' the RNN training and prediction throughput.\n\n$python benchmarks.py '   +\
+    '-b rnn -f ../data/processed/traffic_stats_HOURLY_CHs.csv\n\nBenchmark t'  +\
+    'he forecast latency of the model artifacts.\n\n$python -W ignore benchm'   +\
+    'arks.py -b forecast -f ../data/processed/traffic_stats_HOURLY_CHs.csv\n'
+
+# Mini-batch sizes of the RNN benchmark
+C_RNN_BATCH_SIZES = (1, 32, 256)
+
+# Models (family, parameters, preprocessing) and horizons of the forecast 
+# benchmark
+C_FORECAST_MODELS = (('DNN', None, True), ('RNN', {'epochs': 1}, False))
+C_FORECAST_HORIZONS = (1, 24, 168)
+
+# Hosts of the batch forecast benchmark, they share the artifact of the model
+C_FORECAST_HOSTS = ('as-01', 'as-02', 'as-03', 'as-04')
+
+
+def _timeIt(function, repeat):
+    '''
+    Executes a function several times and measures the best execution time.
+
+    Args:
+        function (callable): The function to be executed, without arguments.
+
+        repeat (integer): Number of executions.
+
+    Raises:
+        -
+
+    Returns:
+        float: The best execution time in seconds.
+
+        object: The value returned by the last execution of the function.
+    '''
+
+    best_time = None
+
+    for i in range(repeat):
+        start_time = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start_time
+
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+
+    return best_time, result
+
+
+def benchmarkTokenization(file_name, repeat = 3):
+    '''
+    Compares the per row (datetime.strptime) date tokenization with the
+    vectorized one used by the DataFactory, on the date column of a raw input
+    data file. Both paths should produce exactly the same tokens.
+
+    Args:
+        file_name (string): The raw input data file.
+
+        repeat (integer, default is 3): Number of executions for each path, the
+            best time is reported.
+
+    Raises:
+        -
+
+    Returns:
+        dictionary: Execution times (seconds), keys are 'per_row', 'vectorized'.
+    '''
+
+    data_factory = DataFactory(file_name = file_name)
+    date_column = data_factory._data_file.date
+
+    print('\nDate tokenization benchmark: file_name = ', file_name,
+        ', rows = ', len(date_column.index), sep = '')
+
+    def perRow():
+        t_dt = [data_factory._tokenizeDateTime(x) for x in date_column.to_list()]
+
+        return {k: [x[k] for x in t_dt] for k in ['year', 'month', 'day',
+            'week_day', 'hour']}
+
+    per_row_time, per_row_tokens = _timeIt(perRow, repeat)
+    vectorized_time, vectorized_tokens = _timeIt(lambda:
+        data_factory._tokenizeDateTimeColumn(date_column), repeat)
+
+    identical = all(vectorized_tokens[k].to_list() == v for k, v in
+        per_row_tokens.items())
+
+    print('- Per row    : ', round(per_row_time, 3), ' seconds', sep = '')
+    print('- Vectorized : ', round(vectorized_time, 3), ' seconds (x',
+        round(per_row_time/vectorized_time, 1), ')', sep = '')
+    print('- Tokens memory, vectorized: ',
+        vectorized_tokens.memory_usage(index = False).sum(), ' bytes', sep = '')
+    print('- Identical tokens: ', identical, sep = '')
+
+    return {'per_row': per_row_time, 'vectorized': vectorized_time}
+
+
+def benchmarkStorage(file_name, repeat = 3):
+    '''
+    Compares the load time of a data file for each supported storage format 
+    (see dataIO.C_FILE_FORMATS). The data are written once in each format, in
+    a temporary directory. Memory mapped (mmap) data are opened lazily, their
+    pages are read on first access. Formats which require a missing optional package 
+    (e.g. pyarrow for Parquet/Feather) are skipped.
+
+    Args:
+        file_name (string): The data file, in any supported format.
+
+        repeat (integer, default is 3): Number of loads for each format, the
+            best time is reported.
+
+    Raises:
+        -
+
+    Returns:
+        dictionary: Load times (seconds) per file format.
+    '''
+
+    data = dio.readData(file_name)
+
+    print('\nStorage load time benchmark: file_name = ', file_name,
+        ', rows = ', len(data.index), sep = '')
+
+    load_times = {}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for file_format in dio.C_FILE_FORMATS.keys():
+            format_file = os.path.join(temp_dir, 'data.' + file_format)
+
+            try:
+                dio.writeData(data, format_file)
+            except ImportError as e:
+                print('- ', file_format.ljust(8), ': skipped, ', 
+                    str(e).splitlines()[0], sep = '')
+                continue
+
+            load_times[file_format], loaded = _timeIt(lambda:
+                dio.readData(format_file), repeat)
+
+            # Memory mapped data are a directory of column files
+            if os.path.isdir(format_file):
+                size = sum(os.path.getsize(os.path.join(format_file, f)) for f
+                    in os.listdir(format_file))
+            else:
+                size = os.path.getsize(format_file)
+
+            print('- ', file_format.ljust(8), ': ',
+                round(load_times[file_format], 4), ' seconds (x',
+                round(load_times['csv']/load_times[file_format], 1), '), ',
+                'size = ', size, ' bytes, dtypes = ',
+                loaded.dtypes.astype(str).to_list(), sep = '')
+
+    return load_times
+
+
+def benchmarkWindowing(file_name, repeat = 3):
+    '''
+    Compares the lag features of the windowing module (sliding windows of the
+    series, the lag columns are copied) with the ones built from shifted copies
+    of the data frame, on a processed data file of a single series. Both should
+    produce the same features.
+
+    Args:
+        file_name (string): The processed data file (combined hosts).
+
+        repeat (integer, default is 3): Number of executions for each path, the
+            best time is reported.
+
+    Raises:
+        -
+
+    Returns:
+        dictionary: Execution times (seconds), keys are 'shifted', 'windowing'.
+    '''
+
+    data = dio.readData(file_name)
+    
+    data_granularity = wd.granularity(data)
+    lags = wd.C_LAGS[data_granularity]
+    rolling_windows = wd.C_ROLLING_WINDOWS[data_granularity]
+
+    print('\nLag features windowing benchmark: file_name = ', file_name,
+        ', rows = ', len(data.index), ', lags = ', lags, 
+        ', rolling windows = ', rolling_windows, sep = '')
+
+    def shifted():
+        series = wd.regularize(data)
+        features = series.drop(columns = 'requests')
+
+        for l in lags:
+            features['requests_lag_' + str(l)] = series.requests.shift(l)
+            
+        for w in rolling_windows:
+            features['requests_mean_' + str(w)] = \
+                series.requests.shift(1).rolling(w).mean()
+                
+        features['requests'] = series.requests
+        
+        return features.iloc[max(lags + rolling_windows):].reset_index(
+            drop = True)
+
+    shifted_time, shifted_features = _timeIt(shifted, repeat)
+    windowing_time, windowing_features = _timeIt(lambda: 
+        wd.addLagFeatures(data), repeat)
+
+    identical = shifted_features.columns.equals(windowing_features.columns) \
+        and all(np.allclose(shifted_features[c], windowing_features[c]) for c
+        in shifted_features.columns)
+
+    print('- Shifted copies : ', round(shifted_time, 4), ' seconds', sep = '')
+    print('- Windowing      : ', round(windowing_time, 4), ' seconds (x',
+        round(shifted_time/windowing_time, 1), ')', sep = '')
+    print('- Features memory, windowing: ', windowing_features.memory_usage(
+        index = False).sum(), ' bytes', sep = '')
+    print('- Identical features: ', identical, sep = '')
+
+    return {'shifted': shifted_time, 'windowing': windowing_time}
+
+
+def benchmarkRNN(file_name, repeat = 3, samples = 8192):
+    '''
+    Measures the training and prediction throughput (samples per second) of the
+    RNN model, for several mini-batch sizes (see C_RNN_BATCH_SIZES). A mini-
+    batch of size 1 corresponds to a per sample implementation. Each training
+    execution is a single epoch over the windows of the first samples rows of
+    the data, the prediction is for the rows that follow them.
+
+    Args:
+        file_name (string): The processed data file (combined hosts).
+
+        repeat (integer, default is 3): Number of executions for each batch
+            size, the best time is reported.
+
+        samples (integer, default is 8192): Maximum number of training rows.
+
+    Raises:
+        -
+
+    Returns:
+        dictionary: Training samples per second per batch size, and prediction
+            samples per second (key 'predict').
+    '''
+
+    data = dio.readData(file_name)
+
+    train_data = data.iloc[:samples]
+    test_data = data.iloc[samples:2*samples]
+
+    print('\nRNN throughput benchmark: file_name = ', file_name,
+        ', train rows = ', len(train_data.index), ', predict rows = ',
+        len(test_data.index), sep = '')
+
+    throughput = {}
+
+    for batch_size in C_RNN_BATCH_SIZES:
+        model = RNN(model_params = {'batch_size': batch_size, 'epochs': 1})
+        train_time, _ = _timeIt(lambda: model.train(train_data), repeat)
+
+        windows = len(train_data.index) - model._params['window']
+        throughput[batch_size] = windows/train_time
+
+        print('- Train, batch size ', str(batch_size).ljust(4), ': ',
+            round(throughput[batch_size]), ' samples/sec (x',
+            round(throughput[batch_size]/throughput[C_RNN_BATCH_SIZES[0]], 1),
+            '), loss = ', round(model.loss_curve[-1], 4), sep = '')
+
+    predict_time, _ = _timeIt(lambda: model.predict(test_data), repeat)
+    throughput['predict'] = len(test_data.index)/predict_time
+
+    print('- Predict               : ', round(throughput['predict']),
+        ' samples/sec', sep = '')
+
+    return throughput
+
+
+def benchmarkForecast(file_name, repeat = 3):
+    '''
+    Measures the forecast latency of model artifacts (see trafficForecast.py), 
+    for several horizons (see C_FORECAST_HORIZONS). The models are trained 
+    once, their artifacts are saved in a temporary directory. The first 
+    forecast loads the artifact, the next ones use the loaded one. The batch 
+    forecast of every horizon up to the longest one for several hosts (see 
+    C_FORECAST_HOSTS) is compared with a forecast per request.
+
+    Args:
+        file_name (string): The processed data file (combined hosts).
+
+        repeat (integer, default is 3): Number of forecasts for each horizon,
+            the best time is reported.
+
+    Raises:
+        -
+
+    Returns:
+        dictionary: Forecast latency (seconds) per model family and horizon,
+            and per model family and 'batch', 'per_request' for the batch 
+            benchmark.
+    '''
+
+    traffic_forecast = tf.TF(input_file = file_name, test_split = 0.2)
+
+    print('\nForecast latency benchmark: file_name = ', file_name, sep = '')
+
+    latency = {}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for model, model_params, preprocess in C_FORECAST_MODELS:
+            artifact_file = traffic_forecast.train(normalize = preprocess, 
+                standardize = preprocess, model = model, 
+                model_params = model_params, 
+                artifact_file = os.path.join(temp_dir, model + '.dump'))
+
+            load_time, _ = _timeIt(lambda: tf.forecast(artifact_file, 1), 1)
+
+            print('- ', model.ljust(4), ' first forecast (load): ', 
+                round(load_time*1000, 2), ' ms', sep = '')
+
+            for horizon in C_FORECAST_HORIZONS:
+                latency[(model, horizon)], _ = _timeIt(lambda: 
+                    tf.forecast(artifact_file, horizon), repeat)
+
+                print('- ', model.ljust(4), ' horizon ', str(horizon).ljust(4),
+                    '         : ', round(latency[(model, horizon)]*1000, 2), 
+                    ' ms', sep = '')
+                    
+            requests = [(h, None, i) for h in C_FORECAST_HOSTS for i in 
+                range(1, max(C_FORECAST_HORIZONS) + 1)]
+            
+            latency[(model, 'batch')], _ = _timeIt(lambda: tf.forecastBatch(
+                artifact_file, requests), repeat)
+            latency[(model, 'per_request')], _ = _timeIt(lambda: [tf.forecast(
+                artifact_file, i) for _, _, i in requests], 1)
+                
+            print('- ', model.ljust(4), ' batch of ', len(requests), 
+                ' requests: ', round(latency[(model, 'batch')]*1000, 2), 
+                ' ms (x', round(latency[(model, 'per_request')]/
+                latency[(model, 'batch')], 1), ' vs a forecast per request)', 
+                sep = '')
+
+    return latency
+
+
+def parseInputArguments():
+    '''
+    Parses the input arguments.
+
+    Args:
+        -
+
+    Raises:
+        -
+
+    Returns:
+        namespace: The input arguments passed.
+    '''
+
+    args_parser = argparse.ArgumentParser(description = 'Run benchmarks',
+        epilog = C_EXAMPLES, formatter_class = argparse.RawTextHelpFormatter)
+
+    args_parser.add_argument('-b', action = 'store', required = True,
+        help = 'benchmark to be executed', 
+        choices = ('tokenization', 'storage', 'windowing', 'rnn', 'forecast'),
+        metavar = 'benchmark')
+
+    args_parser.add_argument('-f', action = 'store', required = True,
+        help = 'input data file', metavar = 'file')
+
+    args_parser.add_argument('-r', action = 'store', type = int, default = 3,
+        help = 'number of repetitions, the best time is reported',
+        metavar = 'repeat')
+
+    return args_parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    # Read input arguments
+    input_arguments = parseInputArguments()
+
+    if input_arguments.b == 'tokenization':
+        benchmarkTokenization(file_name = input_arguments.f,
+            repeat = input_arguments.r)
+
+    elif input_arguments.b == 'storage':
+        benchmarkStorage(file_name = input_arguments.f,
+            repeat = input_arguments.r)
+
+    elif input_arguments.b == 'windowing':
+        benchmarkWindowing(file_name = input_arguments.f,
+            repeat = input_arguments.r)
+
+    elif input_arguments.b == 'rnn':
+        benchmarkRNN(file_name = input_arguments.f,
+            repeat = input_arguments.r)
+
+    elif input_arguments.b == 'forecast':
+        benchmarkForecast(file_name = input_arguments.f,
+            repeat = input_arguments.r)
@@ -8,28 +8,79 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 05.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
 
+# My packages
+import dataIO as dio
+import timeIndex as ti
+import schema as sc
+
+# Python packages
+import io
+import os
 import pandas as pd
 from datetime import datetime
 
+'''
+Constants
+'''
+# Group columns per granularity, from the finest to the coarsest one. Each
+# granularity can be aggregated from the previous one.
+C_GRANULARITY_COLUMNS = {
+    'HOURLY': ['year', 'month', 'day', 'week_day', 'hour'],
+    'DAILY': ['year', 'month', 'day', 'week_day'],
+    'MONTHLY': ['year', 'month'],
+    'YEARLY': ['year']}
+
+# Bytes read before the watermark offset of the input file, to check that the
+# row ending there is the last processed one (see _inputOffset())
+C_WATERMARK_LOOKBACK = 1024
+
 
 class DataFactory():
     '''
     Data Factory class implementation.
 
     Args:
-        file_name (string): The input file name holding the data.
+        file_name (string): The input file name holding the data. Csv and the
+            binary formats of the dataIO module are detected automatically.
         
         process_date_time (boolean, default is False): Wether the Date column
             should be processed (see _processDateTime())
             
         save_file (string, default is None): The file in which the modifications
             in the input file should be stored. Makes sense when process_date_time
-            is True.
+            is True. The file format is selected by its extension (see 
+            dataIO.writeData()).
+            
+        chunk_size (integer, default is None): If given, the input file is 
+            streamed in chunks of chunk_size rows instead of being loaded at 
+            once. Each chunk is tokenized (when process_date_time is True), 
+            appended to the save_file and summed into a running HOURLY per host
+            accumulator, from which every granularity is aggregated. The peak 
+            memory is then bounded by the chunk size and the (much smaller)
+            accumulator. When process_date_time is False the input file should
+            already contain the date tokens columns. Streaming is supported only
+            for csv input files and csv or mmap save files.
+            
+        watermark_file (string, default is None): Enables the incremental mode.
+            The file holds the date of the last processed row (watermark) and
+            the byte offset of the csv input file after it. When it exists, 
+            only the input rows after the watermark are processed, they are 
+            appended to the save_file and aggregateAll() merges their 
+            aggregations in to the existing files, recomputing only the boundary
+            buckets. When the input file is the same csv file, grown with new 
+            rows, it is read from the offset, so the processing cost depends on
+            the new rows only (otherwise the whole file is read and the rows up
+            to the watermark are dropped). The watermark is updated by 
+            aggregateAll(). All the rows of a date (one per host) are expected
+            to be delivered together.
+            The rows already in the save_file (e.g. of a run without 
+            aggregateAll()) are not appended again, its last time is taken 
+            from its time index.
         
         verbose (boolean, default is False): If True print services are enabled.
 
@@ -43,17 +94,21 @@ class DataFactory():
         
         aggregateData (args) -> DataFrame: Aggregates the data of the input file
             according a selected granularity.
+            
+        aggregateAll (args) -> dictionary: Aggregates the data of the input file
+            for all the granularities, with and without combining the hosts, 
+            using a single pass over the input data.
         
     Private Methods:
         See methods docstring (def _*)
         
     Raises:
-        -
+        ValueError: When streaming mode is requested for not supported files.
         
     '''
 
     def __init__(self, file_name, process_date_time = False, save_file = None, 
-        verbose = False):
+        chunk_size = None, watermark_file = None, verbose = False):
         
         self._verbose = verbose
         
@@ -61,19 +116,71 @@ class DataFactory():
             print('\nData Factory initialization:', self._printProcArgs(locals()
                 , 'self'))
             print('- Reading input file')
+            
+        # Incremental mode, load the date of the last processed row and the 
+        # offset of the input file after it (not stored by older watermarks)
+        self._watermark_file = watermark_file
+        self._watermark = None
+        self._watermark_offset = None
         
-        # Read input data file
-        self._data_file = pd.read_csv(file_name)
+        if watermark_file is not None and os.path.isfile(watermark_file):
+            with open(watermark_file, 'r') as f:
+                lines = f.read().strip().splitlines()
+                
+            self._watermark = lines[0].strip()
+            
+            if len(lines) > 1:
+                self._watermark_offset = int(lines[1])
+                
+            if self._verbose:
+                print('- Incremental mode, watermark = ', self._watermark, 
+                    ', offset = ', self._watermark_offset, sep = '')
+                
+        # Date of the last row read from the input file, and the offset of the
+        # csv input file after it
+        self._last_date = self._watermark
+        self._last_offset = None
+        
+        if chunk_size is not None:
+            
+            if dio.fileFormat(file_name) != 'csv' or (save_file is not None and
+                os.path.splitext(save_file)[1].lower() in ['.npz', '.parquet',
+                '.feather']):
+                raise ValueError('Streaming mode (chunk_size = ' + 
+                    str(chunk_size) + ') supports only csv input files and ' +
+                    'csv or mmap save files')
+                    
+            self._data_file = self._streamDataFile(file_name, chunk_size, 
+                process_date_time, save_file)
+        
+        else:
+            # Read input data file, csv files from the watermark offset
+            if dio.fileFormat(file_name) == 'csv':
+                data, = self._readInput(file_name)
+            else:
+                data = dio.readData(file_name)
+                
+            self._data_file = self._filterNewRows(data)
 
-        if process_date_time:
-            self._processDateTime()
+            if process_date_time:
+                if self._verbose:
+                    print('- Date Time processing (split in to tokens)')
+                
+                self._data_file = self._processDateTime(self._data_file)
             
-        if save_file is not None:
-            self._data_file.to_csv(save_file, index = False)
+            if save_file is not None:
+                saved_index = self._savedIndex(save_file)
+                saved = self._unsavedRows(self._data_file, saved_index)
+                
+                self._saveTokenized(saved, save_file, 
+                    append = saved_index is not None)
             
-            if self._verbose:
-                print('- Enchanced (tokenized date) input file saved as:', 
-                    save_file)
+                if self._verbose:
+                    print('- Enchanced (tokenized date) input file saved as:', 
+                        save_file)
+                
+                # When appended, the index of the saved file is extended
+                self._saveIndex(saved, save_file, saved_index)
         
     
     def _printProcArgs(self, arguments, exclude = None):
@@ -124,44 +231,380 @@ class DataFactory():
             'hour': date_time.hour}
             
     
-    def _processDateTime(self):
+    def _tokenizeDateTimeColumn(self, date_time_column, 
+        format = '%Y-%m-%d %H:%M:%S'):
+        '''
+        Tokenizes a column of Date Time strings in a single vectorized pass. It
+        is equivalent to calling _tokenizeDateTime() for each member of the 
+        column.
+    
+        Args:
+            date_time_column (pandas Series): A column of Date Time strings.
+            
+            format (string, default is '%Y-%m-%d %H:%M:%S'): The format of the
+                input date time strings.
+
+        Raises:
+            -
+
+        Returns:
+            DataFrame: A dataframe with the Date Time tokens as columns, columns
+            are: 'year', 'month', 'day', 'week_day', 'hour', with the schema 
+            types (see schema.C_DTYPES). Year is in XXXX format, week day starts
+            from 0 for Monday, hour is 24h format.
+        '''
+        
+        date_time = pd.to_datetime(date_time_column, format = format).dt
+        
+        return pd.DataFrame({'year': date_time.year, 'month': date_time.month,
+            'day': date_time.day, 'week_day': date_time.weekday, 
+            'hour': date_time.hour}, index = date_time_column.index).astype(
+            sc.dtypes(['year', 'month', 'day', 'week_day', 'hour']))
+            
+    
+    def _inputOffset(self, file_name):
+        '''
+        In incremental mode, returns the byte offset of the csv input file from
+        which the rows after the watermark start. The offset of the watermark 
+        is used only if the row ending there is the last processed one (the 
+        input file is the previous one, grown with new rows).
+    
+        Args:
+            file_name (string): The csv input file.
+
+        Raises:
+            -
+
+        Returns:
+            integer: The offset, 0 if the whole file should be read.
+        '''
+        
+        offset = self._watermark_offset
+        
+        if offset is None or offset <= 0 or os.path.getsize(file_name) < \
+            offset:
+            return 0
+            
+        with open(file_name, 'rb') as f:
+            f.seek(max(offset - C_WATERMARK_LOOKBACK, 0))
+            previous = f.read(offset - f.tell())
+            
+        if not previous.endswith(b'\n'):
+            return 0
+            
+        # Date (first field) of the row before the offset
+        last_row = previous.rstrip(b'\r\n').rsplit(b'\n', 1)[-1]
+        
+        if last_row.split(b',', 1)[0].strip(b'"').decode(errors = 'replace') \
+            != self._watermark:
+            return 0
+            
+        return offset
+        
+        
+    def _readInput(self, file_name, chunk_size = None):
+        '''
+        Reads a csv input file, with the schema types. In incremental mode, the
+        rows before the watermark offset are skipped (see _inputOffset()). The
+        offset of the end of the file is kept for the next watermark.
+    
+        Args:
+            file_name (string): The csv input file.
+            
+            chunk_size (integer, default is None): Number of rows per chunk. If
+                None, the rows are read at once.
+
+        Raises:
+            -
+
+        Returns:
+            generator: The rows (DataFrame), one chunk at a time or all of them
+                in one DataFrame.
         '''
-        Adds in the self._data_file dataframe the contents of the tokenized date
-        time as columns.
+        
+        offset = self._inputOffset(file_name)
+        
+        with open(file_name, 'rb') as f:
+            columns = pd.read_csv(io.BytesIO(f.readline()), nrows = 0).columns
+            
+            if offset > 0:
+                f.seek(offset)
+                
+                if self._verbose:
+                    print('- Input file read from offset', offset)
+            
+            # Nothing after the offset (no new rows)
+            if f.read(1) == b'':
+                if chunk_size is None:
+                    yield sc.applySchema(pd.DataFrame(columns = columns))
+                    
+            else:
+                f.seek(-1, os.SEEK_CUR)
+                
+                rows = pd.read_csv(f, names = columns, header = None, 
+                    dtype = sc.dtypes(), chunksize = chunk_size)
+                
+                if chunk_size is None:
+                    yield rows
+                else:
+                    with rows:
+                        yield from rows
+            
+            self._last_offset = f.tell()
+            
+            
+    def _filterNewRows(self, data):
+        '''
+        In incremental mode, drops the rows of the input data which are not 
+        after the watermark. The dates are compared as strings, which keeps the
+        chronological order for the '%Y-%m-%d %H:%M:%S' format. The date of the
+        last row is kept for the next watermark.
     
         Args:
+            data (DataFrame): The input data, with a date column.
+
+        Raises:
             -
 
+        Returns:
+            DataFrame: The rows of the input data after the watermark.
+        '''
+        
+        if self._watermark is not None:
+            data = data[data.date > self._watermark]
+        
+        # Date column is datetime64 when read from a memory mapped file
+        if len(data.index) > 0 and (self._last_date is None or 
+            str(data.date.iloc[-1]) > self._last_date):
+            self._last_date = str(data.date.iloc[-1])
+            
+        return data
+        
+        
+    def _saveTokenized(self, data, save_file, append):
+        '''
+        Stores the (tokenized date) input data in to a file.
+    
+        Args:
+            data (DataFrame): The data to be stored.
+            
+            save_file (string): The file, its format is selected by its 
+                extension (see dataIO.writeData()).
+            
+            append (boolean): If True and the file exists, data are appended to
+                it.
+
         Raises:
             -
 
         Returns:
             -
         '''
+        
+        if append:
+            dio.appendData(data, save_file)
+        else:
+            dio.writeData(data, save_file)
+        
+        
+    def _savedIndex(self, save_file):
+        '''
+        In incremental mode, returns the time index of the existing (tokenized)
+        save file, to be extended with the appended rows.
+    
+        Args:
+            save_file (string): The save file.
+
+        Raises:
+            ValueError: When the save file exists without its time index.
+
+        Returns:
+            TimeIndex: The index of the save file, None if the file is written
+                from scratch (not incremental mode or new file).
+        '''
+        
+        if self._watermark is None or not os.path.exists(save_file):
+            return None
+            
+        index_file = ti.indexFile(save_file)
+        
+        if not os.path.isfile(index_file):
+            raise ValueError('save_file argument error. File given is \'' + 
+                save_file + '\', where incremental mode requires its time ' +
+                'index file \'' + index_file + '\'')
+            
+        return ti.TimeIndex.load(index_file)
+        
+        
+    def _unsavedRows(self, data, saved_index):
+        '''
+        Drops the rows of the data which are not after the last time of the 
+        save file, so that rows are never appended twice.
     
+        Args:
+            data (DataFrame): The data, with a date column.
+            
+            saved_index (TimeIndex): The index of the save file, see 
+                _savedIndex().
+
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The rows after the last time of the save file.
+        '''
+        
+        if saved_index is None or saved_index.rows == 0:
+            return data
+            
+        return data[ti.timestamps(data) > saved_index.end()]
+        
+        
+    def _saveIndex(self, data, save_file, time_index = None):
+        '''
+        Builds the time index (see timeIndex.TimeIndex) of a saved data file 
+        and stores it next to the file. The data file is not read.
+    
+        Args:
+            data (DataFrame): The data of the saved file, or the rows appended 
+                to it (see time_index).
+                
+            save_file (string): The saved data file.
+            
+            time_index (TimeIndex, default is None): The index of the file 
+                before the data were appended, it is extended with the data. If
+                None, the file holds the data only.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+        
+        if time_index is None:
+            time_index = ti.TimeIndex(data)
+        else:
+            time_index.extend(data)
+            
+        index_file = ti.indexFile(save_file)
+        time_index.save(index_file)
+        
         if self._verbose:
-            print('- Date Time processing (split in to tokens)')
+            print('- Time index saved as:', index_file)
+        
+        
+    def _processDateTime(self, data):
+        '''
+        Adds in the input dataframe the contents of the tokenized date time as
+        columns.
+    
+        Args:
+            data (DataFrame): The data to be processed, date column is the first
+                one, followed by the host and requests columns.
+
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The input data with the date tokens columns inserted 
+                after the date column.
+        '''
         
         # Tokenize date column
-        t_dt = [self._tokenizeDateTime(x)for x in self._data_file.date.to_list()]
+        t_dt = self._tokenizeDateTimeColumn(data.date)
+        
+        # Insert the tokens after the date column (first column)
+        return pd.concat([data.iloc[:, :1], t_dt, data.iloc[:, 1:3]], axis = 1)
+        
+    
+    def _streamDataFile(self, file_name, chunk_size, process_date_time, 
+        save_file):
+        '''
+        Streams the input file in chunks and sums the requests of each chunk in
+        to a running accumulator of HOURLY per host granularity. Each chunk is
+        dropped after being processed.
+    
+        Args:
+            file_name (string): The input file name holding the data.
+            
+            chunk_size (integer): Number of rows per chunk.
+            
+            process_date_time (boolean): Wether the Date column of each chunk 
+                should be processed (see _processDateTime()).
+            
+            save_file (string): The file in which the processed chunks should be
+                appended. If None, chunks are not stored.
 
-        # Create new columns with tokenized date-time data
-        self._data_file['year'] = [x['year'] for x in t_dt]
-        self._data_file['month'] = [x['month'] for x in t_dt]
-        self._data_file['day'] = [x['day'] for x in t_dt]
-        self._data_file['week_day'] = [x['week_day'] for x in t_dt]
-        self._data_file['hour'] = [x['hour'] for x in t_dt]
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The requests aggregated on HOURLY per host granularity.
+        '''
+        
+        if self._verbose:
+            print('- Streaming input file, chunk_size =', chunk_size)
+            
+        group_columns = ['year', 'month', 'day', 'week_day', 'hour', 'host']
         
-        # Rearange columns
-        self._data_file = self._data_file[[self._data_file.columns[0], 'year', 
-            'month', 'day', 'week_day', 'hour'] + 
-            self._data_file.columns[1:3].to_list()]
+        saved_index = None if save_file is None else \
+            self._savedIndex(save_file)
+        
+        # Partial sums and saved (time, host) keys of the chunks
+        partials = []
+        keys = []
+        
+        for chunk in self._readInput(file_name, chunk_size):
+            
+            chunk = self._filterNewRows(chunk)
+            
+            if process_date_time:
+                chunk = self._processDateTime(chunk)
+            
+            if save_file is not None:
+                saved = self._unsavedRows(chunk, saved_index)
+                
+                self._saveTokenized(saved, save_file, append = len(partials) >
+                    0 or saved_index is not None)
+                    
+                keys.append(pd.DataFrame({'date': ti.timestamps(saved), 
+                    'host': saved.host.to_numpy()}))
+            
+            # Partial sums of the chunk (an hour may span two chunks), much 
+            # smaller than the chunk, they are summed once at the end
+            partials.append(chunk.groupby(group_columns, observed = True)[
+                'requests'].sum())
+            
+        if len(partials) == 0:
+            accumulator = pd.DataFrame(columns = group_columns + ['requests'])
+        else:
+            accumulator = pd.concat(partials).groupby(level = group_columns, 
+                observed = True).sum().reset_index()
+        
+        if self._verbose:
+            print('- Streamed ', len(partials), ' chunks, accumulator size = ', 
+                len(accumulator.index), sep = '')
+            
+            if save_file is not None and len(partials) > 0:
+                print('- Enchanced (tokenized date) input file saved as:', 
+                    save_file)
+        
+        # The index is built from the saved keys, the saved file is not read
+        if save_file is not None and len(partials) > 0:
+            self._saveIndex(pd.concat(keys, ignore_index = True), save_file, 
+                saved_index)
+                    
+        # Host categories may differ among the chunks
+        return sc.applySchema(accumulator)
     
     
     def aggregateData(self, granularity, combine_hosts = False, save_file = None):     
         '''
         Aggregates the data (sum(), on the requests column) of the self._data_file
-        according the selected granularity.
+        according the selected granularity. In streaming mode (see chunk_size)
+        the self._data_file holds the HOURLY per host partial sums, which give
+        exactly the same aggregates.
     
         Args:
             granularity (string): The granularity to be used for the data 
@@ -172,8 +615,9 @@ class DataFactory():
                 applied as all the hosts they were one. The host column is 
                 dropped.
                 
-            save_file (string, default is None): The csv file in which the 
-                aggregated data should be stored.
+            save_file (string, default is None): The file in which the 
+                aggregated data should be stored. The file format is selected
+                by its extension (see dataIO.writeData()).
                 
         Raises:
             ValueError: When granularity given value is not supported.
@@ -186,23 +630,13 @@ class DataFactory():
             print('\nData Aggregation:', self._printProcArgs(locals(), 'self'))
         
         # Validate the value of the granularity argument
-        if granularity not in ['HOURLY', 'DAILY', 'MONTHLY', 'YEARLY']:
+        if granularity not in C_GRANULARITY_COLUMNS.keys():
             raise ValueError('granularity argument error. Value given is \''  +\
                 str(granularity) + '\', where supported values are: \'HOULRY' +\
                 '\', \'DAILY\', \'MONTHLY\', \'YEARLY\'')
                 
         # Define filter and group columns based on the granularity value
-        if granularity == 'HOURLY':
-            filter_columns = ['year', 'month', 'day', 'week_day', 'hour']
-            
-        elif granularity == 'DAILY':
-            filter_columns = ['year', 'month', 'day', 'week_day']
-            
-        elif granularity == 'MONTHLY':
-            filter_columns = ['year', 'month']
-            
-        elif granularity == 'YEARLY':
-            filter_columns = ['year']
+        filter_columns = C_GRANULARITY_COLUMNS[granularity].copy()
 
         if not combine_hosts:
             filter_columns += ['host']
@@ -217,15 +651,131 @@ class DataFactory():
 
         # Aggregate data
         data = self._data_file.filter(filter_columns, axis = 1)
-        data = data.groupby(group_columns, as_index = False)['requests'].sum()
+        data = data.groupby(group_columns, as_index = False, observed = True)[
+            'requests'].sum()
         
         if save_file is not None:
-            data.to_csv(save_file, index = False)
+            dio.writeData(data, save_file)
         
             if self._verbose:
                 print('- Aggregated data saved as:', save_file)
                 
+            self._saveIndex(data, save_file)
+                
         return data
+        
+        
+    def aggregateAll(self, save_file_prefix = None, file_format = 'csv'):
+        '''
+        Aggregates the data (sum(), on the requests column) of the 
+        self._data_file for all the granularities, with and without combining
+        the hosts. Only the HOURLY per host aggregation reads the input data, 
+        every other aggregation is derived from a smaller one: DAILY from 
+        HOURLY, MONTHLY from DAILY, YEARLY from MONTHLY and the combined hosts
+        variants by summing over the hosts.
+        
+        In incremental mode (see watermark_file), the aggregations of the new
+        rows are merged in to the existing files and the watermark is updated.
+    
+        Args:
+            save_file_prefix (string, default is None): The prefix of the csv 
+                files in which the aggregated data should be stored. Each file
+                is named prefix + granularity + '.csv' and prefix + granularity
+                + '_CHs.csv' for the combined hosts aggregations.
+                
+            file_format (string, default is 'csv'): The format of the saved 
+                files, one of the dataIO.C_FILE_FORMATS.keys(). It is also used
+                as the files extension.
+                
+        Raises:
+            -
+
+        Returns:
+            dictionary: The aggregated data (DataFrame) per (granularity, 
+                combine_hosts) key. In incremental mode, the aggregations of the
+                new rows only.
+        '''
+        
+        if self._verbose:
+            print('\nData Aggregation (all granularities):', 
+                self._printProcArgs(locals(), 'self'))
+        
+        aggregations = {}
+        data = self._data_file
+        
+        for granularity, group_columns in C_GRANULARITY_COLUMNS.items():
+            
+            # Per host aggregation from the previous (finer) granularity
+            data = data.groupby(group_columns + ['host'], as_index = False, 
+                observed = True)['requests'].sum()
+            aggregations[(granularity, False)] = data
+            
+            # Combined hosts aggregation from the per host one
+            aggregations[(granularity, True)] = data.groupby(group_columns, 
+                as_index = False, observed = True)['requests'].sum()
+        
+        if save_file_prefix is not None:
+            for (granularity, combine_hosts), data in aggregations.items():
+                save_file = save_file_prefix + granularity + ('_CHs' if 
+                    combine_hosts else '') + '.' + file_format
+                
+                if self._watermark is not None and os.path.isfile(save_file):
+                    data = self._mergeAggregation(dio.readData(save_file), data,
+                        C_GRANULARITY_COLUMNS[granularity])
+                        
+                dio.writeData(data, save_file)
+                
+                if self._verbose:
+                    print('- Aggregated data saved as:', save_file)
+                    
+                self._saveIndex(data, save_file)
+            
+            if self._watermark_file is not None and self._last_date is not None:
+                with open(self._watermark_file, 'w') as f:
+                    f.write(self._last_date + ('' if self._last_offset is None
+                        else '\n' + str(self._last_offset)))
+                    
+                if self._verbose:
+                    print('- Watermark updated: ', self._last_date, ', offset ',
+                        '= ', self._last_offset, ', saved as: ', 
+                        self._watermark_file, sep = '')
+                    
+        return aggregations
+        
+        
+    def _mergeAggregation(self, previous, data, time_columns):
+        '''
+        Merges the aggregation of the new rows in to the previous aggregation.
+        The new rows are after the watermark, so they can only share the last
+        time bucket (boundary) of the previous aggregation, which is the only 
+        one recomputed.
+    
+        Args:
+            previous (DataFrame): The previous aggregation.
+            
+            data (DataFrame): The aggregation of the new rows.
+            
+            time_columns (list of strings): The time group columns of the 
+                aggregations (see C_GRANULARITY_COLUMNS).
+                
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The merged aggregation.
+        '''
+        
+        group_columns = data.columns[:-1].to_list()
+        
+        # Previous rows of the boundary time bucket, for all the hosts
+        boundary = pd.MultiIndex.from_frame(previous[time_columns]).isin(
+            pd.MultiIndex.from_frame(data[time_columns]))
+        
+        merged = pd.concat([previous[boundary], data]).groupby(group_columns,
+            as_index = False, observed = True)['requests'].sum()
+            
+        return sc.applySchema(pd.concat([previous[~boundary], merged], 
+            ignore_index = True))
 
 
 if __name__ == '__main__':
@@ -237,9 +787,4 @@ if __name__ == '__main__':
         verbose = True)
 
     # Create all the types of data aggregation
-    for g in ['HOURLY', 'DAILY', 'MONTHLY', 'YEARLY']:
-        df.aggregateData(granularity = g, combine_hosts = False, 
-            save_file = '../data/processed/traffic_stats_' + g + '.csv')
-            
-        df.aggregateData(granularity = g, combine_hosts = True, 
-            save_file = '../data/processed/traffic_stats_' + g + '_CHs.csv')
+    df.aggregateAll(save_file_prefix = '../data/processed/traffic_stats_')
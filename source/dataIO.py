@@ -0,0 +1,303 @@
+'''
+File name: dataIO.py
+    Data input/output functions. Data files can be stored as csv (text), in a
+    typed columnar binary format (NumPy npz, Parquet, Feather) or in a memory
+    mapped directory of fixed width columns (mmap). The format of a file is 
+    detected automatically when it is read.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# My packages
+import schema as sc
+
+# Python packages
+import os, json
+import numpy as np
+import pandas as pd
+
+'''
+Constants
+'''
+# Supported file formats and the leading bytes (magic number) of each binary one
+C_FILE_FORMATS = {'csv': None, 'npz': b'PK\x03\x04', 'parquet': b'PAR1',
+    'feather': b'ARROW1', 'mmap': None}
+
+# Memory mapped format: schema file of the directory, date column stored as
+# datetime64 (seconds) and type of the codes of the text columns (e.g. host)
+C_MMAP_SCHEMA = 'schema.json'
+C_MMAP_DATE_COLUMN = 'date'
+C_MMAP_CODES_DTYPE = 'int8'
+
+
+def fileFormat(file_name):
+    '''
+    Detects the format of a data file from its leading bytes. Directories are
+    memory mapped (mmap) data, files not matching any of the binary formats are
+    considered csv files.
+
+    Args:
+        file_name (string): The data file.
+
+    Raises:
+        -
+
+    Returns:
+        string: The file format, one of the C_FILE_FORMATS.keys().
+    '''
+
+    if os.path.isdir(file_name):
+        return 'mmap'
+        
+    with open(file_name, 'rb') as f:
+        header = f.read(8)
+
+    for file_format, magic in C_FILE_FORMATS.items():
+        if magic is not None and header.startswith(magic):
+            return file_format
+
+    return 'csv'
+
+
+def readData(file_name):
+    '''
+    Reads a data file, the format of the file is detected automatically (see
+    fileFormat()). Columns are loaded with their schema types (see schema.py).
+
+    Args:
+        file_name (string): The data file.
+
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The data of the file.
+    '''
+
+    file_format = fileFormat(file_name)
+
+    if file_format == 'mmap':
+        return readColumns(file_name)
+        
+    elif file_format == 'npz':
+        with np.load(file_name, allow_pickle = False) as npz_file:
+            data = pd.DataFrame({c: npz_file[c] for c in npz_file.files})
+
+    elif file_format == 'parquet':
+        data = pd.read_parquet(file_name)
+
+    elif file_format == 'feather':
+        data = pd.read_feather(file_name)
+
+    else:
+        return pd.read_csv(file_name, dtype = sc.dtypes())
+        
+    return sc.applySchema(data)
+
+
+def writeData(data, file_name):
+    '''
+    Writes data in to a file, the format is selected by the file extension
+    ('.npz', '.parquet', '.feather', '.mmap', anything else is written as csv).
+    Columns are cast to their schema types (see schema.py), which are kept in 
+    the binary formats.
+
+    Args:
+        data (DataFrame): The data to be stored.
+
+        file_name (string): The data file.
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+
+    file_format = os.path.splitext(file_name)[1][1:].lower()
+    data = sc.applySchema(data)
+
+    if file_format == 'mmap':
+        writeColumns(data, file_name)
+        
+    elif file_format == 'npz':
+        # Text columns are stored as fixed width unicode arrays (no pickling)
+        np.savez(file_name, **{c: data[c].to_numpy(dtype = str) if
+            pd.api.types.is_object_dtype(data[c]) or 
+            pd.api.types.is_string_dtype(data[c]) or isinstance(data[c].dtype,
+            pd.CategoricalDtype) else data[c].to_numpy() for c in data.columns})
+
+    elif file_format == 'parquet':
+        data.to_parquet(file_name, index = False)
+
+    elif file_format == 'feather':
+        data.reset_index(drop = True).to_feather(file_name)
+
+    else:
+        data.to_csv(file_name, index = False)
+
+
+def appendData(data, file_name):
+    '''
+    Appends data in to a file, or creates it if it does not exist. Csv and 
+    memory mapped (mmap) files are appended in place, the rest binary files are
+    rewritten.
+
+    Args:
+        data (DataFrame): The data to be appended.
+
+        file_name (string): The data file.
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+
+    if not os.path.exists(file_name):
+        writeData(data, file_name)
+
+    elif fileFormat(file_name) == 'csv':
+        data.to_csv(file_name, index = False, mode = 'a', header = False)
+        
+    elif fileFormat(file_name) == 'mmap':
+        writeColumns(data, file_name, append = True)
+
+    else:
+        writeData(pd.concat([readData(file_name), data], ignore_index = True),
+            file_name)
+
+
+def writeColumns(data, directory, append = False):
+    '''
+    Writes data in to a directory of fixed width binary columns (one raw array
+    file per column), which can be memory mapped by readColumns(). The date 
+    column is stored as datetime64 (seconds) and the text columns (e.g. host) 
+    as small integer codes of their categories. Column types and categories are
+    kept in the schema file of the directory.
+
+    Args:
+        data (DataFrame): The data to be stored.
+
+        directory (string): The data directory. It is created if needed.
+        
+        append (boolean, default is False): If True, data are appended to the
+            existing columns of the directory. New categories of the text
+            columns are appended to the schema.
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+    
+    schema_file = os.path.join(directory, C_MMAP_SCHEMA)
+    
+    if append and os.path.isfile(schema_file):
+        with open(schema_file, 'r') as f:
+            schema = json.load(f)
+    else:
+        os.makedirs(directory, exist_ok = True)
+        schema = {'rows': 0, 'columns': [{'name': c} for c in data.columns]}
+        append = False
+    
+    for column in schema['columns']:
+        values = data[column['name']]
+        
+        if column['name'] == C_MMAP_DATE_COLUMN:
+            values = pd.to_datetime(values).to_numpy(dtype = 'datetime64[s]')
+            
+        elif 'categories' in column or pd.api.types.is_object_dtype(values) or\
+            pd.api.types.is_string_dtype(values) or isinstance(values.dtype, 
+            pd.CategoricalDtype):
+            categories = column.get('categories', [])
+            new_categories = sorted(set(values.astype(str).unique()) - 
+                set(categories))
+            column['categories'] = categories + new_categories
+            
+            values = pd.Categorical(values.astype(str), categories = 
+                column['categories']).codes.astype(C_MMAP_CODES_DTYPE)
+        
+        else:
+            values = values.to_numpy()
+        
+        if append:
+            values = values.astype(column['dtype'], copy = False)
+        
+        column['dtype'] = values.dtype.str
+        
+        with open(os.path.join(directory, column['name'] + '.bin'), 'ab' if
+            append else 'wb') as f:
+            f.write(np.ascontiguousarray(values).tobytes())
+    
+    # The schema is written last, it commits the new number of rows
+    schema['rows'] += len(data.index)
+    
+    with open(schema_file, 'w') as f:
+        json.dump(schema, f, indent = 4)
+        
+
+def readColumns(directory, start = None, end = None):
+    '''
+    Opens the data of a directory written by writeColumns(), with zero copy. 
+    Each column is memory mapped (read only), so the data are loaded lazily 
+    and shared through the page cache among processes. Text columns are 
+    decoded in to categoricals (copy of their small integer codes only).
+    
+    If the data have a (sorted) date column, a time range can be selected
+    with a binary search, without reading the rest of the rows.
+
+    Args:
+        directory (string): The data directory.
+        
+        start (string or datetime, default is None): The first date of the time
+            range (inclusive). If None, the range starts from the first row.
+            
+        end (string or datetime, default is None): The last date of the time
+            range (inclusive). If None, the range ends at the last row.
+
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The data of the directory (in the time range).
+    '''
+    
+    with open(os.path.join(directory, C_MMAP_SCHEMA), 'r') as f:
+        schema = json.load(f)
+        
+    columns = {}
+    
+    for column in schema['columns']:
+        if schema['rows'] == 0:
+            columns[column['name']] = np.empty(0, dtype = column['dtype'])
+        else:
+            columns[column['name']] = np.memmap(os.path.join(directory, 
+                column['name'] + '.bin'), dtype = column['dtype'], mode = 'r',
+                shape = (schema['rows'],))
+    
+    # Time range selection, only the pages of the binary search are read
+    if start is not None or end is not None:
+        dates = columns[C_MMAP_DATE_COLUMN]
+        first = 0 if start is None else np.searchsorted(dates, 
+            np.datetime64(pd.Timestamp(start), 's'), side = 'left')
+        last = len(dates) if end is None else np.searchsorted(dates, 
+            np.datetime64(pd.Timestamp(end), 's'), side = 'right')
+        
+        columns = {k: v[first:last] for k, v in columns.items()}
+        
+    for column in schema['columns']:
+        if 'categories' in column:
+            columns[column['name']] = pd.Categorical.from_codes(
+                columns[column['name']], categories = column['categories'])
+    
+    return pd.DataFrame(columns, copy = False)
@@ -7,17 +7,21 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 06.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
 
-import pandas as pd
+# My packages
+import dataIO as dio
+import timeIndex as ti
+
+# Python packages
 from datetime import datetime
 import matplotlib.pyplot as plt
 
 
-def comparisonGraph(type, data, color, save_file):
+def comparisonGraph(type, data, color, save_file, time_index = None):
     '''
     Creates a 2x2 subplots comparison graph (hosts) for the input data.
     
@@ -31,6 +35,9 @@ def comparisonGraph(type, data, color, save_file):
         color (string): Color to be used in the graph.
         
         save_file (string): Relevant path and file to save the graph.
+        
+        time_index (TimeIndex, default is None): The time index of the data, 
+            used for selecting the rows of each host. If None, it is built.
 
     Raises:
         -
@@ -39,15 +46,18 @@ def comparisonGraph(type, data, color, save_file):
         -
     '''
     
+    if time_index is None:
+        time_index = ti.TimeIndex(data)
+    
     fig, axs = plt.subplots(2, 2)
     fig.suptitle('Compare all hosts, ' + type, fontweight = 'bold')
-    axs[0, 0].plot(data[data.host == 'as-01'].requests, color = color)
+    axs[0, 0].plot(time_index.slice(data, host = 'as-01').requests, color = color)
     axs[0, 0].set_title('as-01')
-    axs[0, 1].plot(data[data.host == 'as-02'].requests, color = color)
+    axs[0, 1].plot(time_index.slice(data, host = 'as-02').requests, color = color)
     axs[0, 1].set_title('as-02')
-    axs[1, 0].plot(data[data.host == 'as-03'].requests, color = color)
+    axs[1, 0].plot(time_index.slice(data, host = 'as-03').requests, color = color)
     axs[1, 0].set_title('as-03')
-    axs[1, 1].plot(data[data.host == 'as-04'].requests, color = color)
+    axs[1, 1].plot(time_index.slice(data, host = 'as-04').requests, color = color)
     axs[1, 1].set_title('as-04')
     
     for ax in axs.flat:
@@ -203,7 +213,7 @@ def trendYearly(data, color, save_file):
 if __name__ == '__main__':
     
     # Unprocessed data information
-    input_data = pd.read_csv('../data/input/traffic_stats.csv')
+    input_data = dio.readData('../data/input/traffic_stats.csv')
     
     print('\nUnprocessed data information:')
     print('- Number of instances: ', f"{input_data.shape[0]:,d}".
@@ -221,64 +231,77 @@ if __name__ == '__main__':
     
     # Comparing traffic among all the application servers (hourly basis)
     print('\nComparing traffic among all the application servers (hourly basis)')
-    hourly_data = pd.read_csv('../data/processed/traffic_stats_HOURLY.csv')
+    hourly_file = '../data/processed/traffic_stats_HOURLY.csv'
+    hourly_data = dio.readData(hourly_file)
     
     comparisonGraph(type = 'hourly traffic', data = hourly_data, color = 'darkslateblue',
-        save_file = '../graphs/data_statistics/compare_all_hosts_hourly.png')
+        save_file = '../graphs/data_statistics/compare_all_hosts_hourly.png',
+        time_index = ti.loadIndex(hourly_file, hourly_data))
     
     # Comparing traffic among all the application servers (daily basis)
     print('\nComparing traffic among all the application servers (daily basis)')
-    daily_data = pd.read_csv('../data/processed/traffic_stats_DAILY.csv')
+    daily_file = '../data/processed/traffic_stats_DAILY.csv'
+    daily_data = dio.readData(daily_file)
     
     comparisonGraph(type = 'daily traffic', data = daily_data, color = 'coral',
-        save_file = '../graphs/data_statistics/compare_all_hosts_daily.png')
+        save_file = '../graphs/data_statistics/compare_all_hosts_daily.png',
+        time_index = ti.loadIndex(daily_file, daily_data))
 
     # Comparing traffic among all the application servers (monthly basis)
     print('\nComparing traffic among all the application servers (monthly basis)')
-    monthly_data = pd.read_csv('../data/processed/traffic_stats_MONTHLY.csv')
+    monthly_file = '../data/processed/traffic_stats_MONTHLY.csv'
+    monthly_data = dio.readData(monthly_file)
     
     comparisonGraph(type = 'monthly traffic', data = monthly_data, color = 'peru',
-        save_file = '../graphs/data_statistics/compare_all_hosts_monthly.png')
+        save_file = '../graphs/data_statistics/compare_all_hosts_monthly.png',
+        time_index = ti.loadIndex(monthly_file, monthly_data))
         
     # Comparing traffic among all the application servers (yearly basis)
     print('\nComparing traffic among all the application servers (yearly basis)')
-    yearly_data = pd.read_csv('../data/processed/traffic_stats_YEARLY.csv')
+    yearly_file = '../data/processed/traffic_stats_YEARLY.csv'
+    yearly_data = dio.readData(yearly_file)
     
     comparisonGraph(type = 'yearly traffic', data = yearly_data, color = 'mediumseagreen',
-        save_file = '../graphs/data_statistics/compare_all_hosts_yearly.png')
+        save_file = '../graphs/data_statistics/compare_all_hosts_yearly.png',
+        time_index = ti.loadIndex(yearly_file, yearly_data))
         
     
     # Seasonality analysis of the traffic (combined hosts)
     
     # Seasonality analysis on hourly basis for all days of the week
     print('\nSeasonality analysis on hourly basis for all days of the week')
-    hourly_data_chs = pd.read_csv('../data/processed/traffic_stats_HOURLY_CHs.csv')
+    hourly_file_chs = '../data/processed/traffic_stats_HOURLY_CHs.csv'
+    hourly_data_chs = dio.readData(hourly_file_chs)
 
-    seasonalityHourly(data = hourly_data_chs.query('year == 2016 and month == 2'+\
-        ' and day >= 15 and day <= 21'), start_day = 15,
+    seasonalityHourly(data = ti.loadIndex(hourly_file_chs, hourly_data_chs).slice(
+        hourly_data_chs, '2016-02-15 00:00:00', '2016-02-21 23:00:00'), 
+        start_day = 15,
         save_file = '../graphs/data_statistics/seasonality_hourly_whole_week.png')
           
     # Seasonality analysis on daily basis for a week
     print('\nSeasonality analysis on daily basis for a week')
-    daily_data_chs = pd.read_csv('../data/processed/traffic_stats_DAILY_CHs.csv')
+    daily_file_chs = '../data/processed/traffic_stats_DAILY_CHs.csv'
+    daily_data_chs = dio.readData(daily_file_chs)
 
-    seasonalityDaily(data = daily_data_chs.query('year == 2016 and month == 2'+\
-        ' and day >= 15 and day <= 21'), color = 'lightsalmon',
+    seasonalityDaily(data = ti.loadIndex(daily_file_chs, daily_data_chs).slice(
+        daily_data_chs, '2016-02-15', '2016-02-21'), color = 'lightsalmon',
         save_file = '../graphs/data_statistics/seasonality_daily_whole_week.png')
         
     
     # Seasonality analysis on monthly basis for a year
     print('\nSeasonality analysis on monthly basis for a year')
-    monthly_data_chs = pd.read_csv('../data/processed/traffic_stats_MONTHLY_CHs.csv')
+    monthly_file_chs = '../data/processed/traffic_stats_MONTHLY_CHs.csv'
+    monthly_data_chs = dio.readData(monthly_file_chs)
 
-    seasonalityMonthly(data = monthly_data_chs.query('year == 2016'), color = 'purple',
+    seasonalityMonthly(data = ti.loadIndex(monthly_file_chs, monthly_data_chs).
+        slice(monthly_data_chs, '2016-01-01', '2016-12-01'), color = 'purple',
         save_file = '../graphs/data_statistics/seasonality_monthly_whole_year.png')
         
         
     # Trend of the traffic (yearly)
     print('\nYearly traffic trend')
     
-    yearly_data_chs = pd.read_csv('../data/processed/traffic_stats_YEARLY_CHs.csv')
+    yearly_data_chs = dio.readData('../data/processed/traffic_stats_YEARLY_CHs.csv')
     
     trendYearly(data = yearly_data_chs, color = 'burlywood', 
         save_file = '../graphs/data_statistics/traffic_trend_yearly.png')
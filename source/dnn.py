@@ -7,7 +7,7 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 11.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
@@ -15,17 +15,57 @@ Python Version: 3.8
 # My packages
 import utils as ut
 from model import MODEL
-from mpt import MPT
+from mpt import MPT, printProgress
+
+# Python packages
+import joblib
+import numpy as np
+import pandas as pd
 
 # Sklearn imports
+from sklearn.base import clone
 from sklearn.metrics import r2_score
 from sklearn.neural_network import MLPRegressor
 from sklearn.model_selection import GridSearchCV, PredefinedSplit
 from sklearn.model_selection import PredefinedSplit
+from sklearn.experimental import enable_halving_search_cv
+from sklearn.model_selection import HalvingGridSearchCV
 
 # Matplotlib for graphs
 import matplotlib.pyplot as plt
 
+'''
+Constants
+'''
+# Search modes of the explore() Step 1
+C_SEARCH_MODES = ('grid', 'halving')
+
+# Successive halving over the training iterations (max_iter): one third of 
+# the configurations is kept per round, with three times the iterations. The
+# rounds use 6, 18, 54 and 162 iterations for 288, 96, 32 and 11 
+# configurations: 6966 training epochs instead of 288*200 = 57600 for the
+# grid search (~12% of the budget, ~8x fewer). Each round costs about the same
+# number of epochs, so the budget is set by the iterations of the first round.
+C_HALVING_FACTOR = 3
+C_HALVING_MIN_ITER = 6
+
+# Hidden layers width search of the explore() Step 2: a coarse grid over the 
+# range of widths (step 18), then the neighbours of the best width at 
+# decreasing distances, which reach every width between two coarse points. At
+# most 12 + 2*4 = 20 widths are evaluated instead of 199 (~10x fewer fits).
+C_WIDTH_RANGE = (2, 200)
+C_WIDTH_COARSE_POINTS = 12
+C_WIDTH_REFINE_STEPS = (8, 4, 2, 1)
+
+# Solvers of the online updates (MLPRegressor.partial_fit)
+C_ONLINE_SOLVERS = ('sgd', 'adam')
+
+# The 'adaptive' learning rate of the 'sgd' solver is divided by 5 when the
+# training loss stops improving, the training stops below this learning rate
+# (as in MLPRegressor.fit())
+C_ADAPTIVE_LEARNING_RATE_DIVISOR = 5.
+C_ADAPTIVE_MIN_LEARNING_RATE = 1e-6
+
 
 class DNN(MODEL):
     '''
@@ -37,6 +77,16 @@ class DNN(MODEL):
             'learning_rate', 'learning_rate_init', 'max_iter', 'shuffle')        
         
         verbose (boolean, default is False): If True print services are enabled.
+        
+        cache (ResultCache, default is None): Persistent cache for the scores
+            (and optionally the fitted models) of the explore() evaluations. 
+            Cached evaluations are skipped when explore() is executed again.
+            
+        search (string, default is 'grid'): Search mode of the explore() Step 1,
+            one of C_SEARCH_MODES. 'grid' trains every configuration for the 
+            full number of iterations, 'halving' trains every configuration for
+            a few iterations and drops the worse ones in rounds of increasing
+            iterations (successive halving).
 
     Public Attributes:
         -
@@ -50,6 +100,11 @@ class DNN(MODEL):
             
         predict (args) -> Numpy Array: Returns predictions for the input data.
             
+        getParams () -> dictionary: Returns the model parameters.
+            
+        update (args) -> None: Updates the model with new data (online 
+            learning).
+            
         explore (args) -> float, dictionary: Performs model selections with
             hyperparameters tunning and return the best score and a dictionary
             with the best performing parameters.
@@ -58,13 +113,22 @@ class DNN(MODEL):
         -
         
     Raises:
-        -
+        ValueError: When search given value is not supported.
         
     '''
     
-    def __init__(self, model_params = None, verbose = False):
+    def __init__(self, model_params = None, verbose = False, cache = None,
+        search = 'grid'):
     
         self._verbose = verbose
+        self._cache = cache
+        
+        if search not in C_SEARCH_MODES:
+            raise ValueError('search argument error. Value given is \'' +
+                str(search) + '\', where supported values are ' + 
+                str(C_SEARCH_MODES))
+        
+        self._search = search
         
         if self._verbose:
             print('- MLPRegressor initialization: ', 
@@ -119,6 +183,108 @@ class DNN(MODEL):
         return self._model.predict(data.iloc[:, :-1].values)
         
     
+    def getParams(self):
+        '''
+        Returns the model parameters.
+    
+        Args:
+            -
+            
+        Raises:
+            -
+
+        Returns:
+            dictionary: The parameters of the sklearn MLPRegressor.
+        '''
+        
+        return self._model.get_params()
+        
+        
+    def update(self, data):
+        '''
+        Updates the model with new data (online learning): one pass of the 
+        stochastic solver over the new data, in mini-batches. The weights of 
+        the model and the state of the solver are kept, so the cost depends on
+        the new data only. An untrained model is initialized by its first 
+        update.
+    
+        Args:
+            data (pandas DataFrame): The new data, preprocessed as the training
+                data.
+            
+        Raises:
+            ValueError: When the solver of the model is not one of the 
+                C_ONLINE_SOLVERS.
+
+        Returns:
+            -
+        '''
+        
+        if self._model.solver not in C_ONLINE_SOLVERS:
+            raise ValueError('solver argument error. Value given is \'' + 
+                str(self._model.solver) + '\', where online updates support ' + 
+                str(C_ONLINE_SOLVERS))
+        
+        self._model.partial_fit(data.iloc[:, :-1].values, 
+            data.iloc[:, -1].values)
+        
+        
+    def _cacheLookup(self, evaluation, data_hash, params):
+        '''
+        Looks up the cache for the result of an evaluation. The key is formed by
+        the evaluation name, the hash of the data and the evaluated parameters.
+    
+        Args:
+            evaluation (string): The evaluation name.
+            
+            data_hash (string): The hash of the train and test data.
+            
+            params (dictionary): The evaluated parameters, e.g. the parameters 
+                of the MLPRegressor object.
+            
+        Raises:
+            -
+
+        Returns:
+            string: The cache key of the evaluation, None if there is no cache.
+            
+            dictionary: The cached result, keys are 'score' and 'model' (the
+                fitted model or None). None if the result is not cached.
+        '''
+        
+        if self._cache is None:
+            return None, None
+            
+        key = self._cache.key(evaluation, data_hash, params)
+        
+        return key, self._cache.get(key)
+        
+        
+    def _cacheStore(self, key, score, model):
+        '''
+        Stores the result of an evaluation in to the cache (see _cacheLookup()).
+    
+        Args:
+            key (string): The cache key of the evaluation, None if there is no 
+                cache.
+            
+            score (object): The score of the evaluation.
+            
+            model (MLPRegressor): The fitted model, stored only when the cache 
+                is configured to store the models. None if not applicable.
+            
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+        
+        if key is not None:
+            self._cache.put(key, {'score': score, 
+                'model': model if self._cache.store_models else None})
+        
+    
     def _calculateTestScore(self, model, data):
         '''
         Returns the r2 score for the test data, after fitting the model with the
@@ -128,7 +294,8 @@ class DNN(MODEL):
             model (MLPRegressor): The MLPRegressor object to be used.
             
             data (dictionary): Contains the train_data and test_data, as keys
-                of the dictionary. Their values are pandas DataFrames.
+                of the dictionary. Their values are pandas DataFrames. It also
+                contains the data_hash key (see _cacheLookup()).
             
         Raises:
             -
@@ -137,13 +304,23 @@ class DNN(MODEL):
             float: r2 score for the prediction of the test data.
         '''
         
+        key, cached = self._cacheLookup('test_score', data['data_hash'], 
+            model.get_params())
+        
+        if cached is not None:
+            return cached['score']
+        
         train_data = data['train_data']
         test_data = data['test_data']
         
         model.fit(train_data.iloc[:, :-1], train_data.iloc[:,-1])
         
-        return r2_score(test_data.iloc[:, -1], 
+        score = r2_score(test_data.iloc[:, -1], 
             model.predict(test_data.iloc[:, :-1]))
+        
+        self._cacheStore(key, score, model)
+        
+        return score
             
             
     def _calculateTrainTestScore(self, model, data):
@@ -155,7 +332,8 @@ class DNN(MODEL):
             model (MLPRegressor): The MLPRegressor object to be used.
             
             data (dictionary): Contains the train_data and test_data, as keys
-                of the dictionary. Their values are pandas DataFrames.
+                of the dictionary. Their values are pandas DataFrames. It also
+                contains the data_hash key (see _cacheLookup()).
             
         Raises:
             -
@@ -166,16 +344,170 @@ class DNN(MODEL):
             float: r2 score for the prediction of the test data.
         '''
         
+        key, cached = self._cacheLookup('train_test_score', data['data_hash'],
+            model.get_params())
+        
+        if cached is not None:
+            return cached['score']
+            
         train_data = data['train_data']
         test_data = data['test_data']
         
         model.fit(train_data.iloc[:, :-1], train_data.iloc[:,-1])
             
-        return r2_score(train_data.iloc[:, -1], 
+        score = r2_score(train_data.iloc[:, -1], 
             model.predict(train_data.iloc[:, :-1])),\
             r2_score(test_data.iloc[:, -1],
             model.predict(test_data.iloc[:, :-1]))
+            
+        self._cacheStore(key, score, model)
+        
+        return score
+
+    
+    def _calculateLearningCurve(self, model, data, iterations):
+        '''
+        Returns the r2 score for the train and the test data for each number of
+        iterations (max_iter), using a single model trained incrementally, one
+        epoch per partial_fit() call. For the stochastic solvers ('adam', 'sgd')
+        without shuffling, the model after i epochs is identical to a model 
+        fitted with max_iter = i: same initialization, same batches and the 
+        optimizer state is kept among the epochs. The stopping rule of fit() is
+        applied on the loss_curve_: when the training loss does not improve by
+        tol for more than n_iter_no_change epochs, the training stops (or the
+        'adaptive' learning rate of 'sgd' is divided, see 
+        C_ADAPTIVE_LEARNING_RATE_DIVISOR) and the model is kept as it is, as a
+        fitted model with a larger max_iter.
+    
+        Args:
+            model (MLPRegressor): The MLPRegressor object to be used.
+            
+            data (dictionary): Contains the train_data, test_data and data_hash
+                keys (see _calculateTrainTestScore()).
+                
+            iterations (list of integers): Increasing numbers of iterations.
+            
+        Raises:
+            -
+
+        Returns:
+            list of floats: r2 score for the train data per number of iterations.
+            
+            list of floats: r2 score for the test data per number of iterations.
+        '''
+        
+        key, cached = self._cacheLookup('learning_curve', data['data_hash'],
+            (model.get_params(), iterations))
+        
+        if cached is not None:
+            return cached['score']
+            
+        train_data = data['train_data']
+        test_data = data['test_data']
+        
+        train_scores = []
+        test_scores = []
+        scored_iterations = set(iterations)
+        stop_iteration = None
+        
+        # Stopping rule state: epochs without improvement, best training loss
+        # and learning rate of the 'adaptive' schedule
+        no_improvement = 0
+        best_loss = np.inf
+        learning_rate = model.learning_rate_init
+        
+        for i in range(1, iterations[-1] + 1):
+            
+            if stop_iteration is None:
+                model.partial_fit(train_data.iloc[:, :-1], train_data.iloc[:,-1])
+                
+                loss = model.loss_curve_[-1]
+                no_improvement = no_improvement + 1 if loss > best_loss - \
+                    model.tol else 0
+                best_loss = min(best_loss, loss)
+                
+                if no_improvement > model.n_iter_no_change:
+                    if model.solver == 'sgd' and model.learning_rate == \
+                        'adaptive' and learning_rate > \
+                        C_ADAPTIVE_MIN_LEARNING_RATE:
+                        learning_rate /= C_ADAPTIVE_LEARNING_RATE_DIVISOR
+                        no_improvement = 0
+                    else:
+                        stop_iteration = i
+            
+            if i not in scored_iterations:
+                continue
+            
+            # After the training stops, the scores do not change
+            if stop_iteration is not None and stop_iteration < i and \
+                len(test_scores) > 0:
+                train_scores.append(train_scores[-1])
+                test_scores.append(test_scores[-1])
+                
+            else:
+                train_scores.append(r2_score(train_data.iloc[:, -1], 
+                    model.predict(train_data.iloc[:, :-1])))
+                test_scores.append(r2_score(test_data.iloc[:, -1],
+                    model.predict(test_data.iloc[:, :-1])))
+                
+        self._cacheStore(key, (train_scores, test_scores), None)
+        
+        return train_scores, test_scores
+        
+    
+    def _searchWidth(self, mpt, model, data):
+        '''
+        Searches the width (neurons per hidden layer) of the hidden layers with
+        the best r2 score for the test data, coarse to fine: the widths of a 
+        coarse grid over C_WIDTH_RANGE are evaluated, then the widths at 
+        distance C_WIDTH_REFINE_STEPS from the best width found so far. 
+        
+        Args:
+            mpt (MPT): The multi process task object used for the evaluations.
+            
+            model (MLPRegressor): The model to be evaluated, its number of 
+                hidden layers is kept.
+                
+            data (dictionary): Contains the train_data, test_data and data_hash
+                keys (see _calculateTestScore()).
+            
+        Raises:
+            -
 
+        Returns:
+            float: The best r2 score for the test data.
+            
+            integer: The width of the best score.
+            
+            dictionary: The r2 score per evaluated width.
+        '''
+        
+        depth = len(model.hidden_layer_sizes)
+        scores = {}
+        
+        widths = np.linspace(C_WIDTH_RANGE[0], C_WIDTH_RANGE[1], 
+            C_WIDTH_COARSE_POINTS).round().astype(int).tolist()
+        
+        for step in (None,) + C_WIDTH_REFINE_STEPS:
+            
+            if step is not None:
+                best_width = max(sorted(scores), key = scores.get)
+                widths = [best_width - step, best_width + step]
+                
+            widths = [w for w in widths if w not in scores and 
+                C_WIDTH_RANGE[0] <= w <= C_WIDTH_RANGE[1]]
+            
+            models = [clone(model).set_params(hidden_layer_sizes = (w,)*depth)
+                for w in widths]
+            
+            scores.update(zip(widths, mpt.execute(models, 
+                self._calculateTestScore, **data)))
+        
+        # The smallest width in case of equal scores
+        best_width = max(sorted(scores), key = scores.get)
+        
+        return scores[best_width], best_width, scores
+        
     
     def explore(self, train_data, test_data, exec_time_stamp):
         '''
@@ -199,9 +531,11 @@ class DNN(MODEL):
                 'learning_rate_init', 'max_iter', 'shuffle') 
         '''
 
+        # Hash of the data content, part of the cache keys
+        data_hash = joblib.hash((train_data, test_data))
+        
         # Prepare train/test folds for GridSearchCV
-        data = train_data.copy()
-        data = data.append(test_data)
+        data = pd.concat([train_data, test_data])
         
         # Use a single test fold
         test_fold = [-1]*len(train_data.index) + [1]*len(test_data.index)
@@ -217,76 +551,122 @@ class DNN(MODEL):
             'max_iter': [200],
             'shuffle': [False], 'random_state': [1]}
              
-        gs = GridSearchCV(estimator = MLPRegressor(), param_grid = params, 
-            scoring = 'r2', n_jobs = -1, refit = True, cv = ps, verbose = 1)
-         
-        gs.fit(data.iloc[:, :-1], data.iloc[:,-1])
+        if self._search == 'halving':
+            # The number of iterations is the budget of the rounds
+            max_iter = params.pop('max_iter')[0]
+            
+            key, cached = self._cacheLookup('halving_search', data_hash, 
+                (params, max_iter, C_HALVING_FACTOR, C_HALVING_MIN_ITER))
+            
+            if cached is None:
+                gs = HalvingGridSearchCV(estimator = MLPRegressor(), 
+                    param_grid = params, resource = 'max_iter', 
+                    max_resources = max_iter, min_resources = C_HALVING_MIN_ITER,
+                    factor = C_HALVING_FACTOR, scoring = 'r2', n_jobs = -1, 
+                    refit = False, cv = ps, verbose = 1)
+                
+                gs.fit(data.iloc[:, :-1], data.iloc[:,-1])
+                
+                # The number of iterations of the last round is included, it
+                # is replaced by the grid value below
+                cached = {'score': (gs.best_score_, gs.best_params_)}
+                self._cacheStore(key, cached['score'], None)
+                
+                print('- Evaluation Step 1: halving rounds, iterations = ', 
+                    gs.n_resources_, ', configurations = ', gs.n_candidates_, 
+                    ', training epochs = ', np.dot(gs.n_resources_, 
+                    gs.n_candidates_), ' of ', gs.n_candidates_[0]*max_iter, 
+                    ' for the grid search', sep = '')
+        
+        else:
+            key, cached = self._cacheLookup('grid_search', data_hash, params)
+        
+            if cached is None:
+                gs = GridSearchCV(estimator = MLPRegressor(), 
+                    param_grid = params, scoring = 'r2', n_jobs = -1, 
+                    refit = True, cv = ps, verbose = 1)
+                 
+                gs.fit(data.iloc[:, :-1], data.iloc[:,-1])
+                
+                cached = {'score': (gs.best_score_, gs.best_params_)}
+                self._cacheStore(key, cached['score'], None)
             
-        best_score = gs.best_score_
-        best_params = gs.best_params_
+        best_score, best_params = cached['score']
+        
+        # The last halving round may use fewer iterations than the grid value
+        # (6*3*3*3 = 162 of 200), the next steps use the grid value
+        if self._search == 'halving':
+            best_params = dict(best_params, max_iter = max_iter)
         
         print('- Evaluation Step 1: best_score = ', best_score, sep = '')
         print('- Evaluation Step 1: best_params = ', best_params, sep = '')
 
         # Explore different sizes of hidden layers
-        models = []
-        scores = []
-        hidden_layer_sizes = []
+        model = MLPRegressor(
+            hidden_layer_sizes = best_params['hidden_layer_sizes'], 
+            activation = best_params['activation'], 
+            solver = best_params['solver'],
+            learning_rate = best_params['learning_rate'], 
+            learning_rate_init = best_params['learning_rate_init'],
+            max_iter = best_params['max_iter'], 
+            shuffle = best_params['shuffle'], random_state=1)
+        
+        # Use multi process class for parallel executing of the tasks, its 
+        # process pool is kept for the next steps and closed on any error
+        with MPT(processes = None, verbose = True, 
+            progress = printProgress) as mpt:
+        
+            best_score, best_width, scores = self._searchWidth(mpt, model, 
+                {'train_data': train_data, 'test_data': test_data, 
+                'data_hash': data_hash})
+        
+            best_params['hidden_layer_sizes'] = \
+                (best_width,)*len(best_params['hidden_layer_sizes'])
+        
+            print('- Evaluation Step 2: widths evaluated = ', len(scores), 
+                ' of ', C_WIDTH_RANGE[1] - C_WIDTH_RANGE[0] + 1, sep = '')
+            print('- Evaluation Step 2: best_score = ', best_score, sep = '')
+            print('- Evaluation Step 2: best_params = ', best_params, sep = '')
 
-        for i in range(2, 201):  
-            hidden_layer_sizes.append((i,)*len(best_params['hidden_layer_sizes']))
-            
-            models.append(MLPRegressor(
-                hidden_layer_sizes = hidden_layer_sizes[-1], 
-                activation = best_params['activation'], 
-                solver = best_params['solver'],
-                learning_rate = best_params['learning_rate'], 
-                learning_rate_init = best_params['learning_rate_init'],
-                max_iter = best_params['max_iter'], 
-                shuffle = best_params['shuffle'], random_state=1))
-        
-        # Use multi process class for parallel executing of the tasks
-        scores = MPT(iteratable = models, task = self._calculateTestScore, 
-            processes = None, verbose = True, train_data = train_data, 
-            test_data = test_data).execute()
-        
-        best_score = max(scores)
-        best_params['hidden_layer_sizes'] = \
-            hidden_layer_sizes[scores.index(best_score)]
+            # Explore number of iterations
+            iterations = list(range(100, 501))
         
-        print('- Evaluation Step 2: best_score = ', best_score, sep = '')
-        print('- Evaluation Step 2: best_params = ', best_params, sep = '')
-
-        # Explore number of iterations
-        models = []
-        train_scores = []
-        test_scores = []
-
-        for i in range(100, 501):
-            models.append(MLPRegressor(
+            model = MLPRegressor(
                 hidden_layer_sizes = best_params['hidden_layer_sizes'], 
                 activation = best_params['activation'], 
                 solver = best_params['solver'],
                 learning_rate = best_params['learning_rate'], 
                 learning_rate_init = best_params['learning_rate_init'],
-                max_iter = i, 
-                shuffle = best_params['shuffle'], random_state=1))
-        
-        # Use multi process class for parallel executing of the tasks
-        scores = MPT(iteratable = models, task = self._calculateTrainTestScore, 
-            processes = None, verbose = True, train_data = train_data, 
-            test_data = test_data).execute()
+                max_iter = iterations[-1], 
+                shuffle = best_params['shuffle'], random_state=1)
+        
+            # Stochastic solvers without shuffling: a single incrementally 
+            # trained model gives the scores for all the numbers of iterations
+            if best_params['solver'] in ['adam', 'sgd'] and \
+                not best_params['shuffle']:
+                train_scores, test_scores = self._calculateLearningCurve(
+                    clone(model), {'train_data': train_data, 
+                    'test_data': test_data, 'data_hash': data_hash}, 
+                    iterations)
+                
+            else:
+                models = [clone(model).set_params(max_iter = i) for i in 
+                    iterations]
+            
+                scores = mpt.execute(models, self._calculateTrainTestScore, 
+                    train_data = train_data, test_data = test_data, 
+                    data_hash = data_hash)
         
-        train_scores = [s[0] for s in scores]
-        test_scores  = [s[1] for s in scores]
+                train_scores = [s[0] for s in scores]
+                test_scores  = [s[1] for s in scores]
         
         best_score = max(test_scores)
-        best_params['max_iter'] = test_scores.index(best_score) + 100
+        best_params['max_iter'] = iterations[test_scores.index(best_score)]
         
         plt.clf()
-        plt.plot(list(range(100, 501)), train_scores, color = 'green', 
+        plt.plot(iterations, train_scores, color = 'green', 
             label = 'train score')
-        plt.plot(list(range(100, 501)), test_scores, color = 'red', 
+        plt.plot(iterations, test_scores, color = 'red', 
             label = 'test score')
         
         plt.legend(loc = 'best', fontsize = 8)
@@ -299,8 +679,16 @@ class DNN(MODEL):
         print('- Evaluation Step 3: best_score = ', best_score, sep = '')
         print('- Evaluation Step 3: best_params = ', best_params, sep = '')
 
-        # Train the model with the best set of hyperparameters
-        self._model = models[test_scores.index(best_score)]
-        self._model.fit(train_data.iloc[:, :-1], train_data.iloc[:,-1])
+        # Train the model with the best set of hyperparameters, unless the
+        # fitted model is cached
+        self._model = clone(model).set_params(max_iter = best_params['max_iter'])
+        
+        key, cached = self._cacheLookup('train_test_score', data_hash, 
+            self._model.get_params())
+        
+        if cached is not None and cached['model'] is not None:
+            self._model = cached['model']
+        else:
+            self._model.fit(train_data.iloc[:, :-1], train_data.iloc[:,-1])
         
         return best_score, best_params
\ No newline at end of file
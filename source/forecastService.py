@@ -0,0 +1,579 @@
+'''
+File name: forecastService.py
+    Local HTTP forecast service: serves the forecasts of model artifacts kept
+    in memory, with micro-batching of the concurrent requests and hot reload of
+    the artifacts.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# My packages
+import utils as ut
+import artifact as af
+import trafficForecast as tf
+
+# Python packages
+import os, argparse, asyncio, json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+'''
+Constants
+'''
+# Examples text to be shown with the -h input option
+C_EXAMPLES = 'Usage Example:\nServe the forecasts of two model artifacts, on ' +\
+    'the local port 8080.\n\n$python -W ignore forecastService.py -a hourly=..' +\
+    '/dumps/artifact_RNN_20261017120000.dump -a daily=../dumps/artifact_DNN_2' +\
+    '0261017120000.dump\n\nForecast the requests of the next 24 hours.\n\n$cur' +\
+    'l "http://127.0.0.1:8080/forecast?model=hourly&horizon=24"\n'
+
+# Maximum forecast horizon of a request
+C_MAX_HORIZON = 8760
+
+# HTTP status lines per status code
+C_HTTP_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class ForecastService():
+    '''
+    Forecast service class implementation.
+
+    An asyncio HTTP/1.1 server (keep alive connections) with the endpoints:
+        GET /forecast?model=<name>&horizon=<steps>: The forecast of the requests
+            for the next time steps, as JSON columns (date tokens and requests).
+        GET /models: The loaded artifacts.
+        GET /stats: Number of requests and forecast batches per model.
+
+    The artifacts are loaded in memory. The forecast requests of a model which
+    arrive within a batch window (or while the previous batch is computed) are
+    served by a single forecast of their longest horizon, each request gets the
+    first rows of it (see trafficForecast.forecastBundle()). The forecasts are
+    computed in a worker thread, the event loop keeps accepting requests. The
+    artifact files are checked periodically and a modified artifact is loaded
+    in a separate loader thread and replaces the previous one when ready, the
+    requests are served by the previous artifact meanwhile and the forecasts do
+    not wait for the load.
+
+    Args:
+        artifacts (dictionary): The artifact file per model name.
+
+        host (string, default is '127.0.0.1'): The server address.
+
+        port (integer, default is 8080): The server port.
+
+        batch_window (float, default is 0.002): Time (seconds) a batch waits
+            for more requests, after its first request.
+
+        max_batch (integer, default is 256): Maximum number of requests per
+            batch, a full batch is computed without waiting.
+
+        reload_interval (float, default is 1.): Time (seconds) between the
+            checks of the artifact files.
+
+        verbose (boolean, default is False): If True print services are enabled.
+
+    Public Attributes:
+        -
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        start (args) -> None: Loads the artifacts and starts the server
+            (coroutine).
+
+        serve (args) -> None: Starts the server and serves until cancelled
+            (coroutine).
+
+        stop (args) -> None: Stops the server (coroutine).
+
+        reload (args) -> boolean: Loads an artifact again if its file is
+            modified (coroutine).
+
+    Private Methods:
+        See methods docstring (def _*)
+
+    Raises:
+        -
+
+    '''
+
+    def __init__(self, artifacts, host = '127.0.0.1', port = 8080,
+        batch_window = 0.002, max_batch = 256, reload_interval = 1.,
+        verbose = False):
+
+        self._verbose = verbose
+
+        if self._verbose:
+            print('\nForecast service initialization: ',
+                ut.formatArguments(locals().items(), 'self'), sep = '')
+
+        self._artifacts = dict(artifacts)
+        self._host = host
+        self._port = port
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._reload_interval = reload_interval
+
+        # Loaded artifacts per model name: (modification time, bundle), and
+        # modification time of the artifacts failed to load
+        self._models = {}
+        self._failed = {}
+
+        # Requests waiting for a forecast per model name: (horizon, future),
+        # and the batch window timer of the pending requests per model name
+        self._pending = {}
+        self._timers = {}
+
+        self._stats = {name: {'requests': 0, 'batches': 0, 'reloads': 0} for
+            name in self._artifacts.keys()}
+
+        # Worker thread of the forecasts, and loader thread of the artifacts
+        # (a long load does not delay the forecasts)
+        self._executor = ThreadPoolExecutor(max_workers = 1)
+        self._loader = ThreadPoolExecutor(max_workers = 1)
+
+        self._server = None
+        self._watcher = None
+
+
+    async def start(self):
+        '''
+        Loads the artifacts and starts the server.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        for name in self._artifacts.keys():
+            await self.reload(name)
+
+        self._server = await asyncio.start_server(self._handle, self._host,
+            self._port)
+        self._watcher = asyncio.ensure_future(self._watch())
+
+        if self._verbose:
+            print('- Forecast service started, address = ', self._host, ':',
+                self._port, ', models = ', list(self._models.keys()), sep = '')
+
+
+    async def serve(self):
+        '''
+        Starts the server and serves until cancelled.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        await self.start()
+
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+
+    async def stop(self):
+        '''
+        Stops the server.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        self._executor.shutdown(wait = False)
+        self._loader.shutdown(wait = False)
+
+
+    async def reload(self, name):
+        '''
+        Loads the artifact of a model again, if its file is modified. The
+        artifact is loaded in the loader thread, the previous one serves the
+        requests until it is replaced. An artifact which fails to load is
+        reported and the previous one is kept.
+
+        Args:
+            name (string): The model name.
+
+        Raises:
+            -
+
+        Returns:
+            boolean: True if the artifact is loaded.
+        '''
+
+        file_name = self._artifacts[name]
+
+        try:
+            modified = os.stat(file_name).st_mtime_ns
+        except OSError as e:
+            print('- Model \'', name, '\' load failed: ', e, sep = '')
+            return False
+
+        if modified in (self._models.get(name, (None,))[0],
+            self._failed.get(name)):
+            return False
+
+        try:
+            bundle = await asyncio.get_running_loop().run_in_executor(
+                self._loader, af.loadArtifact, file_name)
+
+        except Exception as e:
+            self._failed[name] = modified
+
+            print('- Model \'', name, '\' load failed, file = ', file_name,
+                ': ', e, sep = '')
+            return False
+
+        reloaded = name in self._models
+        self._models[name] = (modified, bundle)
+
+        if reloaded:
+            self._stats[name]['reloads'] += 1
+
+        if self._verbose:
+            print('- Model \'', name, '\' ', 'reloaded' if reloaded else
+                'loaded', ', file = ', file_name, ', family = ',
+                bundle['model_family'], ', created = ', bundle['created'],
+                sep = '')
+
+        return True
+
+
+    async def _watch(self):
+        '''
+        Checks the artifact files periodically and reloads the modified ones.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        while True:
+            await asyncio.sleep(self._reload_interval)
+
+            for name in self._artifacts.keys():
+                await self.reload(name)
+
+
+    async def _forecast(self, name, horizon):
+        '''
+        Returns the forecast of a model, through the batch of its pending
+        requests.
+
+        Args:
+            name (string): The model name.
+
+            horizon (integer): Number of time steps to be forecast.
+
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The forecast (see trafficForecast.forecastBundle()).
+        '''
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if name not in self._pending:
+            self._pending[name] = []
+            self._timers[name] = loop.call_later(self._batch_window,
+                self._flush, name)
+
+        self._pending[name].append((horizon, future))
+
+        if len(self._pending[name]) >= self._max_batch:
+            self._flush(name)
+
+        return await future
+
+
+    def _flush(self, name):
+        '''
+        Starts the forecast of the pending requests of a model (one batch). The
+        batch window timer of the requests is cancelled, so that it does not
+        flush the next batch before its window ends.
+
+        Args:
+            name (string): The model name.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        timer = self._timers.pop(name, None)
+
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(name, None)
+
+        if batch:
+            asyncio.ensure_future(self._computeBatch(name, batch))
+
+
+    async def _computeBatch(self, name, batch):
+        '''
+        Computes a single forecast, of the longest horizon, for a batch of
+        requests and sets the result of each request.
+
+        Args:
+            name (string): The model name.
+
+            batch (list of tuples): The requests, (horizon, future).
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        bundle = self._models[name][1]
+        horizon = max(h for h, _ in batch)
+
+        self._stats[name]['requests'] += len(batch)
+        self._stats[name]['batches'] += 1
+
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, tf.forecastBundle, bundle, horizon)
+
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for h, future in batch:
+            if not future.done():
+                future.set_result(result.iloc[:h])
+
+
+    async def _respond(self, method, target):
+        '''
+        Returns the response to a request.
+
+        Args:
+            method (string): The HTTP method.
+
+            target (string): The request target (path and query).
+
+        Raises:
+            -
+
+        Returns:
+            integer: The HTTP status code.
+
+            dictionary: The response body.
+        '''
+
+        if method != 'GET':
+            return 405, {'error': 'only GET requests are supported'}
+
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if url.path == '/models':
+            return 200, {name: {'file': self._artifacts[name],
+                'model_family': bundle['model_family'],
+                'created': bundle['created'], 'version': bundle['version'],
+                'data_hash': bundle['data_hash']} for name, (_, bundle) in
+                self._models.items()}
+
+        if url.path == '/stats':
+            return 200, self._stats
+
+        if url.path != '/forecast':
+            return 404, {'error': 'unknown path \'' + url.path + '\''}
+
+        name = query.get('model')
+
+        if name not in self._models:
+            return 404, {'error': 'unknown model \'' + str(name) + '\''}
+
+        try:
+            horizon = int(query.get('horizon', 1))
+        except ValueError:
+            horizon = 0
+
+        if not 1 <= horizon <= C_MAX_HORIZON:
+            return 400, {'error': 'horizon should be an integer in [1, ' +
+                str(C_MAX_HORIZON) + ']'}
+
+        forecast = await self._forecast(name, horizon)
+
+        return 200, {'model': name, 'created': self._models[name][1][
+            'created'], 'horizon': horizon, 'forecast': forecast.to_dict(
+            'list')}
+
+
+    async def _handle(self, reader, writer):
+        '''
+        Serves the requests of a client connection (HTTP/1.1, keep alive).
+
+        Args:
+            reader (StreamReader): The connection input stream.
+
+            writer (StreamWriter): The connection output stream.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        try:
+            while True:
+                request_line = await reader.readline()
+
+                if not request_line:
+                    break
+
+                headers = {}
+
+                while True:
+                    line = await reader.readline()
+
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+
+                # Request bodies are not used, they are skipped
+                if 'content-length' in headers:
+                    await reader.readexactly(int(headers['content-length']))
+
+                request = request_line.decode('latin-1').split()
+
+                if len(request) != 3:
+                    version = 'HTTP/1.0'
+                    status, body = 400, {'error': 'malformed request'}
+
+                else:
+                    method, target, version = request
+
+                    try:
+                        status, body = await self._respond(method, target)
+                    except Exception as e:
+                        status, body = 500, {'error': str(e)}
+
+                keep_alive = version == 'HTTP/1.1' and \
+                    headers.get('connection', '').lower() != 'close'
+
+                content = json.dumps(body).encode()
+
+                writer.write(('HTTP/1.1 ' + str(status) + ' ' +
+                    C_HTTP_STATUS[status] + '\r\nContent-Type: application/' +
+                    'json\r\nContent-Length: ' + str(len(content)) +
+                    '\r\nConnection: ' + ('keep-alive' if keep_alive else
+                    'close') + '\r\n\r\n').encode() + content)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            writer.close()
+
+
+def parseInputArguments():
+    '''
+    Parses the input arguments.
+
+    Args:
+        -
+
+    Raises:
+        -
+
+    Returns:
+        namespace: The input arguments passed.
+    '''
+
+    args_parser = argparse.ArgumentParser(description = 'Run forecast service',
+        epilog = C_EXAMPLES, formatter_class = argparse.RawTextHelpFormatter)
+
+    args_parser.add_argument('-a', action = 'append', required = True,
+        help = 'model name and artifact file (see TF.train()), can be given '  +\
+        'more than once', metavar = 'name=artifact_file')
+
+    args_parser.add_argument('-p', action = 'store', type = int,
+        default = 8080, help = 'server port', metavar = 'port')
+
+    args_parser.add_argument('-w', action = 'store', type = float,
+        default = 0.002, help = 'batch window (seconds), time a forecast '     +\
+        'waits for concurrent requests of the same model', metavar = 'window')
+
+    args_parser.add_argument('-r', action = 'store', type = float,
+        default = 1., help = 'interval (seconds) of the artifact files checks' +\
+        ', modified artifacts are reloaded', metavar = 'reload_interval')
+
+    return args_parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    # Read input arguments
+    input_arguments = parseInputArguments()
+
+    artifacts = dict(a.split('=', 1) for a in input_arguments.a)
+
+    service = ForecastService(artifacts, port = input_arguments.p,
+        batch_window = input_arguments.w,
+        reload_interval = input_arguments.r, verbose = True)
+
+    try:
+        asyncio.run(service.serve())
+    except KeyboardInterrupt:
+        pass
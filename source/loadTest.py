@@ -0,0 +1,181 @@
+'''
+File name: loadTest.py
+    Load test of the local forecast service (see forecastService.py): latency
+    percentiles and throughput of concurrent forecast requests.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# Python packages
+import argparse, asyncio, json, time
+import numpy as np
+
+'''
+Constants
+'''
+# Examples text to be shown with the -h input option
+C_EXAMPLES = 'Usage Example:\nSend 2000 forecast requests (24 hours horizon) ' +\
+    'for the model \'hourly\', from 32 concurrent connections.\n\n$python loa' +\
+    'dTest.py -m hourly -o 24 -n 2000 -c 32\n'
+
+
+async def _client(host, port, targets, latencies):
+    '''
+    Sends requests over a keep alive connection, one at a time, and records
+    their latency.
+
+    Args:
+        host (string): The service address.
+
+        port (integer): The service port.
+
+        targets (list of strings): The request targets (path and query).
+
+        latencies (list of floats): The latencies (seconds) of the successful
+            requests are appended.
+
+    Raises:
+        RuntimeError: When a response status is not 200.
+
+    Returns:
+        -
+    '''
+
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        for target in targets:
+            start_time = time.perf_counter()
+
+            writer.write(('GET ' + target + ' HTTP/1.1\r\nHost: ' + host +
+                '\r\n\r\n').encode())
+            await writer.drain()
+
+            status = (await reader.readline()).split()[1]
+            headers = {}
+
+            while True:
+                line = await reader.readline()
+
+                if line in (b'\r\n', b''):
+                    break
+
+                key, _, value = line.decode('latin-1').partition(':')
+                headers[key.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers['content-length']))
+
+            if status != b'200':
+                raise RuntimeError('Request \'' + target + '\' failed, ' +
+                    'status = ' + status.decode() + ': ' + body.decode())
+
+            latencies.append(time.perf_counter() - start_time)
+
+    finally:
+        writer.close()
+
+
+async def loadTest(host = '127.0.0.1', port = 8080, model = None,
+    horizon = 1, requests = 1000, concurrency = 16):
+    '''
+    Sends forecast requests to the service from concurrent connections and
+    reports the latency percentiles and the throughput.
+
+    Args:
+        host (string, default is '127.0.0.1'): The service address.
+
+        port (integer, default is 8080): The service port.
+
+        model (string): The model name.
+
+        horizon (integer, default is 1): The forecast horizon of the requests.
+
+        requests (integer, default is 1000): Total number of requests.
+
+        concurrency (integer, default is 16): Number of concurrent connections.
+
+    Raises:
+        RuntimeError: When a response status is not 200.
+
+    Returns:
+        dictionary: The p50, p99 and max latencies (seconds) and the
+            requests_per_sec.
+    '''
+
+    target = '/forecast?model=' + model + '&horizon=' + str(horizon)
+    latencies = []
+
+    print('\nLoad test: model = ', model, ', horizon = ', horizon,
+        ', requests = ', requests, ', concurrency = ', concurrency, sep = '')
+
+    start_time = time.perf_counter()
+
+    await asyncio.gather(*[_client(host, port, [target]*(requests//concurrency +
+        (i < requests%concurrency)), latencies) for i in range(concurrency)])
+
+    elapsed = time.perf_counter() - start_time
+
+    results = {'p50': np.percentile(latencies, 50),
+        'p99': np.percentile(latencies, 99), 'max': max(latencies),
+        'requests_per_sec': len(latencies)/elapsed}
+
+    print('- Latency: p50 = ', round(results['p50']*1000, 2), ' ms, p99 = ',
+        round(results['p99']*1000, 2), ' ms, max = ',
+        round(results['max']*1000, 2), ' ms', sep = '')
+    print('- Throughput: ', round(results['requests_per_sec'], 1),
+        ' requests/sec, time elapsed: ', round(elapsed, 3), ' seconds', sep = '')
+
+    return results
+
+
+def parseInputArguments():
+    '''
+    Parses the input arguments.
+
+    Args:
+        -
+
+    Raises:
+        -
+
+    Returns:
+        namespace: The input arguments passed.
+    '''
+
+    args_parser = argparse.ArgumentParser(description = 'Run forecast service ' +
+        'load test', epilog = C_EXAMPLES,
+        formatter_class = argparse.RawTextHelpFormatter)
+
+    args_parser.add_argument('-m', action = 'store', required = True,
+        help = 'model name', metavar = 'model')
+
+    args_parser.add_argument('-o', action = 'store', type = int, default = 1,
+        help = 'forecast horizon of the requests', metavar = 'horizon')
+
+    args_parser.add_argument('-n', action = 'store', type = int,
+        default = 1000, help = 'total number of requests', metavar = 'requests')
+
+    args_parser.add_argument('-c', action = 'store', type = int, default = 16,
+        help = 'number of concurrent connections', metavar = 'concurrency')
+
+    args_parser.add_argument('-p', action = 'store', type = int,
+        default = 8080, help = 'service port', metavar = 'port')
+
+    return args_parser.parse_args()
+
+
+if __name__ == '__main__':
+
+    # Read input arguments
+    input_arguments = parseInputArguments()
+
+    asyncio.run(loadTest(port = input_arguments.p, model = input_arguments.m,
+        horizon = input_arguments.o, requests = input_arguments.n,
+        concurrency = input_arguments.c))
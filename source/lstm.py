@@ -1,35 +1,333 @@
 '''
 File name: lstm.py
     LSTM traffic forecast implementation.
-           
+
 Author: Vasileios Saveris
 email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 10.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
 
-from model import MODEL
-
-class LSTM(MODEL):
-    
-    def __init__(self):
-        
-        raise NotImplementedError
-        
-        
-    def train(self):
-        
-        pass
-        
-        
-    def predict(self):
-        
-        pass
-        
-    def explore(self):
-    
-        pass
\ No newline at end of file
+# My packages
+from rnn import RNN, _glorot
+
+# Python packages
+import numpy as np
+
+'''
+Constants
+'''
+# Default model parameters, bptt_steps is the number of the last time steps of
+# each window the gradients are back propagated through (None for the whole
+# window)
+C_DEFAULT_PARAMS = {'hidden_size': 32, 'window': 24, 'bptt_steps': 24,
+    'learning_rate': 0.001, 'batch_size': 64, 'epochs': 10, 'clip_norm': 5.,
+    'random_state': 1}
+
+# Parameters explored by explore(), the rest keep their default values
+C_EXPLORE_PARAMS = {'hidden_size': [16, 32, 64], 'window': [24, 72, 168]}
+
+
+class LSTM(RNN):
+    '''
+    LSTM class implementation.
+
+    A single layer long short term memory network with a linear output,
+    implemented with NumPy (CPU). Samples, targets, scaling, training and
+    prediction are the same as the RNN model (see rnn.RNN). The four gates of a
+    time step are computed with one matrix multiply of the concatenated input
+    and hidden state. The gradients are back propagated through the last
+    bptt_steps time steps of the window only (truncated BPTT), the earlier time
+    steps are computed without keeping their activations. The activations are
+    kept in buffers preallocated per mini-batch size and reused across the
+    mini-batches and the epochs, so the training memory depends on the
+    mini-batch size and bptt_steps, not on the window length or the length of
+    the series.
+
+    Args:
+        model_params (dictionary, default is None): The model parameters, keys
+            are ('hidden_size', 'window', 'bptt_steps', 'learning_rate',
+            'batch_size', 'epochs', 'clip_norm', 'random_state'). Missing keys
+            take their default values (see C_DEFAULT_PARAMS).
+
+        verbose (boolean, default is False): If True print services are enabled.
+
+        cache (ResultCache, default is None): Persistent cache for the scores
+            of the explore() evaluations. Cached evaluations are skipped when
+            explore() is executed again.
+
+        search (string, default is 'grid'): Search mode of the explore(), only
+            'grid' is supported.
+
+    Public Attributes:
+        loss_curve (list of floats): Mean training loss per epoch.
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        train (args) -> None: Trains the model with the input data.
+
+        predict (args) -> Numpy Array: Returns predictions for the input data.
+
+        update (args) -> None: Updates the model with new data.
+
+        explore (args) -> float, dictionary: Performs model selections with
+            hyperparameters tunning and return the best score and a dictionary
+            with the best performing parameters.
+
+    Private Methods:
+        See methods docstring (def _*)
+
+    Raises:
+        ValueError: When search given value is not supported.
+
+    '''
+
+    def __init__(self, model_params = None, verbose = False, cache = None,
+        search = 'grid'):
+
+        super().__init__(dict(C_DEFAULT_PARAMS, **(model_params or {})),
+            verbose, cache, search)
+
+        # Activation buffers per (mini-batch size, stored time steps)
+        self._buffers = {}
+
+
+    def __getstate__(self):
+        '''
+        Returns the state of the object for pickling, without the activation
+        buffers (they are allocated again when needed).
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The state of the object.
+        '''
+
+        return dict(self.__dict__, _buffers = {})
+
+
+    def _initialize(self, features):
+        '''
+        Initializes the weights of the network (Glorot uniform, zero biases
+        except the forget gate ones which are 1). The gate weights are fused in
+        one matrix, the rows are the input features followed by the hidden
+        state, the columns are the input, forget, output and candidate gates.
+
+        Args:
+            features (integer): Number of input features per time step.
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The weights per name.
+        '''
+
+        rng = np.random.RandomState(self._params['random_state'])
+        hidden_size = self._params['hidden_size']
+
+        b = np.zeros(4*hidden_size)
+        b[hidden_size:2*hidden_size] = 1.
+
+        self._buffers = {}
+
+        return {'W': _glorot(rng, features + hidden_size, 4*hidden_size),
+            'b': b, 'W_y': _glorot(rng, hidden_size, 1)[:, 0],
+            'b_y': np.zeros(1)}
+
+
+    def _buffer(self, batch, features, steps):
+        '''
+        Returns the activation buffers for a mini-batch size, allocated on
+        first use.
+
+        Args:
+            batch (integer): The mini-batch size.
+
+            features (integer): Number of input features per time step.
+
+            steps (integer): Number of time steps with stored activations.
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The buffers, 'xh' (concatenated input and hidden
+                state), 'gates' (gate activations), 'c' (cell states), 'tanh_c'
+                (cell states tanh) per stored time step, 'h' (current hidden
+                state) and 'da' (gates gradient).
+        '''
+
+        key = (batch, features, steps)
+
+        if key not in self._buffers:
+            hidden_size = self._params['hidden_size']
+            slots = max(steps, 1)
+
+            self._buffers[key] = {
+                'xh': np.empty((slots, batch, features + hidden_size)),
+                'gates': np.empty((slots, batch, 4*hidden_size)),
+                'c': np.empty((slots + 1, batch, hidden_size)),
+                'tanh_c': np.empty((slots, batch, hidden_size)),
+                'h': np.empty((batch, hidden_size)),
+                'da': np.empty((batch, 4*hidden_size))}
+
+        return self._buffers[key]
+
+
+    def _forward(self, x, store = True):
+        '''
+        Forward pass for a mini-batch of windows. The activations of the last
+        bptt_steps time steps are stored, the earlier ones share the first
+        slot of the buffers.
+
+        Args:
+            x (Numpy Array): The windows, of shape (batch, window, features).
+
+            store (boolean, default is True): If False, the activations of the
+                backward pass are not kept (prediction only).
+
+        Raises:
+            -
+
+        Returns:
+            Numpy Array: The predictions, of shape (batch,).
+
+            object: The activations needed by the backward pass.
+        '''
+
+        w = self._weights
+        batch, window, features = x.shape
+        hidden_size = self._params['hidden_size']
+
+        steps = 0
+
+        if store:
+            steps = min(self._params['bptt_steps'] or window, window)
+
+        buffer = self._buffer(batch, features, steps)
+        first = window - steps
+
+        h = buffer['h']
+        h.fill(0.)
+        buffer['c'][0].fill(0.)
+
+        for t in range(window):
+            s = max(t - first, 0)
+
+            xh = buffer['xh'][s]
+            xh[:, :features] = x[:, t]
+            xh[:, features:] = h
+
+            # All the gates in one matrix multiply
+            a = buffer['gates'][s]
+            np.matmul(xh, w['W'], out = a)
+            a += w['b']
+
+            # Sigmoid of the input, forget, output gates (as tanh, no overflow)
+            sigmoid = a[:, :3*hidden_size]
+            sigmoid *= 0.5
+            np.tanh(sigmoid, out = sigmoid)
+            sigmoid += 1.
+            sigmoid *= 0.5
+
+            np.tanh(a[:, 3*hidden_size:], out = a[:, 3*hidden_size:])
+
+            i, f, o, g = np.split(a, 4, axis = 1)
+
+            # The cell state is updated in place before the stored time steps
+            c = buffer['c'][s + 1 if t >= first else 0]
+            np.multiply(f, buffer['c'][s], out = c)
+            c += i*g
+
+            np.tanh(c, out = buffer['tanh_c'][s])
+            np.multiply(o, buffer['tanh_c'][s], out = h)
+
+        buffer['steps'] = steps
+
+        return h @ w['W_y'] + w['b_y'], buffer
+
+
+    def _backward(self, x, buffer, error):
+        '''
+        Backward pass (truncated back propagation through time) for a
+        mini-batch.
+
+        Args:
+            x (Numpy Array): The windows, see _forward().
+
+            buffer (object): The activations returned by _forward().
+
+            error (Numpy Array): Derivative of the loss with respect to the
+                predictions, of shape (batch,).
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The gradients per weight name.
+        '''
+
+        w = self._weights
+        features = x.shape[2]
+        hidden_size = self._params['hidden_size']
+
+        grads = {'W': np.zeros_like(w['W']), 'b': np.zeros_like(w['b']),
+            'W_y': buffer['h'].T @ error, 'b_y': np.array([error.sum()])}
+
+        da = buffer['da']
+        di, df, do, dg = np.split(da, 4, axis = 1)
+
+        dh = np.outer(error, w['W_y'])
+        dc = np.zeros_like(dh)
+
+        for s in reversed(range(buffer['steps'])):
+            i, f, o, g = np.split(buffer['gates'][s], 4, axis = 1)
+            tanh_c = buffer['tanh_c'][s]
+
+            dc += dh*o*(1. - tanh_c**2)
+
+            # Gradients of the gates pre-activations
+            np.multiply(dh*tanh_c, o*(1. - o), out = do)
+            np.multiply(dc*g, i*(1. - i), out = di)
+            np.multiply(dc*buffer['c'][s], f*(1. - f), out = df)
+            np.multiply(dc*i, 1. - g**2, out = dg)
+
+            grads['W'] += buffer['xh'][s].T @ da
+            grads['b'] += da.sum(axis = 0)
+
+            dh = da @ w['W'][features:].T
+            dc *= f
+
+        return grads
+
+
+    def _exploreGrid(self):
+        '''
+        Returns the parameters evaluated by explore(): each combination of the
+        C_EXPLORE_PARAMS values, the rest of the parameters as given in the
+        constructor.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            list of dictionaries: The model parameters, see constructor.
+        '''
+
+        return [dict(self._params, hidden_size = h, window = w) for h in
+            C_EXPLORE_PARAMS['hidden_size'] for w in C_EXPLORE_PARAMS['window']]
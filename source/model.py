@@ -7,7 +7,7 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 10.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
@@ -41,4 +41,13 @@ class MODEL(ABC):
         '''
         Method for hyperparameters auto-tunning of the model.
         '''
-        pass
\ No newline at end of file
+        pass
+        
+        
+    def update(self, data):
+        '''
+        Method for updating the trained model with new data (online learning).
+        Models without online updates are trained again with the new data only
+        (see train()), the previous fit is discarded.
+        '''
+        self.train(data)
\ No newline at end of file
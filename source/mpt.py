@@ -7,7 +7,7 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 15.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
@@ -16,8 +16,454 @@ Python Version: 3.8
 import utils as ut
 
 # Python packages
-import time
-from multiprocessing import Pool
+import os, sys, time, pickle, itertools, threading
+import numpy as np
+import pandas as pd
+from functools import partial
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+# Peak memory of the processes, not available on Windows
+try:
+    import resource
+except ImportError:
+    resource = None
+
+'''
+Constants
+'''
+# Array kinds which can be placed in shared memory: boolean, integer, float,
+# complex, timedelta and datetime
+C_SHARED_KINDS = 'biufcmM'
+
+# Alignment (bytes) of the arrays in a shared memory block
+C_SHARED_ALIGNMENT = 64
+
+# Number of chunks per process for the adaptive (guided) chunk sizes, the
+# chunks get smaller as the remaining tasks decrease
+C_CHUNKS_PER_PROCESS = 2
+
+'''
+Worker process state, the job (task and arguments) currently loaded
+'''
+_worker_job = None
+
+
+def _releaseJob():
+    '''
+    Releases the job loaded in the worker process. The views of the shared data
+    are dropped before their shared memory blocks are detached.
+
+    Args:
+        -
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+
+    global _worker_job
+
+    if _worker_job is None:
+        return
+
+    shared = _worker_job['shared']
+    _worker_job = None
+
+    for s in shared:
+        s.detach()
+
+
+def _loadJob(job_id, payload):
+    '''
+    Loads a job in the worker process, unless it is already loaded. The task
+    and its arguments are unpickled once per job and process, shared data are
+    attached to their shared memory blocks, without copying.
+
+    Args:
+        job_id (integer): The id of the job.
+
+        payload (SharedData): The pickled (task, kwargs) of the job. Shared
+            data in the kwargs are given as SharedData objects.
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+
+    global _worker_job
+
+    if _worker_job is not None and _worker_job['id'] == job_id:
+        return
+
+    _releaseJob()
+
+    task, kwargs = pickle.loads(payload.attach())
+    payload.detach()
+
+    _worker_job = {'id': job_id, 'task': task,
+        'shared': [v for v in kwargs.values() if isinstance(v, SharedData)],
+        'kwargs': {k: v.attach() if isinstance(v, SharedData) else v for k, v
+        in kwargs.items()}}
+
+
+def _currentMemory():
+    '''
+    Returns the current resident set size (RSS) of the process, read from 
+    /proc (Linux).
+
+    Args:
+        -
+
+    Raises:
+        -
+
+    Returns:
+        integer: The RSS in bytes, None if it is not available.
+    '''
+
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1])*os.sysconf('SC_PAGE_SIZE')
+
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _peakMemory():
+    '''
+    Returns the peak resident set size (RSS) of the process, over its whole 
+    lifetime (high water mark, it never decreases).
+
+    Args:
+        -
+
+    Raises:
+        -
+
+    Returns:
+        integer: The peak RSS in bytes, None if it is not available.
+    '''
+
+    if resource is None:
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes, except on macOS
+    return peak_rss if sys.platform == 'darwin' else peak_rss*1024
+
+
+def _executeChunk(job_id, payload, chunk):
+    '''
+    Executes the task of a job for a chunk of members of the iteratable, and
+    measures each task execution.
+
+    Args:
+        job_id, payload: See _loadJob().
+
+        chunk (list): The (position, member) pairs of the chunk.
+
+    Raises:
+        -
+
+    Returns:
+        list: The (position, object returned by the task, measurements) tuples
+            of the chunk. Measurements is a dictionary with the keys 'worker'
+            (process id), 'wall_time', 'cpu_time' (seconds), 'rss_delta' 
+            (bytes, current RSS of the process after the task minus before it)
+            and 'worker_peak_rss' (bytes, peak RSS of the process since it 
+            started, it includes the previous tasks of the process).
+    '''
+
+    _loadJob(job_id, payload)
+
+    results = []
+
+    for position, member in chunk:
+        rss = _currentMemory()
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+
+        result = _worker_job['task'](member, _worker_job['kwargs'])
+
+        wall_time = time.perf_counter() - wall_time
+        cpu_time = time.process_time() - cpu_time
+
+        results.append((position, result, {'worker': os.getpid(),
+            'wall_time': wall_time, 'cpu_time': cpu_time, 
+            'rss_delta': None if rss is None else _currentMemory() - rss,
+            'worker_peak_rss': _peakMemory()}))
+
+    return results
+
+
+def printProgress(completed, total, elapsed, eta):
+    '''
+    Progress callback of the MPT (see MPT), prints the progress of an execution
+    in a single line.
+
+    Args:
+        completed (integer): Number of completed tasks.
+
+        total (integer): Number of tasks.
+
+        elapsed (float): Elapsed time in seconds.
+
+        eta (float): Estimated remaining time in seconds.
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+
+    print('\r- Multi Process Task progress: ', completed, '/', total,
+        ' tasks, elapsed: ', round(elapsed, 1), ' seconds, eta: ',
+        round(eta, 1), ' seconds', sep = '', end = '\n' if completed ==
+        total else '', flush = True)
+
+
+class SharedData():
+    '''
+    Shared Data class implementation.
+
+    A NumPy array or a DataFrame copied in to a shared memory block, once. The
+    object is pickled without the data, so it is cheap to pass to the worker
+    processes, where attach() returns the data as a read only view of the
+    shared memory block. The columns of a DataFrame are stored one after the
+    other and keep their types.
+
+    Args:
+        data (Numpy Array or DataFrame): The data to be shared, see
+            isShareable().
+
+    Public Attributes:
+        size (integer): The size of the shared memory block in bytes.
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        isShareable (args) -> boolean: Checks if data can be shared (static
+            method).
+
+        attach (args) -> Numpy Array or DataFrame: Returns the shared data.
+
+        detach (args) -> None: Detaches the shared memory block from the
+            process.
+
+        release (args) -> None: Releases the shared memory block.
+
+    Private Methods:
+        -
+
+    Raises:
+        ValueError: When the data cannot be shared.
+
+    '''
+
+    def __init__(self, data):
+
+        if not SharedData.isShareable(data):
+            raise ValueError('data argument error. Only numeric NumPy ' +
+                'arrays and DataFrames can be shared, type given is \'' +
+                str(type(data)) + '\'')
+
+        if isinstance(data, pd.DataFrame):
+            self._index = data.index
+            self._columns = data.columns
+            arrays = [data.iloc[:, i].to_numpy() for i in range(
+                len(data.columns))]
+        else:
+            self._index = None
+            self._columns = None
+            arrays = [data]
+
+        # Layout of the arrays in the block: (dtype, shape, offset)
+        self._layout = []
+        self.size = 0
+
+        for a in arrays:
+            self._layout.append((a.dtype.str, a.shape, self.size))
+            self.size += -(-a.nbytes//C_SHARED_ALIGNMENT)*C_SHARED_ALIGNMENT
+
+        self._memory = SharedMemory(create = True, size = max(self.size, 1))
+        self._name = self._memory.name
+
+        for a, (dtype, shape, offset) in zip(arrays, self._layout):
+            np.ndarray(shape, dtype = dtype, buffer = self._memory.buf,
+                offset = offset)[...] = a
+
+
+    def __getstate__(self):
+
+        # The shared memory block is attached by name in the other processes
+        state = self.__dict__.copy()
+        state['_memory'] = None
+
+        return state
+
+
+    @staticmethod
+    def isShareable(data):
+        '''
+        Checks if data can be shared: numeric NumPy arrays and DataFrames with
+        numeric NumPy columns only.
+
+        Args:
+            data (object): The data.
+
+        Raises:
+            -
+
+        Returns:
+            boolean: True if the data can be shared.
+        '''
+
+        if isinstance(data, np.ndarray):
+            return data.dtype.kind in C_SHARED_KINDS
+
+        if isinstance(data, pd.DataFrame):
+            return all(isinstance(t, np.dtype) and t.kind in C_SHARED_KINDS
+                for t in data.dtypes)
+
+        return False
+
+
+    def attach(self):
+        '''
+        Returns the shared data, as a read only view of the shared memory block.
+        The block stays attached for the lifetime of this object.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            Numpy Array or DataFrame: The shared data.
+        '''
+
+        if self._memory is None:
+            self._memory = SharedMemory(name = self._name)
+
+        arrays = []
+
+        for dtype, shape, offset in self._layout:
+            a = np.ndarray(shape, dtype = dtype, buffer = self._memory.buf,
+                offset = offset)
+            a.flags.writeable = False
+            arrays.append(a)
+
+        if self._columns is None:
+            return arrays[0]
+
+        # Columns are not consolidated, the data frame is a view of the arrays
+        data = pd.DataFrame(dict(enumerate(arrays)), copy = False)
+        data.columns = self._columns
+        data.index = self._index
+
+        return data
+
+
+    def detach(self):
+        '''
+        Detaches the shared memory block from the process. The data returned by
+        attach() must not be used afterwards.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        if self._memory is not None:
+            self._memory.close()
+            self._memory = None
+
+
+    def release(self):
+        '''
+        Releases the shared memory block. To be called by the process which
+        created the object, when the other processes do not use it anymore.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _releaseShared(shared, chunk_iterator = None):
+    '''
+    Releases the shared data of an execution, after its pending chunks are 
+    completed (their results and errors are dropped).
+
+    Args:
+        shared (list of SharedData): The shared data.
+
+        chunk_iterator (iterator, default is None): The results of the chunks
+            of the execution. If None, the chunks are not waited.
+
+    Raises:
+        -
+
+    Returns:
+        -
+    '''
+
+    if chunk_iterator is not None:
+        while True:
+            try:
+                next(chunk_iterator)
+            except StopIteration:
+                break
+            except Exception:
+                continue
+
+    for s in shared:
+        s.release()
+
+
+def _createPool(processes):
+    '''
+    Creates a process pool. On POSIX, the resource tracker of the shared memory
+    blocks is started first, so that it is shared with the processes and the
+    blocks they attach are not reported as leaked when they exit.
+
+    Args:
+        processes (int): The number of processes, see MPT.
+
+    Raises:
+        -
+
+    Returns:
+        Pool: The process pool.
+    '''
+
+    if os.name == 'posix':
+        resource_tracker.ensure_running()
+
+    return Pool(processes)
 
 
 class MPT():
@@ -28,23 +474,45 @@ class MPT():
     given task for an iteratable collection. The number of processes, the 
     iteratable, the task and the input arguments for the task are given as input 
     parameters.
+    
+    The task and its arguments are pickled once per execution, in to shared 
+    memory, and loaded once by each process. Arguments which are numeric NumPy 
+    arrays or DataFrames are placed in shared memory, once, and the processes 
+    read them without copying (read only). The members of the iteratable are 
+    sent in chunks, of a fixed size or of decreasing (guided) sizes.
+    
+    The process pool is created for each execution, unless the MPT object is 
+    used as a context manager (or open() is called): then the pool is kept 
+    among the executions, which can be of different tasks, until the context 
+    exits (or close() is called).
 
     Args:
-        iteratable (iteratable): An iteratable object. The task has to be 
-            executed for each member of the iteretable. Each member of the
-            iteratable is the first argument of the task. The rest arguments
-            of the task are taken from the **kwargs argument (see below).
+        iteratable (iteratable, default is None): An iteratable object. The 
+            task has to be executed for each member of the iteretable. Each 
+            member of the iteratable is the first argument of the task. The rest
+            arguments of the task are taken from the **kwargs argument (see 
+            below). It can be given per execution instead.
             
-        task (object): The task to be executed for each member of the iteratable.
-            It should be a function call.
+        task (object, default is None): The task to be executed for each member
+            of the iteratable. It should be a function call. It can be given 
+            per execution instead.
             
         processes (int): The number of processes to be used. If None, then the
             created processes are equal to the number of the available cpu cores.
         
         verbose (boolean, default is False): If True print services are enabled.
         
+        chunksize (int, default is None): Number of members of the iteratable 
+            sent to a process at once. If None, the chunk sizes are adaptive, 
+            the remaining members divided by C_CHUNKS_PER_PROCESS times the 
+            number of processes.
+        
+        progress (callable, default is None): Called in the parent process 
+            each time a task is completed, as progress(completed, total, 
+            elapsed, eta), see printProgress().
+        
         **kwargs (dictionary): The arguments to be passed on each task call.
-            The call to each task should be task(member, **kwargs), where member
+            The call to each task should be task(member, kwargs), where member
             is each member of the iteratable.
 
     Public Attributes:
@@ -55,37 +523,72 @@ class MPT():
                                 
     Public Methods:
         
+        open (args) -> MPT: Starts a process pool to be used by all the 
+            executions.
+        
+        close (args) -> None: Stops the process pool started by open().
+        
         execute (args) -> list: Executes the task for the input arguments. It 
             returns a list of objects returned by each task execution.
         
+        iterate (args) -> generator: Executes the task for the input arguments.
+            It yields the (position, object returned) pairs of the task 
+            executions, as they complete.
+        
+        report (args) -> DataFrame: Returns the measurements of each task of 
+            the last execution.
+        
     Private Methods:
-        -
+        See methods docstring (def _*)
         
     Raises:
         -
         
     '''
 
-    def __init__(self, iteratable, task, processes = None, verbose = False, 
-        **kwargs):
+    def __init__(self, iteratable = None, task = None, processes = None, 
+        verbose = False, chunksize = None, progress = None, **kwargs):
         
         self._verbose = verbose
         
         if self._verbose:
             print('- Multi Process Task initialization: ', 
                 ut.formatArguments(locals().items(), ['self', 'iteratable', 
-                'verbose', 'kwargs']), ', number of tasks = ', len(iteratable),
-                sep = '', end = '', flush = True)
+                'task', 'verbose', 'progress', 'kwargs']), sep = '')
         
         self._processes = processes
+        self._chunksize = chunksize
+        self._progress = progress
         self._iteratable = iteratable
         self._task = task
         self._kwargs = kwargs
-                
+        
+        self._pool = None
+        self._job_ids = itertools.count()
+        
+        # Threads releasing the shared data of the executions of the kept pool
+        # which were not completed, after their pending chunks (see iterate())
+        self._releases = []
+        
+        # Members and measurements of the tasks of the last execution
+        self._members = []
+        self._measurements = {}
+        
+    
+    def __enter__(self):
+        
+        return self.open()
+        
     
-    def execute(self):
+    def __exit__(self, exc_type, exc_value, traceback):
+        
+        self.close()
+        
+    
+    def open(self):
         '''
-        Executes a task for each member of an iteratable using a process pool
+        Starts a process pool to be used by all the executions, until close() 
+        is called.
     
         Args:
             -
@@ -94,24 +597,240 @@ class MPT():
             -
 
         Returns:
-            list: A list of objects returned by each task execution. 
+            MPT: The object itself.
         '''
         
+        if self._pool is None:
+            self._pool = _createPool(self._processes)
+        
+        return self
+        
+    
+    def close(self):
+        '''
+        Stops the process pool started by open(), after the pending tasks are
+        completed. The shared data of the executions closed early are released
+        too.
+    
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+        
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            
+        for thread in self._releases:
+            thread.join()
+            
+        self._releases = []
+        
+    
+    def _chunks(self, iteratable):
+        '''
+        Splits the members of an iteratable in to chunks, of a fixed size 
+        (chunksize) or of decreasing sizes (guided): large chunks for less 
+        communication at the beginning, small ones for balancing the processes 
+        at the end.
+    
+        Args:
+            iteratable (iteratable): The iteratable.
+
+        Raises:
+            -
+
+        Returns:
+            list of lists: The chunks, lists of (position, member) pairs.
+        '''
+        
+        members = list(enumerate(iteratable))
+        processes = self._processes or os.cpu_count() or 1
+        
+        chunks = []
+        first = 0
+        
+        while first < len(members):
+            if self._chunksize is not None:
+                size = self._chunksize
+            else:
+                size = -(-(len(members) - first)//(C_CHUNKS_PER_PROCESS*
+                    processes))
+            
+            chunks.append(members[first:first + size])
+            first += size
+            
+        return chunks
+        
+    
+    def iterate(self, iteratable = None, task = None, **kwargs):
+        '''
+        Executes a task for each member of an iteratable using a process pool.
+        The results are yielded as they complete, so they can be processed 
+        while the rest tasks are executed. If the generator is closed early, 
+        the pending tasks are not waited: a pool created for the execution is 
+        terminated, while in a kept pool the pending chunks are completed and
+        the shared data are released after them (the processes still attach 
+        them), by a background thread.
+    
+        Args:
+            iteratable (iteratable, default is None): The iteratable. If None,
+                the iteratable given in the constructor is used.
+            
+            task (object, default is None): The task. If None, the task given in
+                the constructor is used.
+            
+            **kwargs (dictionary): The arguments of the task. If empty, the 
+                arguments given in the constructor are used.
+
+        Raises:
+            -
+
+        Returns:
+            generator: Yields the (position, object returned) pairs of the 
+                task executions, where position is the position of the member 
+                in the iteratable.
+        '''
+        
+        iteratable = self._iteratable if iteratable is None else iteratable
+        task = self._task if task is None else task
+        kwargs = kwargs if len(kwargs) > 0 else self._kwargs
+        
         # Start measuring execution time
         start_time = time.time()
         
-        # Pool of processes
-        processes_pool = Pool(self._processes)
+        chunks = self._chunks(iteratable)
+        tasks = sum(len(c) for c in chunks)
+        
+        self._members = [m for c in chunks for m in c]
+        self._measurements = {}
+        
+        # Large arguments are placed in shared memory, once
+        kwargs = {k: SharedData(v) if SharedData.isShareable(v) else v for 
+            k, v in kwargs.items()}
+        
+        shared = [v for v in kwargs.values() if isinstance(v, SharedData)]
+        
+        # The task and its arguments are pickled once, each process loads them
+        # on its first chunk of the job
+        shared.append(SharedData(np.frombuffer(pickle.dumps((task, kwargs)), 
+            dtype = np.uint8)))
         
-        # Execute the task for each member of the iteratable
-        results = [processes_pool.apply_async(self._task, (i, self._kwargs,))
-            for i in self._iteratable]
+        processes_pool = self._pool if self._pool is not None else \
+            _createPool(self._processes)
         
-        processes_pool.close()
-        processes_pool.join()       
+        chunk_iterator = processes_pool.imap_unordered(partial(_executeChunk, 
+            next(self._job_ids), shared[-1]), chunks)
+        completed = False
+        
+        try:
+            for chunk_results in chunk_iterator:
+                
+                for position, result, measurements in chunk_results:
+                    self._measurements[position] = measurements
+                    
+                    if self._progress is not None:
+                        completed = len(self._measurements)
+                        elapsed = time.time() - start_time
+                        
+                        self._progress(completed, tasks, elapsed, 
+                            elapsed/completed*(tasks - completed))
+                    
+                    yield position, result
+                    
+            completed = True
+                
+        finally:
+            if processes_pool is not self._pool:
+                processes_pool.terminate()
+                processes_pool.join()
+            
+            if completed or processes_pool is not self._pool:
+                _releaseShared(shared)
+            else:
+                thread = threading.Thread(target = _releaseShared, args = (
+                    shared, chunk_iterator), daemon = True)
+                thread.start()
+                
+                self._releases = [t for t in self._releases if t.is_alive()]
+                self._releases.append(thread)
         
         if self._verbose:
-            print(', time elapsed: ', round(time.time() - start_time, 3), 
-                ' seconds', sep = '')
+            print('- Multi Process Task: task = ', getattr(task, '__qualname__',
+                task), ', number of tasks = ', tasks, ', chunks = ', len(chunks), 
+                ', shared data: ', sum(s.size for s in shared), 
+                ' bytes, time elapsed: ', 
+                round(time.time() - start_time, 3), ' seconds', sep = '')
+            
+            report = self.report()
+            
+            if len(report.index) > 0:
+                slowest = report.loc[report.wall_time.idxmax()]
+                
+                print('- Multi Process Task: throughput = ', round(len(
+                    report.index)/(time.time() - start_time), 3), 
+                    ' tasks/second, wall time per task: mean = ', 
+                    round(report.wall_time.mean(), 3), ', max = ', 
+                    round(slowest.wall_time, 3), ' seconds (task ', 
+                    slowest.name, '), processes used = ', 
+                    report.worker.nunique(), ', peak rss of the processes = ', 
+                    report.worker_peak_rss.max(), ' bytes, max rss delta of a ',
+                    'task = ', report.rss_delta.max(), ' bytes', sep = '')
+        
+    
+    def execute(self, iteratable = None, task = None, **kwargs):
+        '''
+        Executes a task for each member of an iteratable using a process pool
+    
+        Args:
+            iteratable, task, **kwargs: See iterate().
+
+        Raises:
+            -
+
+        Returns:
+            list: A list of objects returned by each task execution, in the 
+                order of the iteratable.
+        '''
+        
+        results = dict(self.iterate(iteratable, task, **kwargs))
+        
+        return [results[i] for i in range(len(results))]
+        
+    
+    def report(self):
+        '''
+        Returns the measurements of each task of the last execution, e.g. for 
+        finding the expensive members of the iteratable. Tasks which were not
+        completed (e.g. iterate() closed early) are not included.
+    
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            DataFrame: One row per task, indexed by the position of its member
+                in the iteratable. Columns are 'member' (string), 'worker' 
+                (process id), 'wall_time', 'cpu_time' (seconds), 'rss_delta'
+                (bytes, change of the RSS of the process during the task, the
+                memory freed before the end of the task is not included) and 
+                'worker_peak_rss' (bytes, peak RSS of the process since it 
+                started, not attributable to the task: in a kept pool it 
+                includes the previous tasks and executions). Memory columns are
+                None if not available.
+        '''
+        
+        report = pd.DataFrame([dict(position = p, member = str(m), 
+            **self._measurements[p]) for p, m in self._members if p in 
+            self._measurements], columns = ['position', 'member', 'worker', 
+            'wall_time', 'cpu_time', 'rss_delta', 'worker_peak_rss'])
         
-        return [r.get() for r in results]
\ No newline at end of file
+        return report.set_index('position')
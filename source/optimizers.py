@@ -0,0 +1,127 @@
+'''
+File name: optimizers.py
+    Gradient descent optimizers for the NumPy models (RNN, LSTM).
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+
+
+def clipGradients(gradients, max_norm):
+    '''
+    Scales the gradients in place, so that their global L2 norm does not exceed
+    a maximum value (exploding gradients of the recurrent models).
+
+    Args:
+        gradients (dictionary): The gradients (Numpy Arrays) per parameter name.
+
+        max_norm (float): The maximum global norm. If None, the gradients are
+            not clipped.
+
+    Raises:
+        -
+
+    Returns:
+        float: The global norm of the gradients before clipping.
+    '''
+
+    norm = np.sqrt(sum(np.vdot(g, g) for g in gradients.values()))
+
+    if max_norm is not None and norm > max_norm:
+        for g in gradients.values():
+            g *= max_norm/norm
+
+    return norm
+
+
+class Adam():
+    '''
+    Adam optimizer class implementation.
+
+    Updates the parameters of a model in place, with the adaptive moment
+    estimation method (Kingma & Ba, 2015). The moments are preallocated, one
+    pair per parameter.
+
+    Args:
+        parameters (dictionary): The parameters (Numpy Arrays, float) per name.
+
+        learning_rate (float, default is 0.001): The step size.
+
+        beta_1 (float, default is 0.9): Decay rate of the first moment.
+
+        beta_2 (float, default is 0.999): Decay rate of the second moment.
+
+        epsilon (float, default is 1e-8): Numerical stability term.
+
+    Public Attributes:
+        -
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        step (args) -> None: Updates the parameters with their gradients.
+
+    Private Methods:
+        -
+
+    Raises:
+        -
+
+    '''
+
+    def __init__(self, parameters, learning_rate = 0.001, beta_1 = 0.9,
+        beta_2 = 0.999, epsilon = 1e-8):
+
+        self._parameters = parameters
+        self._learning_rate = learning_rate
+        self._beta_1 = beta_1
+        self._beta_2 = beta_2
+        self._epsilon = epsilon
+
+        self._t = 0
+        self._m = {k: np.zeros_like(v) for k, v in parameters.items()}
+        self._v = {k: np.zeros_like(v) for k, v in parameters.items()}
+
+
+    def step(self, gradients):
+        '''
+        Updates the parameters with their gradients, in place.
+
+        Args:
+            gradients (dictionary): The gradients (Numpy Arrays) per parameter
+                name, same names and shapes as the parameters.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        self._t += 1
+
+        # Bias corrections of the moments, folded in to the step size
+        step_size = self._learning_rate*np.sqrt(1. - self._beta_2**self._t)/\
+            (1. - self._beta_1**self._t)
+
+        for k, g in gradients.items():
+            m = self._m[k]
+            v = self._v[k]
+
+            m *= self._beta_1
+            m += (1. - self._beta_1)*g
+
+            v *= self._beta_2
+            v += (1. - self._beta_2)*g*g
+
+            self._parameters[k] -= step_size*m/(np.sqrt(v) + self._epsilon)
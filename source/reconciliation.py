@@ -0,0 +1,172 @@
+'''
+File name: reconciliation.py
+    Hierarchical forecast reconciliation: forecasts of the hosts and of the
+    cluster (sum of the hosts) made coherent, bottom up or by trace
+    minimization (MinT).
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# Python packages
+import numpy as np
+
+'''
+Constants
+'''
+# Reconciliation methods: bottom up (the hosts forecasts are summed), and the
+# generalized least squares projections with identity (ols), residual
+# variances (wls) and shrinkage residual covariance (mint) weights
+C_RECONCILIATION_METHODS = ('bottom_up', 'ols', 'wls', 'mint')
+
+# Minimum residual variance of a series in the weights, relative to the largest
+# one: a series with zero variance (e.g. an all zero node) would make the
+# weights singular
+C_VARIANCE_FLOOR = 1e-8
+
+
+def summingMatrix(bottom):
+    '''
+    Returns the summing matrix of a two level hierarchy: the total (cluster)
+    followed by the bottom series (hosts).
+
+    Args:
+        bottom (integer): Number of bottom series.
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The summing matrix, of shape (bottom + 1, bottom).
+    '''
+
+    return np.vstack((np.ones((1, bottom)), np.eye(bottom)))
+
+
+def shrinkCovariance(residuals):
+    '''
+    Returns the covariance of the forecast residuals of the series, shrunk
+    towards its diagonal (Schafer and Strimmer). The shrinkage intensity is
+    estimated from the residuals, so the covariance is positive definite even
+    when the residuals are fewer than the series or strongly correlated. The
+    correlations of a series with constant (e.g. zero) residuals are 0.
+
+    Args:
+        residuals (Numpy Array): The residuals, of shape (time steps, series).
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The covariance, of shape (series, series).
+
+        float: The shrinkage intensity, in [0, 1].
+    '''
+
+    n = len(residuals)
+
+    covariance = residuals.T @ residuals/n
+    std = np.sqrt(np.diag(covariance))
+
+    # Series with constant residuals are not scaled, their correlations are 0
+    std = np.where(std > 0., std, 1.)
+
+    # Variance of the correlations, and their distance from the target (zero)
+    scaled = residuals/std
+    correlation = covariance/np.outer(std, std)
+
+    variance = (scaled.T**2 @ scaled**2 - (scaled.T @ scaled)**2/n)/(n*(n - 1))
+    np.fill_diagonal(variance, 0.)
+    np.fill_diagonal(correlation, 0.)
+
+    # No correlations to shrink (e.g. all the residuals constant)
+    distance = (correlation**2).sum()
+    intensity = 1. if distance == 0. else min(max(variance.sum()/distance, 0.),
+        1.)
+
+    # The variances are kept, the covariances are shrunk
+    shrunk = covariance*(1. - intensity)
+    np.fill_diagonal(shrunk, np.diag(covariance))
+
+    return shrunk, intensity
+
+
+def reconciliationMatrix(residuals, method = 'mint'):
+    '''
+    Returns the matrix which maps the base forecasts of all the series of the
+    hierarchy (total first) to coherent ones: S G, where S is the summing
+    matrix and G = (S' W^-1 S)^-1 S' W^-1 the projection for the weights W of
+    the method (bottom up: G selects the bottom series). The residual 
+    variances of the weights are floored (see C_VARIANCE_FLOOR).
+
+    Args:
+        residuals (Numpy Array): The residuals of the base forecasts, of shape
+            (time steps, series), total first. Used by the wls and mint
+            methods.
+
+        method (string, default is 'mint'): One of C_RECONCILIATION_METHODS.
+
+    Raises:
+        ValueError: When method given value is not supported.
+
+    Returns:
+        Numpy Array: The reconciliation matrix, of shape (series, series).
+    '''
+
+    if method not in C_RECONCILIATION_METHODS:
+        raise ValueError('method argument error. Value given is \'' +
+            str(method) + '\', where supported values are ' +
+            str(C_RECONCILIATION_METHODS))
+
+    series = residuals.shape[1]
+    s = summingMatrix(series - 1)
+
+    if method == 'bottom_up':
+        return s @ np.eye(series)[1:]
+
+    if method == 'ols':
+        weights = np.eye(series)
+    elif method == 'wls':
+        weights = np.diag((residuals**2).mean(axis = 0))
+    else:
+        weights = shrinkCovariance(residuals)[0]
+
+    variances = np.diag(weights)
+    floor = C_VARIANCE_FLOOR*variances.max() if variances.max() > 0. else 1.
+    weights[np.diag_indices(series)] = np.maximum(variances, floor)
+
+    # W^-1 S, then G = (S' W^-1 S)^-1 (W^-1 S)'
+    weighted = np.linalg.solve(weights, s)
+
+    return s @ np.linalg.solve(s.T @ weighted, weighted.T)
+
+
+def reconcile(forecasts, residuals, method = 'mint'):
+    '''
+    Returns the coherent forecasts of a two level hierarchy: the forecast of
+    the total (cluster) is the sum of the forecasts of the bottom series
+    (hosts). All the time steps are reconciled with one matrix multiply.
+
+    Args:
+        forecasts (Numpy Array): The base forecasts, of shape (time steps,
+            series), total first.
+
+        residuals (Numpy Array): The residuals of the base forecasts, see
+            reconciliationMatrix().
+
+        method (string, default is 'mint'): One of C_RECONCILIATION_METHODS.
+
+    Raises:
+        ValueError: When method given value is not supported.
+
+    Returns:
+        Numpy Array: The coherent forecasts, of the shape of the forecasts.
+    '''
+
+    return forecasts @ reconciliationMatrix(residuals, method).T
@@ -0,0 +1,241 @@
+'''
+File name: resultCache.py
+    Result Cache class implementation. A persistent (on disk) cache for the
+    results of expensive evaluations, e.g. the scores of the hyperparameters
+    tunning.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# Python packages
+import os, time, tempfile
+import joblib
+from joblib import dump, load
+
+'''
+Constants
+'''
+# Age (seconds) after which a temporary file of a write is considered left by
+# an interrupted write and removed. Younger ones may be written by another
+# process, they are counted in the cache size but not removed.
+C_TEMP_FILE_MAX_AGE = 600
+
+
+class ResultCache():
+    '''
+    Result Cache class implementation.
+
+    Each result is stored in its own file in the cache directory, named by the
+    hash of its key. The cache can be shared among processes, files are written
+    atomically. The total size of the cache is capped, the least recently used
+    results are evicted first.
+
+    Args:
+        directory (string): The cache directory. It is created if needed.
+
+        max_size (integer, default is 100MB): Maximum size of the cache in
+            bytes.
+
+        context (object, default is None): Common part of all the keys, e.g.
+            the input file and the data preprocessing flags.
+
+        store_models (boolean, default is False): Wether the fitted models
+            should be stored together with the scores.
+
+        verbose (boolean, default is False): If True print services are enabled.
+
+    Public Attributes:
+        store_models (boolean): See constructor.
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        key (args) -> string: Returns the key of a result.
+
+        get (args) -> object: Returns a cached result.
+
+        put (args) -> None: Stores a result in to the cache.
+
+    Private Methods:
+        See methods docstring (def _*)
+
+    Raises:
+        -
+
+    '''
+
+    def __init__(self, directory, max_size = 100*1024*1024, context = None,
+        store_models = False, verbose = False):
+
+        self._directory = directory
+        self._max_size = max_size
+        self._context = joblib.hash(context)
+        self._verbose = verbose
+        self.store_models = store_models
+
+        os.makedirs(self._directory, exist_ok = True)
+
+
+    def key(self, *parts):
+        '''
+        Returns the key of a result, a hash of the cache context and the given
+        parts (e.g. a data hash and the parameters of an estimator).
+
+        Args:
+            *parts (objects): The parts of the key, any picklable object.
+
+        Raises:
+            -
+
+        Returns:
+            string: The key.
+        '''
+
+        return joblib.hash((self._context,) + parts)
+
+
+    def _file(self, key):
+        '''
+        Returns the cache file of a key.
+
+        Args:
+            key (string): The key (see key()).
+
+        Raises:
+            -
+
+        Returns:
+            string: The cache file.
+        '''
+
+        return os.path.join(self._directory, key + '.dump')
+
+
+    def get(self, key, default = None):
+        '''
+        Returns a cached result. The result is marked as the most recently used.
+
+        Args:
+            key (string): The key of the result (see key()).
+
+            default (object, default is None): Returned when the result is not
+                cached.
+
+        Raises:
+            -
+
+        Returns:
+            object: The cached result or the default.
+        '''
+
+        cache_file = self._file(key)
+
+        try:
+            value = load(cache_file)
+            os.utime(cache_file)
+
+        # Missing, or evicted by another process
+        except (FileNotFoundError, EOFError):
+            return default
+
+        return value
+
+
+    def put(self, key, value):
+        '''
+        Stores a result in to the cache and evicts the least recently used
+        results if the cache exceeds its maximum size.
+
+        Args:
+            key (string): The key of the result (see key()).
+
+            value (object): The result, any picklable object.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        # Write in a temporary file and rename, readers never see partial files
+        fd, temp_file = tempfile.mkstemp(dir = self._directory, suffix = '.tmp')
+        os.close(fd)
+
+        try:
+            dump(value, temp_file)
+            os.replace(temp_file, self._file(key))
+
+        except BaseException:
+            os.remove(temp_file)
+            raise
+
+        self._evict()
+
+
+    def _evict(self):
+        '''
+        Removes the least recently used results until the cache size is within
+        its maximum size. Temporary files of interrupted writes (older than
+        C_TEMP_FILE_MAX_AGE) are removed, the rest are counted in the size.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        entries = []
+        writing_size = 0
+        now = time.time()
+
+        for entry in os.scandir(self._directory):
+            try:
+                if entry.name.endswith('.dump'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+                elif entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+
+                    if now - stat.st_mtime > C_TEMP_FILE_MAX_AGE:
+                        os.remove(entry.path)
+
+                        if self._verbose:
+                            print('- Result cache, removed stale temporary ',
+                                'file: ', entry.path, sep = '')
+                    else:
+                        writing_size += stat.st_size
+
+            except FileNotFoundError:
+                pass
+
+        total_size = sum(e[1] for e in entries) + writing_size
+
+        for mtime, size, path in sorted(entries):
+            if total_size <= self._max_size:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            total_size -= size
+
+            if self._verbose:
+                print('- Result cache, evicted: ', path, ', last used: ',
+                    time.ctime(mtime), sep = '')
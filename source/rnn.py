@@ -1,35 +1,558 @@
 '''
 File name: rnn.py
     RNN traffic forecast implementation.
-           
+
 Author: Vasileios Saveris
 email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 11.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
 
+# My packages
+import utils as ut
+import windowing as wd
 from model import MODEL
+from mpt import MPT, printProgress
+from optimizers import Adam, clipGradients
+
+# Python packages
+import joblib
+import numpy as np
+
+# Sklearn imports
+from sklearn.metrics import r2_score
+
+# Matplotlib for graphs
+import matplotlib.pyplot as plt
+
+'''
+Constants
+'''
+# Default model parameters
+C_DEFAULT_PARAMS = {'hidden_size': 32, 'window': 24, 'learning_rate': 0.001,
+    'batch_size': 64, 'epochs': 10, 'clip_norm': 5., 'random_state': 1}
+
+# Parameters explored by explore(), the rest keep their default values
+C_EXPLORE_PARAMS = {'hidden_size': [16, 32, 64], 'window': [8, 24, 48]}
+
+# Number of windows per forward pass in predict()
+C_PREDICT_BATCH_SIZE = 4096
+
+
+def _glorot(rng, rows, columns):
+    '''
+    Returns weights initialized with the Glorot (Xavier) uniform method.
+
+    Args:
+        rng (RandomState): The random numbers generator.
+
+        rows (integer): Number of inputs.
+
+        columns (integer): Number of outputs.
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The weights, of shape (rows, columns).
+    '''
+
+    limit = np.sqrt(6./(rows + columns))
+
+    return rng.uniform(-limit, limit, (rows, columns))
+
 
 class RNN(MODEL):
-    
-    def __init__(self):
-        
-        raise NotImplementedError
-        
-        
-    def train(self):
-        
-        pass
-        
-        
-    def predict(self):
-        
-        pass
-        
-    def explore(self):
-    
-        pass
+    '''
+    RNN class implementation.
+
+    A single layer (Elman) recurrent neural network with a linear output,
+    implemented with NumPy (CPU). Each sample is a window of the previous time
+    steps (all the columns of the data, the requests included) and its target
+    is the requests of the next time step. The forward and the backward (back
+    propagation through time) passes are vectorized over mini-batches of
+    windows, only the time steps of the window are iterated. The windows are
+    views of the data (see windowing.windows()), a mini-batch is copied when
+    selected. The columns are standardized with the training data statistics.
+    The parameters are updated with the Adam optimizer.
+
+    Args:
+        model_params (dictionary, default is None): The model parameters, keys
+            are ('hidden_size', 'window', 'learning_rate', 'batch_size',
+            'epochs', 'clip_norm', 'random_state'). Missing keys take their
+            default values (see C_DEFAULT_PARAMS).
+
+        verbose (boolean, default is False): If True print services are enabled.
+
+        cache (ResultCache, default is None): Persistent cache for the scores
+            of the explore() evaluations. Cached evaluations are skipped when
+            explore() is executed again.
+
+        search (string, default is 'grid'): Search mode of the explore(), only
+            'grid' is supported.
+
+    Public Attributes:
+        loss_curve (list of floats): Mean training loss per epoch.
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        train (args) -> None: Trains the model with the input data.
+
+        predict (args) -> Numpy Array: Returns predictions for the input data.
+
+        update (args) -> None: Updates the model with new data.
+
+        forecast (args) -> Numpy Array: Returns recursive multi step forecasts.
+
+        getParams () -> dictionary: Returns the model parameters.
+
+        explore (args) -> float, dictionary: Performs model selections with
+            hyperparameters tunning and return the best score and a dictionary
+            with the best performing parameters.
+
+    Private Methods:
+        See methods docstring (def _*)
+
+    Raises:
+        ValueError: When search given value is not supported.
+
+    '''
+
+    def __init__(self, model_params = None, verbose = False, cache = None,
+        search = 'grid'):
+
+        self._verbose = verbose
+        self._cache = cache
+
+        if self._verbose:
+            print('- ', type(self).__name__, ' initialization: ',
+                ut.formatArguments(locals().items(), 'self'), sep = '')
+
+        if search != 'grid':
+            raise ValueError('search argument error. Value given is \'' +
+                str(search) + '\', where ' + type(self).__name__ +
+                ' supports only \'grid\'')
+
+        self._params = dict(C_DEFAULT_PARAMS, **(model_params or {}))
+
+        self._weights = None
+        self._optimizer = None
+        self.loss_curve = []
+
+
+    def _initialize(self, features):
+        '''
+        Initializes the weights of the network (Glorot uniform, zero biases).
+
+        Args:
+            features (integer): Number of input features per time step.
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The weights per name.
+        '''
+
+        rng = np.random.RandomState(self._params['random_state'])
+        hidden_size = self._params['hidden_size']
+
+        return {'W_x': _glorot(rng, features, hidden_size),
+            'W_h': _glorot(rng, hidden_size, hidden_size),
+            'b_h': np.zeros(hidden_size),
+            'W_y': _glorot(rng, hidden_size, 1)[:, 0], 'b_y': np.zeros(1)}
+
+
+    def _forward(self, x, store = True):
+        '''
+        Forward pass for a mini-batch of windows.
+
+        Args:
+            x (Numpy Array): The windows, of shape (batch, window, features).
+
+            store (boolean, default is True): If False, the activations of the
+                backward pass are not kept (prediction only).
+
+        Raises:
+            -
+
+        Returns:
+            Numpy Array: The predictions, of shape (batch,).
+
+            object: The activations needed by the backward pass.
+        '''
+
+        w = self._weights
+        batch, window = x.shape[:2]
+
+        # Input projection of all the time steps in one matrix multiply
+        z = (x.reshape(batch*window, -1) @ w['W_x'] + w['b_h']).reshape(
+            batch, window, -1)
+
+        # Only the current hidden state is kept when the activations are not
+        # stored
+        h = np.zeros((window + 1 if store else 1, batch,
+            self._params['hidden_size']))
+
+        for t in range(window):
+            h[t + 1 if store else 0] = np.tanh(z[:, t] + h[t if store else 0] @
+                w['W_h'])
+
+        return h[-1] @ w['W_y'] + w['b_y'], h
+
+
+    def _backward(self, x, h, error):
+        '''
+        Backward pass (back propagation through time) for a mini-batch.
+
+        Args:
+            x (Numpy Array): The windows, see _forward().
+
+            h (object): The activations returned by _forward().
+
+            error (Numpy Array): Derivative of the loss with respect to the
+                predictions, of shape (batch,).
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The gradients per weight name.
+        '''
+
+        w = self._weights
+        batch, window = x.shape[:2]
+
+        grads = {'W_y': h[window].T @ error, 'b_y': np.array([error.sum()]),
+            'W_h': np.zeros_like(w['W_h'])}
+
+        dz = np.empty((batch, window, self._params['hidden_size']))
+        dh = np.outer(error, w['W_y'])
+
+        for t in reversed(range(window)):
+            dz[:, t] = dh*(1. - h[t + 1]**2)
+            grads['W_h'] += h[t].T @ dz[:, t]
+            dh = dz[:, t] @ w['W_h'].T
+
+        grads['W_x'] = x.reshape(batch*window, -1).T @ dz.reshape(
+            batch*window, -1)
+        grads['b_h'] = dz.sum(axis = (0, 1))
+
+        return grads
+
+
+    def _scale(self, data):
+        '''
+        Standardizes the columns of the data with the training data statistics.
+
+        Args:
+            data (pandas DataFrame): The data, the requests column is the last.
+
+        Raises:
+            -
+
+        Returns:
+            Numpy Array: The standardized data (float64).
+        '''
+
+        return (data.to_numpy(dtype = 'float64') - self._mean)/self._std
+
+
+    def train(self, data):
+        '''
+        Trains the model with the input data. The last window of the data is
+        kept as the history of the next predictions (see predict()).
+
+        Args:
+            data (pandas DataFrame): The training data, in time order. The
+                requests column is the last.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        values = data.to_numpy(dtype = 'float64')
+
+        self._mean = values.mean(axis = 0)
+        self._std = values.std(axis = 0)
+        self._std[self._std == 0] = 1.
+
+        values = self._scale(data)
+        window = self._params['window']
+        batch_size = self._params['batch_size']
+
+        # Window i predicts the requests of the time step i + window
+        x = wd.windows(values[:-1], window)
+        y = values[window:, -1]
+
+        self._weights = self._initialize(values.shape[1])
+        self._optimizer = Adam(self._weights, self._params['learning_rate'])
+        rng = np.random.RandomState(self._params['random_state'])
+
+        self.loss_curve = []
+
+        for epoch in range(self._params['epochs']):
+            order = rng.permutation(len(y))
+            loss = 0.
+
+            for first in range(0, len(y), batch_size):
+                batch = order[first:first + batch_size]
+
+                # Mean squared error (halved)
+                prediction, activations = self._forward(x[batch])
+                error = prediction - y[batch]
+                loss += np.dot(error, error)/2.
+
+                grads = self._backward(x[batch], activations, error/len(batch))
+                clipGradients(grads, self._params['clip_norm'])
+                self._optimizer.step(grads)
+
+            self.loss_curve.append(loss/len(y))
+
+        self._history = values[-window:]
+
+
+    def update(self, data):
+        '''
+        Updates the model with new data (online learning): one pass over the
+        windows of the new data, in mini-batches. The weights, the state of the
+        optimizer and the training data statistics are kept, the windows of the
+        first time steps start in the history (see predict()). An untrained
+        model is trained with the new data.
+
+        Args:
+            data (pandas DataFrame): The new data, in time order. They should
+                follow the previous training or update data in time.
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        if self._weights is None:
+            self.train(data)
+            return
+
+        values = np.concatenate((self._history, self._scale(data)))
+        window = self._params['window']
+        batch_size = self._params['batch_size']
+
+        x = wd.windows(values[:-1], window)
+        y = values[window:, -1]
+
+        for first in range(0, len(y), batch_size):
+            batch = slice(first, first + batch_size)
+
+            prediction, activations = self._forward(x[batch])
+            error = prediction - y[batch]
+
+            grads = self._backward(x[batch], activations, error/len(error))
+            clipGradients(grads, self._params['clip_norm'])
+            self._optimizer.step(grads)
+
+        self._history = values[-window:]
+
+
+    def predict(self, data):
+        '''
+        Returns predictions for the input data. The data should follow the
+        training data in time, the windows of the first time steps start in the
+        training data.
+
+        Args:
+            data (pandas DataFrame): The data for which a prediction is
+                requested, in time order. The requests column is the last, each
+                prediction uses only the requests of the previous time steps.
+
+        Raises:
+            -
+
+        Returns:
+            Numpy Array: Predictions for the input data.
+        '''
+
+        values = np.concatenate((self._history, self._scale(data)))
+        x = wd.windows(values[:-1], self._params['window'])
+
+        prediction = np.concatenate([self._forward(x[i:i +
+            C_PREDICT_BATCH_SIZE], store = False)[0] for i in range(0, len(x),
+            C_PREDICT_BATCH_SIZE)])
+
+        return prediction*self._std[-1] + self._mean[-1]
+
+
+    def _exploreGrid(self):
+        '''
+        Returns the parameters evaluated by explore(): each combination of the
+        C_EXPLORE_PARAMS values, the rest of the parameters as given in the
+        constructor.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            list of dictionaries: The model parameters, see constructor.
+        '''
+
+        return [dict(self._params, hidden_size = h, window = w) for h in
+            C_EXPLORE_PARAMS['hidden_size'] for w in C_EXPLORE_PARAMS['window']]
+
+
+    def forecast(self, history, future):
+        '''
+        Returns multi step forecasts. The requests of each future time step are
+        forecast from the window of the time steps before it, the forecasts of
+        the previous future time steps included (recursive forecast).
+
+        Args:
+            history (pandas DataFrame): The last time steps before the future
+                ones (at least window), in time order. Same columns as the
+                training data.
+
+            future (pandas DataFrame): The future time steps, in time order.
+                Same columns as the training data, the requests column (last)
+                is ignored.
+
+        Raises:
+            -
+
+        Returns:
+            Numpy Array: Forecasts for the future time steps.
+        '''
+
+        window = self._params['window']
+
+        values = np.concatenate((self._scale(history.iloc[-window:]),
+            self._scale(future)))
+
+        for i in range(len(future.index)):
+            values[window + i, -1] = self._forward(values[None, i:i + window],
+                store = False)[0][0]
+
+        return values[window:, -1]*self._std[-1] + self._mean[-1]
+
+
+    def getParams(self):
+        '''
+        Returns the model parameters.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            dictionary: The model parameters, see constructor.
+        '''
+
+        return dict(self._params)
+
+
+    def _calculateTestScore(self, params, data):
+        '''
+        Returns the r2 score for the test data, after training a model with the
+        given parameters with the train data.
+
+        Args:
+            params (dictionary): The model parameters (see constructor).
+
+            data (dictionary): Contains the train_data, test_data and data_hash
+                keys. The data are pandas DataFrames, data_hash is the hash of
+                the train and test data.
+
+        Raises:
+            -
+
+        Returns:
+            float: r2 score for the prediction of the test data.
+        '''
+
+        key = None
+
+        if self._cache is not None:
+            key = self._cache.key(type(self).__name__.lower() + '_test_score',
+                data['data_hash'], params)
+            cached = self._cache.get(key)
+
+            if cached is not None:
+                return cached['score']
+
+        model = type(self)(model_params = params)
+        model.train(data['train_data'])
+
+        score = r2_score(data['test_data'].iloc[:, -1],
+            model.predict(data['test_data']))
+
+        if key is not None:
+            self._cache.put(key, {'score': score, 'model': None})
+
+        return score
+
+
+    def explore(self, train_data, test_data, exec_time_stamp):
+        '''
+        Performs model selections with hyperparameters tunning: the parameters
+        grid (see _exploreGrid()) is evaluated in parallel, then the model is
+        trained with the best parameters.
+
+        Args:
+            train_data (pandas DataFrame): The training data.
+
+            test_data (pandas DataFrame): The test data.
+
+            exec_time_stamp (string): Signature for the saved graph.
+
+        Raises:
+            -
+
+        Returns:
+            float: The best score
+
+            dictionary: Best performing parameters, see constructor.
+        '''
+
+        # Hash of the data content, part of the cache keys
+        data_hash = joblib.hash((train_data, test_data))
+
+        grid = self._exploreGrid()
+
+        # Use multi process class for parallel executing of the tasks
+        scores = MPT(grid, self._calculateTestScore, processes = None,
+            verbose = True, progress = printProgress, train_data = train_data,
+            test_data = test_data, data_hash = data_hash).execute()
+
+        best_score = max(scores)
+        best_params = grid[scores.index(best_score)]
+
+        print('- Evaluation: best_score = ', best_score, sep = '')
+        print('- Evaluation: best_params = ', best_params, sep = '')
+
+        # Train the model with the best set of hyperparameters
+        self._params = best_params
+        self.train(train_data)
+
+        plt.clf()
+        plt.plot(range(1, len(self.loss_curve) + 1), self.loss_curve,
+            color = 'green', label = 'train loss')
+        plt.legend(loc = 'best', fontsize = 8)
+        plt.title('Train loss per epoch: score = ' + str(round(best_score, 3)))
+        plt.savefig('../graphs/forecasts/evaluate_' + type(self).__name__ +
+            '_LC_' + exec_time_stamp + '.png')
+
+        return best_score, best_params
@@ -7,13 +7,14 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 10.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
 
 import sys, argparse
 import trafficForecast as tf
+import reconciliation as rc
 
 '''
 Constants
@@ -23,7 +24,15 @@ C_EXAMPLES = 'Usage Example:\nExecute the forecast flow for the given input'
     ' data file, using a DNN model and 0.2 of the input data as test data.\n\n'  +\
     '$python -W ignore runForecast.py -f ../data/processed/traffic_stats_DAIL'   +\
     'Y_CHs.csv -m DNN -t 0.2\n\nNote: The -W ignore option is used for avoiding '+\
-    'Sklearn convergence warnings during the hyperparameters tunning step.\n'
+    'Sklearn convergence warnings during the hyperparameters tunning step.\n'   +\
+    '\nBacktest an RNN model over 5 rolling origin folds of the input data.\n\n'+\
+    '$python runForecast.py -f ../data/processed/traffic_stats_DAILY_CHs.csv '  +\
+    '-m RNN -t 0.2 -b 5\n\nTrain one RNN model per host, exploring the para'     +\
+    'meters of each host, in parallel.\n\n$python runForecast.py -f ../data/pr'  +\
+    'ocessed/traffic_stats_DAILY.csv -m RNN -t 0.2 -p explore\n\nForecast the'  +\
+    ' hosts and the cluster with RNN models and reconcile the forecasts (MinT'  +\
+    ').\n\n$python runForecast.py -f ../data/processed/traffic_stats_DAILY.c'  +\
+    'sv -m RNN -t 0.2 -r mint\n'
 
 # Type of data preprocessing per model
 C_MODEL_PREPROCESSING = {'DNN': {'NORMALIZATION': True, 'STANDARDIZATION': True},
@@ -54,12 +63,45 @@ def parseInputArguments():
     args_parser.add_argument('-m', action = 'store', required = True, 
         #help = 'model to be used for the traffic forecast, one of \'RNN\', '+\
         #'\'LSTM\', required when type (-t) is \'train\' or \'evaluate\'',
-        help = 'model to be used for the traffic forecast, currently only '  +\
-        '\'DNN\' has been implemented and supported',
-        choices = ('DNN'), metavar = 'model')
+        help = 'model to be used for the traffic forecast, one of \'DNN\', ' +\
+        '\'RNN\', \'LSTM\'', choices = ('DNN', 'RNN', 'LSTM'),
+        metavar = 'model')
                             
     args_parser.add_argument('-t', action = 'store', type = float, required = True, 
         help = 'test data percentage', metavar = 'test_data_portion')
+        
+    args_parser.add_argument('-c', action = 'store', required = False, 
+        help = 'directory of the persistent cache for the evaluation results,' +\
+        ' reruns and interrupted runs skip the cached evaluations', 
+        metavar = 'cache_dir')
+        
+    args_parser.add_argument('-s', action = 'store', required = False, 
+        default = 'grid', help = 'search mode of the hyperparameters tunning,' +\
+        ' \'halving\' drops the worse configurations early (successive '      +\
+        'halving over the training iterations)', choices = ('grid', 'halving'),
+        metavar = 'search')
+        
+    args_parser.add_argument('-l', action = 'store_true', required = False, 
+        help = 'add the lag, rolling mean and seasonal lag features of the '   +\
+        'requests to the input data (single series input files only, e.g. '  +\
+        '*_CHs.csv)')
+        
+    args_parser.add_argument('-b', action = 'store', type = int, 
+        required = False, help = 'backtest the model (default parameters) '   +\
+        'over the given number of rolling origin folds of the input data, '   +\
+        'instead of the evaluation', metavar = 'folds')
+        
+    args_parser.add_argument('-p', action = 'store', required = False, 
+        help = 'train (default parameters) or explore one model per host, in ' +\
+        'parallel, instead of the evaluation (per host input files only, '    +\
+        'e.g. traffic_stats_DAILY.csv)', choices = ('train', 'explore'), 
+        metavar = 'fleet')
+        
+    args_parser.add_argument('-r', action = 'store', required = False, 
+        help = 'forecast the hosts and the cluster (default parameters) and ' +\
+        'reconcile the forecasts with the given method, instead of the '     +\
+        'evaluation (per host input files only, e.g. traffic_stats_DAILY.csv' +\
+        ')', choices = rc.C_RECONCILIATION_METHODS, metavar = 'method')
 
     return args_parser.parse_args()
                   
@@ -71,9 +113,31 @@ if __name__ == '__main__':
     
     # Execute the forecast flow
     traffic_forecast = tf.TF(input_file = input_arguments.f, 
-        test_split = input_arguments.t, verbose = True)
+        test_split = input_arguments.t, verbose = True, 
+        lag_features = input_arguments.l)
     
-    traffic_forecast.evaluate(
-        normalize = C_MODEL_PREPROCESSING[input_arguments.m]['NORMALIZATION'], 
-        standardize = C_MODEL_PREPROCESSING[input_arguments.m]['STANDARDIZATION'], 
-        model = input_arguments.m)
+    if input_arguments.p is not None:
+        traffic_forecast.trainFleet(
+            normalize = C_MODEL_PREPROCESSING[input_arguments.m]['NORMALIZATION'], 
+            standardize = C_MODEL_PREPROCESSING[input_arguments.m]['STANDARDIZATION'], 
+            model = input_arguments.m, 
+            explore = input_arguments.p == 'explore')
+        
+    elif input_arguments.r is not None:
+        traffic_forecast.reconcile(
+            normalize = C_MODEL_PREPROCESSING[input_arguments.m]['NORMALIZATION'], 
+            standardize = C_MODEL_PREPROCESSING[input_arguments.m]['STANDARDIZATION'], 
+            model = input_arguments.m, method = input_arguments.r)
+        
+    elif input_arguments.b is not None:
+        traffic_forecast.backtest(
+            normalize = C_MODEL_PREPROCESSING[input_arguments.m]['NORMALIZATION'], 
+            standardize = C_MODEL_PREPROCESSING[input_arguments.m]['STANDARDIZATION'], 
+            model = input_arguments.m, folds = input_arguments.b)
+        
+    else:
+        traffic_forecast.evaluate(
+            normalize = C_MODEL_PREPROCESSING[input_arguments.m]['NORMALIZATION'], 
+            standardize = C_MODEL_PREPROCESSING[input_arguments.m]['STANDARDIZATION'], 
+            model = input_arguments.m, cache_dir = input_arguments.c, 
+            search = input_arguments.s)
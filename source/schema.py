@@ -0,0 +1,70 @@
+'''
+File name: schema.py
+    Data schema of the project. Column types shared by all the readers and
+    writers of the input and the processed data.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import pandas as pd
+
+'''
+Constants
+'''
+# Column types. Date tokens are small integers, host is categorical. Requests
+# are kept as int64, the yearly sums of the combined hosts exceed int32 soon.
+C_DTYPES = {'year': 'int16', 'month': 'int8', 'day': 'int8', 'week_day': 'int8',
+    'hour': 'int8', 'host': 'category', 'requests': 'int64'}
+
+
+def dtypes(columns = None):
+    '''
+    Returns the schema types of the given columns.
+
+    Args:
+        columns (list of strings, default is None): The columns. Columns not in
+            the schema are ignored. If None, the types of all the schema columns
+            are returned.
+
+    Raises:
+        -
+
+    Returns:
+        dictionary: The type per column.
+    '''
+
+    if columns is None:
+        return C_DTYPES.copy()
+
+    return {c: C_DTYPES[c] for c in columns if c in C_DTYPES}
+
+
+def applySchema(data):
+    '''
+    Casts the columns of the data to their schema types. Columns not in the
+    schema are kept as they are.
+
+    Args:
+        data (DataFrame): The input data.
+
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The data with the schema types.
+    '''
+
+    types = {c: t for c, t in dtypes(data.columns).items() if
+        str(data[c].dtype) != t}
+
+    if len(types) == 0:
+        return data
+
+    return data.astype(types)
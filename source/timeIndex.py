@@ -0,0 +1,441 @@
+'''
+File name: timeIndex.py
+    Time Index class implementation. A sorted time index over the processed
+    data (aggregations and tokenized data), for range lookups by time and host.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import os
+import numpy as np
+import pandas as pd
+
+'''
+Constants
+'''
+# Extension of the index file, stored next to the data file
+C_INDEX_EXTENSION = '.idx.npz'
+
+
+def indexFile(data_file):
+    '''
+    Returns the index file name of a data file.
+
+    Args:
+        data_file (string): The data file.
+
+    Raises:
+        -
+
+    Returns:
+        string: The index file name.
+    '''
+
+    return data_file.rstrip('/\\') + C_INDEX_EXTENSION
+
+
+def timestamps(data):
+    '''
+    Returns the timestamp of each row of the data, from the date column if it
+    exists, otherwise from the date tokens columns. Missing tokens take their
+    first value (e.g. day 1 and hour 0 for the MONTHLY granularity).
+
+    Args:
+        data (DataFrame): The data, with a date column or at least the year
+            column.
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The timestamps (datetime64, seconds).
+    '''
+
+    if 'date' in data.columns:
+        return pd.to_datetime(data.date).to_numpy(dtype = 'datetime64[s]')
+
+    tokens = pd.DataFrame({'year': data.year,
+        'month': data.month if 'month' in data.columns else 1,
+        'day': data.day if 'day' in data.columns else 1,
+        'hour': data.hour if 'hour' in data.columns else 0})
+
+    return pd.to_datetime(tokens.astype('int64')).to_numpy(
+        dtype = 'datetime64[s]')
+
+
+def loadIndex(data_file, data):
+    '''
+    Loads the index of a data file if it exists and it is up to date,
+    otherwise builds it in memory.
+
+    Args:
+        data_file (string): The data file.
+
+        data (DataFrame): The data of the file.
+
+    Raises:
+        -
+
+    Returns:
+        TimeIndex: The index of the data.
+    '''
+
+    index_file = indexFile(data_file)
+
+    if os.path.isfile(index_file) and os.path.getmtime(index_file) >= \
+        os.path.getmtime(data_file):
+        time_index = TimeIndex.load(index_file)
+
+        if time_index.rows == len(data.index):
+            return time_index
+
+    return TimeIndex(data)
+
+
+def _merge(keys, new_keys, arrays, new_arrays):
+    '''
+    Merges two sorted arrays of keys, and the arrays which follow their order,
+    in O(n). The new keys are placed after the equal old ones.
+
+    Args:
+        keys (Numpy Array): The old sorted keys.
+
+        new_keys (Numpy Array): The new sorted keys.
+
+        arrays (list of Numpy Arrays): Arrays in the order of the old keys.
+
+        new_arrays (list of Numpy Arrays): Arrays in the order of the new keys.
+
+    Raises:
+        -
+
+    Returns:
+        list of Numpy Arrays: The merged keys, followed by the merged arrays.
+    '''
+
+    # New keys all after the old ones (e.g. appended time steps)
+    if len(keys) == 0 or len(new_keys) == 0 or new_keys[0] >= keys[-1]:
+        return [np.concatenate((a, b)) for a, b in zip([keys] + arrays,
+            [new_keys] + new_arrays)]
+
+    slots = np.searchsorted(keys, new_keys, side = 'right') + \
+        np.arange(len(new_keys))
+    old_slots = np.ones(len(keys) + len(new_keys), dtype = bool)
+    old_slots[slots] = False
+
+    merged = []
+
+    for a, b in zip([keys] + arrays, [new_keys] + new_arrays):
+        m = np.empty(len(a) + len(b), dtype = np.result_type(a, b))
+        m[old_slots] = a
+        m[slots] = b
+        merged.append(m)
+
+    return merged
+
+
+class TimeIndex():
+    '''
+    Time Index class implementation.
+
+    The rows of the data are sorted by (host, time) and by time only, so the
+    rows of a time range, for a host or for all the hosts, are found with two
+    binary searches, in O(log n).
+
+    Args:
+        data (DataFrame): The data to be indexed, see timestamps(). If None, an
+            empty index is created (used by load()).
+
+    Public Attributes:
+        rows (integer): The number of the indexed rows.
+
+    Private Attributes:
+        See constructor (self._*)
+
+    Public Methods:
+
+        query (args) -> Numpy Array: Returns the positions of the rows in a
+            time range, for a host or for all the hosts.
+
+        slice (args) -> DataFrame: Returns the rows of the data in a time
+            range, for a host or for all the hosts.
+
+        end (args) -> datetime64: Returns the last indexed time.
+
+        extend (args) -> TimeIndex: Extends the index with rows appended to
+            the data.
+
+        save (args) -> None: Stores the index in to a file.
+
+        load (args) -> TimeIndex: Loads an index from a file (class method).
+
+    Private Methods:
+        See methods docstring (def _*)
+
+    Raises:
+        ValueError: When a host is queried on data without a host column.
+
+    '''
+
+    def __init__(self, data = None):
+
+        if data is None:
+            return
+
+        times = timestamps(data).astype('int64')
+
+        self.rows = len(times)
+
+        # Rows sorted by time only (stable, rows of the same time keep order)
+        self._time_order = np.argsort(times, kind = 'stable')
+        self._times = times[self._time_order]
+
+        # Rows sorted by (host, time)
+        if 'host' in data.columns:
+            codes, hosts = pd.factorize(data.host.astype(str), sort = True)
+            self._hosts = np.asarray(hosts, dtype = str)
+
+            self._host_order = np.lexsort((times, codes))
+            self._host_codes = codes[self._host_order]
+            self._host_times = times[self._host_order]
+
+        else:
+            self._hosts = None
+
+
+    def _bounds(self, times, start, end):
+        '''
+        Returns the bounds of a time range in a sorted array of times.
+
+        Args:
+            times (Numpy Array): Sorted times (int64, seconds).
+
+            start (string or datetime): First time of the range (inclusive),
+                None for no lower bound.
+
+            end (string or datetime): Last time of the range (inclusive), None
+                for no upper bound.
+
+        Raises:
+            -
+
+        Returns:
+            integer: The first position of the range.
+
+            integer: The position after the last one of the range.
+        '''
+
+        first = 0 if start is None else np.searchsorted(times, np.datetime64(
+            pd.Timestamp(start), 's').astype('int64'), side = 'left')
+
+        last = len(times) if end is None else np.searchsorted(times,
+            np.datetime64(pd.Timestamp(end), 's').astype('int64'),
+            side = 'right')
+
+        return first, last
+
+
+    def query(self, start = None, end = None, host = None):
+        '''
+        Returns the positions of the rows in a time range, for a host or for
+        all the hosts.
+
+        Args:
+            start (string or datetime, default is None): First time of the range
+                (inclusive). If None, the range has no lower bound.
+
+            end (string or datetime, default is None): Last time of the range
+                (inclusive). If None, the range has no upper bound.
+
+            host (string, default is None): The host. If None, rows of all the
+                hosts are returned.
+
+        Raises:
+            ValueError: When a host is queried on data without a host column.
+
+        Returns:
+            Numpy Array: The positions of the rows, in time order.
+        '''
+
+        if host is None:
+            first, last = self._bounds(self._times, start, end)
+
+            return self._time_order[first:last]
+
+        if self._hosts is None:
+            raise ValueError('host argument error. Value given is \'' +
+                str(host) + '\', where the indexed data have no host column')
+
+        # Rows of the host, then the time range in them
+        code = np.searchsorted(self._hosts, host)
+
+        if code == len(self._hosts) or self._hosts[code] != host:
+            return self._host_order[:0]
+
+        host_first = np.searchsorted(self._host_codes, code, side = 'left')
+        host_last = np.searchsorted(self._host_codes, code, side = 'right')
+
+        first, last = self._bounds(self._host_times[host_first:host_last],
+            start, end)
+
+        return self._host_order[host_first + first:host_first + last]
+
+
+    def slice(self, data, start = None, end = None, host = None):
+        '''
+        Returns the rows of the data in a time range, for a host or for all the
+        hosts.
+
+        Args:
+            data (DataFrame): The indexed data.
+
+            start, end, host: See query().
+
+        Raises:
+            ValueError: When a host is queried on data without a host column.
+
+        Returns:
+            DataFrame: The rows of the data, in time order.
+        '''
+
+        return data.iloc[self.query(start, end, host)]
+
+
+    def end(self):
+        '''
+        Returns the last indexed time.
+
+        Args:
+            -
+
+        Raises:
+            -
+
+        Returns:
+            datetime64: The last time (seconds), None if the index is empty.
+        '''
+
+        if self.rows == 0:
+            return None
+
+        return self._times[-1].astype('datetime64[s]')
+
+
+    def extend(self, data):
+        '''
+        Extends the index with rows appended to the indexed data, without the
+        previous data: their positions follow the indexed rows. The sorted
+        arrays are merged (appended when the new times are after the indexed
+        ones).
+
+        Args:
+            data (DataFrame): The appended rows, see timestamps().
+
+        Raises:
+            ValueError: When the appended rows and the indexed data do not both
+                have or both miss the host column.
+
+        Returns:
+            TimeIndex: The object itself.
+        '''
+
+        new = TimeIndex(data)
+
+        if new.rows == 0:
+            return self
+
+        if self.rows == 0:
+            self.__dict__.update(new.__dict__)
+            return self
+
+        if (self._hosts is None) != (new._hosts is None):
+            raise ValueError('data argument error. Appended rows and indexed ' +
+                'data should both have or both miss the host column')
+
+        self._times, self._time_order = _merge(self._times, new._times,
+            [self._time_order], [new._time_order + self.rows])
+
+        if self._hosts is not None:
+            # Codes of the merged hosts (sorted)
+            hosts = np.union1d(self._hosts, new._hosts)
+            codes = np.searchsorted(hosts, self._hosts)[self._host_codes]
+            new_codes = np.searchsorted(hosts, new._hosts)[new._host_codes]
+
+            # The (host, time) order as a single key: code*span + time offset
+            first = min(self._times[0], new._times[0])
+            span = max(self._times[-1], new._times[-1]) - first + 1
+
+            self._hosts = hosts
+            self._host_order, self._host_codes, self._host_times = _merge(
+                codes*span + self._host_times - first, new_codes*span +
+                new._host_times - first, [self._host_order, codes,
+                self._host_times], [new._host_order + self.rows, new_codes,
+                new._host_times])[1:]
+
+        self.rows += new.rows
+
+        return self
+
+
+    def save(self, index_file):
+        '''
+        Stores the index in to a file (NumPy npz).
+
+        Args:
+            index_file (string): The index file (see indexFile()).
+
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+
+        arrays = {'time_order': self._time_order, 'times': self._times}
+
+        if self._hosts is not None:
+            arrays.update({'hosts': self._hosts, 'host_order': self._host_order,
+                'host_codes': self._host_codes, 'host_times': self._host_times})
+
+        # Write through a file object, np.savez would append an extension
+        with open(index_file, 'wb') as f:
+            np.savez(f, **arrays)
+
+
+    @classmethod
+    def load(cls, index_file):
+        '''
+        Loads an index from a file.
+
+        Args:
+            index_file (string): The index file (see indexFile()).
+
+        Raises:
+            -
+
+        Returns:
+            TimeIndex: The loaded index.
+        '''
+
+        time_index = cls()
+
+        with np.load(index_file, allow_pickle = False) as arrays:
+            time_index._time_order = arrays['time_order']
+            time_index._times = arrays['times']
+            time_index.rows = len(time_index._times)
+            time_index._hosts = None
+
+            if 'hosts' in arrays.files:
+                time_index._hosts = arrays['hosts']
+                time_index._host_order = arrays['host_order']
+                time_index._host_codes = arrays['host_codes']
+                time_index._host_times = arrays['host_times']
+
+        return time_index
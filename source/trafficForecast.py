@@ -7,27 +7,34 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 10.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
 
 # My packages
 import utils as ut
+import dataIO as dio
+import windowing as wd
+import timeIndex as ti
+import artifact as af
+import reconciliation as rc
 import lstm, rnn, dnn
+from mpt import MPT, printProgress
+from resultCache import ResultCache
 
 # Python packages imports
+import os, copy, joblib
 from joblib import dump, load
 from datetime import datetime
+import numpy as np
+import pandas as pd
 
 # Matplotlib for graphs
 import matplotlib.pyplot as plt
 
 # Sklearn imports
-from sklearn.metrics import r2_score
-
-# Pandas imports
-import pandas as pd
+from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 
 
 '''
@@ -35,6 +42,520 @@ Constants
 '''
 C_SUPPORTED_MODELS = {'LSTM': lstm.LSTM, 'RNN': rnn.RNN, 'DNN': dnn.DNN}
 
+# Directory of the dumped scalers and model artifacts
+C_DUMPS_DIRECTORY = '../dumps/'
+
+# Online updates (see updateArtifact()): time steps per mini-batch, and 
+# mini-batches between the checkpoints of the artifact
+C_UPDATE_BATCH_SIZE = 24
+C_UPDATE_CHECKPOINT_INTERVAL = 10
+
+
+def _scores(actual, predicted):
+    '''
+    Returns the error metrics of a forecast.
+    
+    Args:
+        actual (array like): The actual requests.
+        
+        predicted (array like): The forecast requests.
+        
+    Raises:
+        -
+
+    Returns:
+        dictionary: The r2, mae (mean absolute error) and rmse (root mean 
+            squared error) scores.
+    '''
+    
+    return {'r2': r2_score(actual, predicted), 
+        'mae': mean_absolute_error(actual, predicted),
+        'rmse': np.sqrt(mean_squared_error(actual, predicted))}
+
+
+def _backtestFold(fold, data):
+    '''
+    Trains a model with the train data of a backtesting fold and forecasts its
+    test data. The preprocessing is fitted on the train data of the fold only.
+    Executed in parallel for the folds (see TF.backtest()).
+    
+    Args:
+        fold (tuple of integers): The fold number, the first and last (not 
+            included) rows of the train data and the last (not included) row 
+            of the test data. The test data follow the train data.
+            
+        data (dictionary): Contains the input_data (DataFrame), model (one of
+            the C_SUPPORTED_MODELS.keys()), model_params, normalize and 
+            standardize keys (see TF.backtest()).
+        
+    Raises:
+        -
+
+    Returns:
+        dictionary: The fold number, the train and test data sizes and the 
+            error metrics (see _scores()).
+            
+        Numpy Array: The forecast of the test data.
+    '''
+    
+    number, train_start, train_end, test_end = fold
+    
+    train_data, test_data, _ = ut.preprocessDataSets(
+        data['input_data'].iloc[train_start:train_end], 
+        data['input_data'].iloc[train_end:test_end], 
+        data['normalize'], data['standardize'])
+        
+    model = C_SUPPORTED_MODELS[data['model']](model_params = 
+        data['model_params'])
+    model.train(train_data)
+    
+    forecast = model.predict(test_data)
+    
+    return dict({'fold': number, 'train_size': train_end - train_start, 
+        'test_size': test_end - train_end}, **_scores(test_data.iloc[:, -1], 
+        forecast)), forecast
+
+
+def _fleetDataSets(data, start, end):
+    '''
+    Returns the train and test data of a host of the fleet. The rows of the 
+    host are a slice of the shared input data (no copy), split in train and 
+    test data and preprocessed (fitted on the train data).
+    
+    Args:
+        data (dictionary): Contains the input_data (DataFrame, the rows of 
+            each host are consecutive), test_split, normalize and standardize
+            keys (see TF.trainFleet()).
+            
+        start (integer): The first row of the host.
+        
+        end (integer): The last (not included) row of the host.
+        
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The train data.
+        
+        DataFrame: The test data.
+        
+        StandardScaler: The fitted scaler, None if not standardized.
+    '''
+    
+    train_data, test_data = ut.splitData(data['input_data'].iloc[start:end], 
+        data['test_split'])
+    
+    return ut.preprocessDataSets(train_data, test_data, data['normalize'], 
+        data['standardize'])
+
+
+def _fleetScore(member, data):
+    '''
+    Returns the r2 score for the test data of a host, after training a model 
+    with the given parameters with the train data of the host. Executed in 
+    parallel for all the (host, parameters) pairs of the fleet exploration 
+    (see TF.trainFleet()).
+    
+    Args:
+        member (tuple): The first and last (not included) rows of the host and
+            the model parameters.
+            
+        data (dictionary): See _fleetDataSets(), and the model key (one of the
+            C_SUPPORTED_MODELS.keys()).
+        
+    Raises:
+        -
+
+    Returns:
+        float: r2 score for the prediction of the test data.
+    '''
+    
+    start, end, model_params = member
+    
+    train_data, test_data, _ = _fleetDataSets(data, start, end)
+    
+    model = C_SUPPORTED_MODELS[data['model']](model_params = model_params)
+    model.train(train_data)
+    
+    return r2_score(test_data.iloc[:, -1], model.predict(test_data))
+
+
+def _fleetTrain(member, data):
+    '''
+    Trains the model of a host with the train data of the host and forecasts 
+    its test data. Executed in parallel for the hosts of the fleet (see 
+    TF.trainFleet()).
+    
+    Args:
+        member (tuple): The first and last (not included) rows of the host and
+            the model parameters (None for the default ones).
+            
+        data (dictionary): See _fleetScore().
+        
+    Raises:
+        -
+
+    Returns:
+        dictionary: The train and test data sizes and the error metrics (see 
+            _scores()).
+            
+        MODEL: The trained model.
+        
+        StandardScaler: The fitted scaler, None if not standardized.
+        
+        string: Hash of the train data.
+    '''
+    
+    start, end, model_params = member
+    
+    train_data, test_data, scaler = _fleetDataSets(data, start, end)
+    
+    model = C_SUPPORTED_MODELS[data['model']](model_params = model_params)
+    model.train(train_data)
+    
+    return dict({'train_size': len(train_data.index), 
+        'test_size': len(test_data.index)}, **_scores(test_data.iloc[:, -1], 
+        model.predict(test_data))), model, scaler, joblib.hash(train_data)
+
+
+def _reconcileLevel(level, data):
+    '''
+    Trains the model of a level of the hierarchy (cluster or host) and 
+    forecasts the validation and test time steps. The features of the levels
+    are the same, only the requests column differs. Executed in parallel for 
+    the levels (see TF.reconcile()).
+    
+    Args:
+        level (integer): The column of the level in the targets.
+            
+        data (dictionary): Contains the train_data and test_data (DataFrames, 
+            the preprocessed features of the time steps, shared by the 
+            levels), targets (Numpy Array, the requests of each level per time
+            step, train time steps first), model (one of the 
+            C_SUPPORTED_MODELS.keys()) and model_params keys.
+        
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The forecast of the test data.
+    '''
+    
+    train_size = len(data['train_data'].index)
+    requests = data['train_data'].columns[-1]
+    
+    model = C_SUPPORTED_MODELS[data['model']](model_params = 
+        data['model_params'])
+    model.train(data['train_data'].assign(**{requests: 
+        data['targets'][:train_size, level]}))
+    
+    return model.predict(data['test_data'].assign(**{requests: 
+        data['targets'][train_size:, level]}))
+
+
+def _recursiveForecast(bundle, future):
+    '''
+    Returns multi step forecasts of a model with lag features. The lag and
+    rolling mean features of each future time step are computed from the
+    requests of the previous time steps, the forecasts of the previous future
+    time steps included.
+    
+    Args:
+        bundle (dictionary): The model artifact (see artifact.saveArtifact()).
+        
+        future (DataFrame): The future time steps, model input columns.
+        
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: Forecasts for the future time steps.
+    '''
+    
+    columns = bundle['columns']
+    lags = np.array(bundle['lags'], dtype = 'int64')
+    lag_columns = [columns.index(columns[-1] + '_lag_' + str(l)) for l in 
+        bundle['lags']]
+    mean_columns = [columns.index(columns[-1] + '_mean_' + str(w)) for w in 
+        bundle['rolling_windows']]
+    
+    # Requests of the history followed by the forecasts
+    requests = np.concatenate((bundle['history'].iloc[:, -1].to_numpy(
+        dtype = 'float64'), np.zeros(len(future.index))))
+    start = len(bundle['history'].index)
+    
+    rows = future.to_numpy(dtype = 'float64')
+    scaler = bundle['scaler']
+    
+    for i in range(len(future.index)):
+        t = start + i
+        
+        rows[i, lag_columns] = requests[t - lags]
+        
+        for c, w in zip(mean_columns, bundle['rolling_windows']):
+            rows[i, c] = requests[t - w:t].mean()
+            
+        # Same as ut.preprocessData(), on a single row (no data frame and 
+        # estimator validation overhead per time step)
+        row = rows[i:i + 1].copy()
+        
+        if bundle['normalize']:
+            norm = np.linalg.norm(row[:, :-1])
+            row[:, :-1] /= norm if norm > 0 else 1.
+            
+        if scaler is not None:
+            row[:, :-1] = (row[:, :-1] - scaler.mean_)/scaler.scale_
+            
+        requests[t] = bundle['model'].predict(pd.DataFrame(row, 
+            columns = columns))[0]
+            
+    return requests[start:]
+
+
+def forecastBundle(bundle, horizon):
+    '''
+    Returns the forecast of the requests for the time steps that follow the
+    input data of a loaded model artifact. The forecasts of all the time steps 
+    are computed in one prediction, or recursively for the models which use the
+    requests of the previous time steps (recurrent models and lag features). 
+    The forecast of a horizon is the first rows of the forecast of any longer 
+    horizon.
+    
+    Args:
+        bundle (dictionary): The model artifact (see artifact.loadArtifact()).
+        
+        horizon (integer): Number of time steps to be forecast.
+        
+    Raises:
+        ValueError: When the artifact is a recurrent model with lag features.
+
+    Returns:
+        DataFrame: The date tokens of the future time steps and the forecast
+            requests (last column).
+    '''
+    
+    history = bundle['history']
+    column = bundle['columns'][-1]
+    
+    future = wd.futureSteps(history, horizon)
+    
+    # Model input columns, the requests and lag features are forecast
+    inputs = future.reindex(columns = bundle['columns'], fill_value = 0)
+    
+    if isinstance(bundle['model'], rnn.RNN):
+        if bundle['lag_features']:
+            raise ValueError('bundle argument error. Recurrent models with ' +
+                'lag features are not supported, where the artifact model is ' +
+                bundle['model_family'])
+        
+        future[column] = bundle['model'].forecast(history, inputs)
+        
+    elif bundle['lag_features']:
+        future[column] = _recursiveForecast(bundle, inputs)
+        
+    else:
+        future[column] = bundle['model'].predict(ut.preprocessData(inputs, 
+            bundle['normalize'], bundle['scaler']))
+        
+    return future
+
+
+def forecast(artifact_file, horizon):
+    '''
+    Returns the forecast of the requests for the time steps that follow the
+    input data of a model artifact (see forecastBundle()). The artifact is 
+    loaded once (see artifact.loadArtifact()).
+    
+    Args:
+        artifact_file (string): The model artifact file (see TF.train()).
+        
+        horizon (integer): Number of time steps to be forecast.
+        
+    Raises:
+        ValueError: When the artifact is a recurrent model with lag features.
+
+    Returns:
+        DataFrame: The date tokens of the future time steps and the forecast
+            requests (last column).
+    '''
+    
+    return forecastBundle(af.loadArtifact(artifact_file), horizon)
+
+
+def forecastBatch(artifacts, requests):
+    '''
+    Returns the forecasts of a batch of (host, origin, horizon) requests. The 
+    feature rows of all the requests of a model are built at once and 
+    forecast with one prediction. The models which use the requests of the
+    previous time steps (recurrent models and lag features) forecast once
+    recursively per host, up to the longest horizon requested, from the end of
+    their input data.
+    
+    Args:
+        artifacts (dictionary or string): The model artifact file per host, or
+            a single artifact file for all the hosts (e.g. combined hosts).
+            
+        requests (DataFrame or array like): The requests, one per row, with the
+            columns (host, origin, horizon). The origin is the last observed 
+            time step (timestamp or string, None for the end of the input data
+            of the artifact) and the horizon is the number of time steps after
+            it (integer >= 1).
+        
+    Raises:
+        ValueError: When a horizon is not positive, a host has no artifact, or
+            an origin of a recursive model is not the end of its input data.
+
+    Returns:
+        DataFrame: The requests (origin resolved) and their forecast (requests
+            column), in the order of the requests.
+    '''
+    
+    requests = pd.DataFrame(requests, columns = ['host', 'origin', 'horizon'])
+    
+    horizons = requests.horizon.to_numpy(dtype = 'int64')
+    origins = pd.DatetimeIndex(pd.to_datetime(requests.origin)).to_numpy(
+        copy = True)
+    forecasts = np.empty(len(horizons))
+    
+    if (horizons < 1).any():
+        raise ValueError('requests argument error. Horizons should be ' +
+            'positive integers, where minimum horizon given is ' + 
+            str(horizons.min()))
+    
+    # Rows of the requests per artifact file
+    if isinstance(artifacts, str):
+        groups = {artifacts: np.arange(len(horizons))}
+    else:
+        groups = {}
+        
+        for host, positions in requests.groupby('host', sort = False, 
+            dropna = False).indices.items():
+            if host not in artifacts:
+                raise ValueError('requests argument error. Host \'' + 
+                    str(host) + '\' has no artifact, where artifacts are ' +
+                    'given for ' + str(list(artifacts.keys())))
+            
+            groups[artifacts[host]] = np.concatenate((groups.get(
+                artifacts[host], np.empty(0, dtype = 'int64')), positions))
+    
+    for artifact_file, positions in groups.items():
+        bundle = af.loadArtifact(artifact_file)
+        
+        # The forecasts start after the last observed time step by default
+        end = pd.Timestamp(ti.timestamps(bundle['history'].iloc[-1:])[0])
+        origins[positions] = pd.DatetimeIndex(origins[positions]).fillna(end)
+        origins_group = pd.DatetimeIndex(origins[positions])
+        
+        if isinstance(bundle['model'], rnn.RNN) or bundle['lag_features']:
+            if (origins_group != end).any():
+                raise ValueError('requests argument error. Recursive ' +
+                    'forecasts start after the input data of the artifact (' +
+                    str(end) + '), where origins given are ' + 
+                    str(sorted(set(origins_group[origins_group != end]))))
+                    
+            forecast = forecastBundle(bundle, horizons[positions].max())
+            forecasts[positions] = forecast.iloc[:, -1].to_numpy()[
+                horizons[positions] - 1]
+            
+        else:
+            targets = wd.shiftSteps(origins_group, horizons[positions], 
+                wd.granularity(bundle['history']))
+                
+            inputs = wd.dateTokens(targets, bundle['columns']).reindex(
+                columns = bundle['columns'], fill_value = 0)
+                
+            forecasts[positions] = bundle['model'].predict(ut.preprocessData(
+                inputs, bundle['normalize'], bundle['scaler']))
+    
+    return requests.assign(origin = origins, horizon = horizons, 
+        requests = forecasts)
+
+
+def updateArtifact(artifact_file, data, batch_size = C_UPDATE_BATCH_SIZE,
+    checkpoint_interval = C_UPDATE_CHECKPOINT_INTERVAL):
+    '''
+    Updates the model of an artifact with new data (online learning, see 
+    model.MODEL.update()), in mini-batches of time steps. The scaler statistics 
+    are updated with the features of each mini-batch (running mean and 
+    variance), and the lag features are computed from the history of the 
+    artifact. The artifact is saved every checkpoint_interval mini-batches 
+    and after the last one, the forecasts of the saved artifact start after 
+    its last mini-batch. The cost of an update depends on the new data only.
+    
+    Args:
+        artifact_file (string): The model artifact file.
+        
+        data (DataFrame or string): The new data (or their file), the date 
+            tokens and requests of the time steps that follow the input data of
+            the artifact.
+            
+        batch_size (integer, default is C_UPDATE_BATCH_SIZE): Number of time
+            steps per mini-batch.
+            
+        checkpoint_interval (integer, default is C_UPDATE_CHECKPOINT_INTERVAL):
+            Number of mini-batches between the checkpoints of the artifact.
+        
+    Raises:
+        ValueError: When the new data do not have the columns of the input data
+            of the artifact, or do not follow them in time.
+
+    Returns:
+        dictionary: The updated artifact bundle (see artifact.saveArtifact()).
+    '''
+    
+    bundle = af.loadArtifact(artifact_file)
+    history = bundle['history']
+    
+    if isinstance(data, str):
+        data = dio.readData(data)
+        
+    missing = history.columns.difference(data.columns)
+    
+    if len(missing) > 0:
+        raise ValueError('data argument error. Columns ' + 
+            str(missing.to_list()) + ' are missing, where the input data of ' +
+            'the artifact have the columns ' + str(history.columns.to_list()))
+            
+    data = data[history.columns].astype(history.dtypes.to_dict())
+    end = ti.timestamps(history.iloc[-1:])[0]
+    
+    if len(data.index) > 0 and ti.timestamps(data.iloc[:1])[0] <= end:
+        raise ValueError('data argument error. The new data should follow ' +
+            'the input data of the artifact (' + str(pd.Timestamp(end)) + 
+            '), where first time step given is ' + 
+            str(pd.Timestamp(ti.timestamps(data.iloc[:1])[0])))
+    
+    # The loaded (cached) artifact is not modified
+    bundle = dict(bundle, model = copy.deepcopy(bundle['model']), 
+        scaler = copy.deepcopy(bundle['scaler']))
+    
+    batches = range(0, len(data.index), batch_size)
+    
+    for number, first in enumerate(batches, 1):
+        batch = data.iloc[first:first + batch_size]
+        inputs = batch
+        
+        if bundle['lag_features']:
+            inputs = wd.addLagFeatures(pd.concat([bundle['history'], batch], 
+                ignore_index = True), bundle['lags'], bundle['rolling_windows'])
+            inputs = inputs[ti.timestamps(inputs) > end][bundle['columns']]
+            
+        bundle['model'].update(ut.preprocessData(inputs, bundle['normalize'], 
+            bundle['scaler'], update = True))
+        
+        bundle['history'] = pd.concat([bundle['history'], batch], 
+            ignore_index = True).iloc[-len(history.index):].reset_index(
+            drop = True)
+        bundle['data_hash'] = joblib.hash((bundle['data_hash'], batch))
+        end = ti.timestamps(batch.iloc[-1:])[0]
+        
+        if number % checkpoint_interval == 0 or number == len(batches):
+            bundle['created'] = datetime.now().strftime('%Y%m%d%H%M%S')
+            af.saveArtifact({k: v for k, v in bundle.items() if k != 
+                'version'}, artifact_file)
+            
+    return bundle
+
 
 class TF():
     '''
@@ -46,6 +567,11 @@ class TF():
             'learning_rate', 'learning_rate_init', 'max_iter', 'shuffle')        
         
         verbose (boolean, default is False): If True print services are enabled.
+        
+        lag_features (boolean, default is False): If True, the lag, rolling 
+            mean and seasonal lag features of the requests are added to the 
+            input data (see windowing.addLagFeatures()). The input data should
+            be a single series (combined hosts).
 
     Public Attributes:
         -
@@ -55,23 +581,45 @@ class TF():
                                 
     Public Methods:
         
-        train (args) -> None: Trains the model with the input data.
+        train (args) -> string: Trains a model with all the input data and 
+            saves its artifact.
+            
+        forecast (args) -> DataFrame: Forecasts the requests of the time steps
+            that follow the input data.
+            
+        forecastBatch (args) -> DataFrame: Forecasts a batch of (host, origin,
+            horizon) requests.
+            
+        update (args) -> string: Updates the model of an artifact with new data
+            (online learning).
             
-        predict (args) -> Numpy Array: Returns predictions for the input data.
+        evaluate (args) -> None: Executes the hyperparameters tunning flow of
+            a model family and prints the best score and parameters.
             
-        explore (args) -> float, dictionary: Performs model selections with
-            hyperparameters tunning and return the best score and a dictionary
-            with the best performing parameters.
+        backtest (args) -> DataFrame, dictionary: Rolling origin backtesting of 
+            a model, returns the error metrics per fold and aggregated.
+            
+        trainFleet (args) -> DataFrame: Trains or explores one model per host 
+            in parallel, saves their artifacts and returns their registry.
+            
+        reconcile (args) -> DataFrame, DataFrame: Forecasts the hosts and the
+            cluster and reconciles the forecasts, returns them and their error
+            metrics.
         
     Private Methods:
-        -
+        _createDataSets (args) -> DataFrame, DataFrame: Splits the input data
+            to the train and test data sets.
+            
+        _saveArtifact (args) -> None: Saves a trained model and its 
+            preprocessing in an artifact file.
         
     Raises:
         -
         
     '''
     
-    def __init__(self, input_file, test_split, verbose = False):
+    def __init__(self, input_file, test_split, verbose = False, 
+        lag_features = False):
         
         self._verbose = verbose
         
@@ -79,12 +627,34 @@ class TF():
             print('\nTraffic Forecast initialization: ', 
                 ut.formatArguments(locals().items(), 'self'), sep = '')
                         
-        # Read input file
-        input_data = pd.read_csv(input_file)
+        self._input_file = input_file
+        self._test_split = test_split
+        self._lag_features = lag_features
+        
+        # Read input file (csv or binary format)
+        input_data = dio.readData(input_file)
         
         if self._verbose:
             print('- Input data loaded, file = ', input_file, sep = '')
+        
+        # Date tokens and requests columns
+        self._series_columns = input_data.columns.to_list()
+        
+        if lag_features:
+            input_data = wd.addLagFeatures(input_data)
             
+            if self._verbose:
+                print('- Lag features added, columns = ', 
+                    input_data.columns.to_list(), ', interpolated missing ' +
+                    'time steps = ', input_data.attrs['filled_steps'], sep = '')
+            
+        # Kept for the backtesting folds and the forecast history
+        self._input_data = input_data
+        self._artifact_file = None
+        
+        # Artifact file per host, of the last trainFleet()
+        self._fleet_artifacts = None
+        
         # Create data sets from the input data
         self._train_data, self._test_data = \
             self._createDataSets(input_data, test_split)
@@ -124,7 +694,231 @@ class TF():
         return train_data, test_data
            
         
-    def evaluate(self, normalize = False, standardize = False, model = None):
+    def _saveArtifact(self, model_family, model, normalize, standardize, 
+        scaler, data_hash, artifact_file, exec_time_stamp, input_data = None):
+        '''
+        Saves the artifact of a trained model (see artifact.saveArtifact()). 
+        The forecasts of the artifact start after the input data.
+    
+        Args:
+            model_family (string): One of the C_SUPPORTED_MODELS.keys().
+            
+            model (MODEL): The trained model.
+            
+            normalize (boolean): Data normalization flag.
+            
+            standardize (boolean): Data standardization flag.
+            
+            scaler (StandardScaler): The fitted scaler, None if the data are
+                not standardized.
+                
+            data_hash (string): Hash of the training data of the model.
+            
+            artifact_file (string): The artifact file.
+            
+            exec_time_stamp (string): Creation time stamp.
+            
+            input_data (DataFrame, default is None): The input data of the 
+                model (e.g. the rows of a host). If None, the input data of the
+                object are used.
+            
+        Raises:
+            -
+
+        Returns:
+            -
+        '''
+        
+        if input_data is None:
+            input_data = self._input_data
+            
+        model_params = model.getParams()
+        
+        lags, rolling_windows = (), ()
+        
+        if self._lag_features:
+            data_granularity = wd.granularity(input_data)
+            lags = wd.C_LAGS[data_granularity]
+            rolling_windows = wd.C_ROLLING_WINDOWS[data_granularity]
+            
+        # Time steps needed by the lag features and the recurrent models window
+        history_size = max([1, model_params.get('window', 1)] + list(lags) + 
+            list(rolling_windows))
+            
+        af.saveArtifact({'created': exec_time_stamp, 
+            'input_file': self._input_file, 'model_family': model_family, 
+            'model': model, 'model_params': model_params, 
+            'normalize': normalize, 'standardize': standardize, 
+            'scaler': scaler, 'columns': input_data.columns.to_list(),
+            'dtypes': input_data.dtypes.astype(str).to_dict(),
+            'lag_features': self._lag_features, 'lags': lags, 
+            'rolling_windows': rolling_windows, 'data_hash': data_hash,
+            'history': input_data[input_data.columns.intersection(
+                self._series_columns, sort = False)].iloc[
+                -history_size:].reset_index(drop = True)}, artifact_file)
+            
+        # Default artifact of forecast(), not the artifacts of the hosts
+        if input_data is self._input_data:
+            self._artifact_file = artifact_file
+        
+        if self._verbose:
+            print('- Model artifact saved, file = ', artifact_file, sep = '')
+        
+        
+    def train(self, normalize = False, standardize = False, model = None, 
+        model_params = None, artifact_file = None):
+        '''
+        Trains a model with all the input data (train and test data) and saves
+        its artifact, for forecasting (see forecast()).
+    
+        Args:
+            normalize (boolean): Data normalization flag.
+            
+            standardize (boolean): Data standardization flag.
+            
+            model (string): The model family to be trained. One of the 
+                C_SUPPORTED_MODELS.keys().
+                
+            model_params (dictionary, default is None): The model parameters
+                (see the model family class). If None, the default ones are 
+                used.
+                
+            artifact_file (string, default is None): The artifact file. If 
+                None, a time stamped file in C_DUMPS_DIRECTORY is used.
+            
+        Raises:
+            -
+
+        Returns:
+            string: The artifact file.
+        '''
+
+        if self._verbose:
+            print('\nTrain model: ', ut.formatArguments(locals().items(), 
+                'self'), sep = '')
+                
+        # Signature for the dumped files
+        exec_time_stamp =  datetime.now().strftime('%Y%m%d%H%M%S')
+        
+        # Validate inputs
+        if model not in C_SUPPORTED_MODELS.keys():
+            print('- Model \'', model, '\' is not supported. Supported models ',
+                'are: ', C_SUPPORTED_MODELS, sep = '')
+            return None
+            
+        if artifact_file is None:
+            artifact_file = C_DUMPS_DIRECTORY + 'artifact_' + model + '_' + \
+                exec_time_stamp + '.dump'
+            
+        train_data, _, scaler = ut.preprocessDataSets(self._input_data, None,
+            normalize, standardize)
+            
+        model_family = model
+        model = C_SUPPORTED_MODELS[model](model_params = model_params)
+        model.train(train_data)
+        
+        self._saveArtifact(model_family, model, normalize, standardize, scaler,
+            joblib.hash(train_data), artifact_file, exec_time_stamp)
+        
+        return artifact_file
+        
+        
+    def forecast(self, horizon, artifact_file = None):
+        '''
+        Returns the forecast of the requests for the time steps that follow the
+        input data (see forecast()).
+    
+        Args:
+            horizon (integer): Number of time steps to be forecast.
+            
+            artifact_file (string, default is None): The model artifact file. 
+                If None, the last artifact saved by train() or evaluate() is 
+                used.
+            
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The date tokens of the future time steps and the 
+                forecast requests (last column).
+        '''
+        
+        return forecast(artifact_file or self._artifact_file, horizon)
+        
+        
+    def forecastBatch(self, requests, artifacts = None):
+        '''
+        Returns the forecasts of a batch of (host, origin, horizon) requests 
+        (see forecastBatch()).
+    
+        Args:
+            requests (DataFrame or array like): The requests, see 
+                forecastBatch().
+            
+            artifacts (dictionary or string, default is None): The model 
+                artifact file per host, or a single artifact file for all the 
+                hosts. If None, the artifacts of the hosts saved by the last 
+                trainFleet() are used, else the last artifact saved by train()
+                or evaluate() is used for all the hosts.
+            
+        Raises:
+            ValueError: See forecastBatch().
+
+        Returns:
+            DataFrame: The requests and their forecast (requests column).
+        '''
+        
+        return forecastBatch(artifacts or self._fleet_artifacts or 
+            self._artifact_file, requests)
+        
+        
+    def update(self, data, artifact_file = None, 
+        batch_size = C_UPDATE_BATCH_SIZE, 
+        checkpoint_interval = C_UPDATE_CHECKPOINT_INTERVAL):
+        '''
+        Updates the model of an artifact with new data (see updateArtifact()),
+        instead of training it again with all the data.
+    
+        Args:
+            data (DataFrame or string): The new data (or their file), see 
+                updateArtifact().
+            
+            artifact_file (string, default is None): The model artifact file. 
+                If None, the last artifact saved by train() or evaluate() is 
+                used.
+                
+            batch_size, checkpoint_interval: See updateArtifact().
+            
+        Raises:
+            ValueError: See updateArtifact().
+
+        Returns:
+            string: The artifact file.
+        '''
+        
+        if self._verbose:
+            print('\nUpdate model: ', ut.formatArguments(locals().items(), 
+                ['self', 'data']), sep = '')
+            
+        artifact_file = artifact_file or self._artifact_file
+        
+        start_time = datetime.now()
+        
+        bundle = updateArtifact(artifact_file, data, batch_size, 
+            checkpoint_interval)
+        
+        if self._verbose:
+            print('- Model artifact updated, file = ', artifact_file, 
+                ', last time step = ', pd.Timestamp(ti.timestamps(
+                bundle['history'].iloc[-1:])[0]), ', time elapsed: ', 
+                round((datetime.now() - start_time).total_seconds(), 3), 
+                ' seconds', sep = '')
+            
+        return artifact_file
+        
+        
+    def evaluate(self, normalize = False, standardize = False, model = None,
+        cache_dir = None, search = 'grid'):
         '''
         Executes the evaluation flow for the given model family. The evaluation 
         flow is defined in detail in the class implementation of the model 
@@ -139,6 +933,14 @@ class TF():
             
             model (string): The model family to be evaluated. One of the 
                 C_SUPPORTED_MODELS.keys().
+                
+            cache_dir (string, default is None): Directory of the persistent
+                cache of the evaluation results (see resultCache.py). The cache
+                keys include the input file, the data split, the preprocessing
+                flags and the data content. If None, no cache is used.
+                
+            search (string, default is 'grid'): Search mode of the 
+                hyperparameters tunning, 'grid' or 'halving' (see dnn.DNN).
             
         Raises:
             -
@@ -165,28 +967,29 @@ class TF():
                 self._test_data, sep = '')
             return None
         
-        # Normalize data sets
-        if normalize:
-            self._train_data.iloc[:, :-1] = \
-                ut.normalizeData(self._train_data.iloc[:, :-1])
-        
-            self._test_data.iloc[:, :-1] = \
-                ut.normalizeData(self._test_data.iloc[:, :-1])
+        # Normalize and standardize data sets
+        self._train_data, self._test_data, scaler = ut.preprocessDataSets(
+            self._train_data, self._test_data, normalize, standardize)
+            
+        if scaler is not None:
+            os.makedirs(C_DUMPS_DIRECTORY, exist_ok = True)
+            dump(scaler, C_DUMPS_DIRECTORY + 'evaluate_scaler_' + 
+                exec_time_stamp + '.dump')
 
-        # Standardize data sets
-        if standardize:
-            self._train_data.iloc[:, :-1] = \
-                ut.standardizeData(self._train_data.iloc[:, :-1], 
-                save_scaler_file = '../dumps/evaluate_scaler_' + 
-                    exec_time_stamp + '.dump')
+        # Persistent cache of the evaluation results
+        cache = None
         
-            self._test_data.iloc[:, :-1] = \
-                ut.standardizeData(self._test_data.iloc[:, :-1], 
-                load_scaler_file = '../dumps/evaluate_scaler_' + 
-                    exec_time_stamp + '.dump')
-
+        if cache_dir is not None:
+            cache = ResultCache(cache_dir, context = {
+                'input_file': self._input_file, 'test_split': self._test_split,
+                'lag_features': self._lag_features, 'normalize': normalize, 
+                'standardize': standardize}, 
+                verbose = self._verbose)
+            
         # Run evaluation (grid search)
-        model = C_SUPPORTED_MODELS[model](verbose = self._verbose)
+        model_family = model
+        model = C_SUPPORTED_MODELS[model](verbose = self._verbose, cache = cache,
+            search = search)
         best_score, best_params = model.explore(self._train_data, 
             self._test_data, exec_time_stamp)
 
@@ -194,8 +997,12 @@ class TF():
         print('- Evaluation best score: ', best_score, sep = '')
         print('- Evaluation best params: ', best_params, sep = '')
         
+        self._saveArtifact(model_family, model, normalize, standardize, scaler,
+            joblib.hash(self._train_data), C_DUMPS_DIRECTORY + 'evaluate_artifact_' + 
+            model_family + '_' + exec_time_stamp + '.dump', exec_time_stamp)
+        
         # Plot training, test and forecast data
-        forecast = self._test_data.copy()
+        forecast = self._test_data.astype('float64')
         forecast.iloc[:, -1] = model.predict(self._test_data)
         
         plt.clf()
@@ -220,4 +1027,357 @@ class TF():
         plt.title('Evaluation Test/Forecast score: ' +\
             str(round(r2_score(self._test_data.iloc[:, -1], 
             forecast.iloc[:, -1]), 3)))
-        plt.savefig('../graphs/forecasts/evaluate_TF_' + exec_time_stamp + '.png') 
\ No newline at end of file
+        plt.savefig('../graphs/forecasts/evaluate_TF_' + exec_time_stamp + '.png')
+        
+        
+    def backtest(self, normalize = False, standardize = False, model = None, 
+        model_params = None, folds = 5, max_train_size = None):
+        '''
+        Executes a rolling origin backtesting of a model over the input data.
+        The input data are split in consecutive folds (see ut.timeSeriesCV()), 
+        the model is trained with the data before the origin of each fold and 
+        forecasts the data of the fold. The folds are executed in parallel, the
+        preprocessing of each fold is fitted on its train data only.
+    
+        Args:
+            normalize (boolean): Data normalization flag.
+            
+            standardize (boolean): Data standardization flag.
+            
+            model (string): The model family to be backtested. One of the 
+                C_SUPPORTED_MODELS.keys().
+                
+            model_params (dictionary, default is None): The model parameters
+                (see the model family class). If None, the default ones are 
+                used.
+                
+            folds (integer >= 2, default is 5): Number of folds.
+            
+            max_train_size (integer, default is None): Maximum size of the 
+                train data of a fold (rolling window). If None, the train data 
+                of each fold start from the first row (expanding window).
+            
+        Raises:
+            -
+
+        Returns:
+            DataFrame: The train and test data sizes and the error metrics per 
+                fold (see _scores()).
+                
+            dictionary: The error metrics of all the folds forecasts, and their
+                mean and standard deviation over the folds (keys <metric>, 
+                <metric>_mean, <metric>_std).
+        '''
+
+        if self._verbose:
+            print('\nBacktest model: ', ut.formatArguments(locals().items(), 
+                'self'), sep = '')
+                
+        # Signature for the saved graph
+        exec_time_stamp =  datetime.now().strftime('%Y%m%d%H%M%S')
+        
+        # Validate inputs
+        if model not in C_SUPPORTED_MODELS.keys():
+            print('- Model \'', model, '\' is not supported. Supported models ',
+                'are: ', C_SUPPORTED_MODELS, sep = '')
+            return None
+            
+        # Train and test rows of each fold, the test data follow the train data
+        origins = [(i, train[0], train[-1] + 1, test[-1] + 1) for i, (train, 
+            test) in enumerate(ut.timeSeriesCV(self._input_data, folds, 
+            max_train_size))]
+        
+        # Use multi process class for parallel executing of the folds
+        results = MPT(origins, _backtestFold, processes = None, 
+            verbose = self._verbose, progress = printProgress if 
+            self._verbose else None, input_data = self._input_data, 
+            model = model, model_params = model_params, normalize = normalize,
+            standardize = standardize).execute()
+            
+        fold_scores = pd.DataFrame([r[0] for r in results]).set_index('fold')
+        
+        # Metrics of all the folds forecasts and their spread over the folds
+        actual = self._input_data.iloc[origins[0][2]:origins[-1][3], -1]
+        forecast = np.concatenate([r[1] for r in results])
+        
+        scores = _scores(actual, forecast)
+        
+        for metric in list(scores.keys()):
+            scores[metric + '_mean'] = fold_scores[metric].mean()
+            scores[metric + '_std'] = fold_scores[metric].std()
+            
+        print('- Backtest scores per fold:\n', fold_scores.to_string(), sep = '')
+        print('- Backtest scores: ', ut.formatArguments(scores.items()), 
+            sep = '')
+        
+        # Plot the input data and the forecasts of the folds
+        plt.clf()
+        plt.plot(self._input_data.iloc[:, -1].to_numpy(), 
+            color = 'midnightblue', label = 'data')
+        
+        for (number, _, train_end, test_end), (_, fold_forecast) in zip(
+            origins, results):
+            plt.plot(range(train_end, test_end), fold_forecast, 
+                color = 'black', linewidth = 0.5, 
+                label = 'forecast' if number == 0 else None)
+            plt.axvline(train_end, color = 'orangered', linewidth = 0.5)
+            
+        plt.legend(loc = 'best', fontsize = 8)
+        plt.title('Backtest ' + model + ', ' + str(folds) + ' folds: r2 = ' + 
+            str(round(scores['r2'], 3)) + ', mean r2 = ' + 
+            str(round(scores['r2_mean'], 3)))
+        plt.savefig('../graphs/forecasts/backtest_' + model + '_' + 
+            exec_time_stamp + '.png')
+        
+        return fold_scores, scores
+        
+        
+    def trainFleet(self, normalize = False, standardize = False, model = None,
+        model_params = None, explore = False, artifacts_directory = None):
+        '''
+        Trains one model per host of the input data (per host data, e.g. 
+        traffic_stats_DAILY.csv), in parallel. The input data are loaded once 
+        and reordered by host once, the data of each host are a slice of them 
+        (no copy per host). The model of each host is trained with the train 
+        data of the host (the test_split portion of the rows of the host is 
+        kept for the scores) and its artifact is saved. With explore, the 
+        parameters grid of the model family is evaluated for all the hosts in
+        one parallel execution, and the model of each host is trained with its
+        best parameters.
+    
+        Args:
+            normalize (boolean): Data normalization flag.
+            
+            standardize (boolean): Data standardization flag.
+            
+            model (string): The model family to be trained. One of the 
+                C_SUPPORTED_MODELS.keys().
+                
+            model_params (dictionary, default is None): The model parameters
+                (see the model family class). If None, the default ones are 
+                used. With explore, the parameters which are not explored.
+                
+            explore (boolean, default is False): If True, the parameters of 
+                each host are explored (RNN and LSTM, see rnn.RNN.explore()).
+                
+            artifacts_directory (string, default is None): Directory of the 
+                artifacts of the hosts. If None, C_DUMPS_DIRECTORY is used.
+            
+        Raises:
+            ValueError: When the input data have no host column, or explore is
+                given for a model family without a parameters grid (DNN).
+
+        Returns:
+            DataFrame: The registry of the models, one row per host (index), 
+                with the artifact file, the model parameters, the train and 
+                test data sizes and the error metrics (see _scores()). The 
+                artifact_file column can be given as the artifacts of 
+                forecastBatch().
+        '''
+
+        if self._verbose:
+            print('\nTrain fleet: ', ut.formatArguments(locals().items(), 
+                'self'), sep = '')
+                
+        # Signature for the saved files
+        exec_time_stamp =  datetime.now().strftime('%Y%m%d%H%M%S')
+        
+        # Validate inputs
+        if model not in C_SUPPORTED_MODELS.keys():
+            print('- Model \'', model, '\' is not supported. Supported models ',
+                'are: ', C_SUPPORTED_MODELS, sep = '')
+            return None
+            
+        if 'host' not in self._input_data.columns:
+            raise ValueError('input_file argument error. File given is \'' +
+                str(self._input_file) + '\', where a fleet requires per host ' +
+                'input data (host column)')
+            
+        if explore and not hasattr(C_SUPPORTED_MODELS[model], '_exploreGrid'):
+            raise ValueError('explore argument error. Value given is \'' +
+                str(explore) + '\', where fleet exploration is supported for ' +
+                'the models with a parameters grid (RNN, LSTM), model given ' +
+                'is \'' + model + '\'')
+            
+        artifacts_directory = artifacts_directory or C_DUMPS_DIRECTORY
+        
+        # Rows of the hosts one after the other, in time order per host
+        time_index = ti.TimeIndex(self._input_data)
+        hosts = sorted(self._input_data.host.astype(str).unique())
+        positions = [time_index.query(host = h) for h in hosts]
+        
+        input_data = self._input_data.iloc[np.concatenate(positions)].drop(
+            columns = 'host').reset_index(drop = True)
+            
+        bounds = np.cumsum([0] + [len(p) for p in positions])
+        
+        # The process pool is kept for the exploration and the training
+        with MPT(processes = None, verbose = self._verbose, progress = 
+            printProgress if self._verbose else None) as mpt:
+            
+            data = {'input_data': input_data, 'test_split': self._test_split,
+                'normalize': normalize, 'standardize': standardize, 
+                'model': model}
+            
+            params = [model_params]*len(hosts)
+            
+            if explore:
+                grid = C_SUPPORTED_MODELS[model](
+                    model_params = model_params)._exploreGrid()
+                
+                # All the (host, parameters) pairs in one execution
+                scores = np.array(mpt.execute([(bounds[i], bounds[i + 1], p) 
+                    for i in range(len(hosts)) for p in grid], _fleetScore, 
+                    **data)).reshape(len(hosts), len(grid))
+                    
+                params = [grid[i] for i in scores.argmax(axis = 1)]
+                
+            results = mpt.execute([(bounds[i], bounds[i + 1], params[i]) for i 
+                in range(len(hosts))], _fleetTrain, **data)
+            
+        registry = []
+        
+        for i, (host, (scores, host_model, scaler, data_hash)) in enumerate(
+            zip(hosts, results)):
+            artifact_file = os.path.join(artifacts_directory, 'artifact_' + 
+                model + '_' + host + '_' + exec_time_stamp + '.dump')
+                
+            self._saveArtifact(model, host_model, normalize, standardize, 
+                scaler, data_hash, artifact_file, exec_time_stamp, 
+                input_data.iloc[bounds[i]:bounds[i + 1]])
+                
+            registry.append(dict({'host': host, 'artifact_file': artifact_file,
+                'model_params': host_model.getParams()}, **scores))
+            
+        registry = pd.DataFrame(registry).set_index('host')
+        
+        self._fleet_artifacts = registry.artifact_file.to_dict()
+        
+        print('- Fleet registry:\n', registry.drop(columns = 'model_params'
+            ).to_string(), sep = '')
+        
+        return registry
+        
+        
+    def reconcile(self, normalize = False, standardize = False, model = None,
+        model_params = None, method = 'mint'):
+        '''
+        Forecasts the hosts and the cluster (sum of the hosts) of per host 
+        input data (e.g. traffic_stats_DAILY.csv) and reconciles the forecasts,
+        so that the cluster forecast is the sum of the hosts forecasts (see 
+        reconciliation.reconcile()). The features of the time steps are built
+        and preprocessed once, and shared by the models of all the levels, 
+        which are trained in parallel. The time steps are split in train, 
+        validation and test data (the test_split portion of the time steps, 
+        and the same portion of the rest). The models are trained with the 
+        train data, their residuals on the validation data are the weights of
+        the reconciliation of the test data forecasts.
+    
+        Args:
+            normalize (boolean): Data normalization flag.
+            
+            standardize (boolean): Data standardization flag.
+            
+            model (string): The model family of the levels. One of the 
+                C_SUPPORTED_MODELS.keys().
+                
+            model_params (dictionary, default is None): The model parameters
+                (see the model family class). If None, the default ones are 
+                used.
+                
+            method (string, default is 'mint'): The reconciliation method, one
+                of reconciliation.C_RECONCILIATION_METHODS.
+            
+        Raises:
+            ValueError: When the input data have no host column or a host has
+                no requests for some time steps, or method given value is not 
+                supported.
+
+        Returns:
+            DataFrame: The reconciled forecasts of the test time steps (date 
+                tokens index), one column per level (cluster, then the hosts).
+                
+            DataFrame: The error metrics (see _scores()) of the base and the 
+                reconciled forecasts (<metric>_base, <metric>), one row per 
+                level.
+        '''
+
+        if self._verbose:
+            print('\nReconcile forecasts: ', ut.formatArguments(
+                locals().items(), 'self'), sep = '')
+                
+        # Validate inputs
+        if model not in C_SUPPORTED_MODELS.keys():
+            print('- Model \'', model, '\' is not supported. Supported models ',
+                'are: ', C_SUPPORTED_MODELS, sep = '')
+            return None
+            
+        if method not in rc.C_RECONCILIATION_METHODS:
+            raise ValueError('method argument error. Value given is \'' + 
+                str(method) + '\', where supported values are ' + 
+                str(rc.C_RECONCILIATION_METHODS))
+            
+        if 'host' not in self._input_data.columns:
+            raise ValueError('input_file argument error. File given is \'' +
+                str(self._input_file) + '\', where reconciliation requires ' +
+                'per host input data (host column)')
+        
+        requests = self._input_data.columns[-1]
+        features = self._input_data.columns.drop(['host', requests]).to_list()
+        
+        # One row per time step, the requests of the cluster and of each host
+        targets = self._input_data.pivot(index = features, columns = 'host', 
+            values = requests)
+        
+        if targets.isna().any(axis = None):
+            raise ValueError('input_file argument error. Hosts ' + str(
+                targets.columns[targets.isna().any()].to_list()) + ' have no ' +
+                'requests for some time steps of the input data')
+            
+        targets.columns = pd.Index(targets.columns.astype(str), name = 'level')
+        targets.insert(0, 'cluster', targets.sum(axis = 1))
+        
+        # The features of the time steps, computed and preprocessed once
+        input_data = targets.index.to_frame(index = False).assign(**{
+            requests: targets.cluster.to_numpy()})
+        
+        train_data, test_data = ut.splitData(input_data, self._test_split)
+        train_data, validation_data = ut.splitData(train_data, 
+            self._test_split)
+        
+        train_data, test_data, _ = ut.preprocessDataSets(train_data, 
+            input_data.iloc[len(train_data.index):], normalize, standardize)
+        
+        if self._verbose:
+            print('- Levels prepared, levels = ', targets.columns.to_list(), 
+                ', train_size = ', len(train_data.index), 
+                ', validation_size = ', len(validation_data.index), 
+                ', test_size = ', len(test_data.index) - 
+                len(validation_data.index), sep = '')
+        
+        # Use multi process class for parallel executing of the levels
+        forecasts = np.column_stack(MPT(range(len(targets.columns)), 
+            _reconcileLevel, processes = None, verbose = self._verbose, 
+            progress = printProgress if self._verbose else None, 
+            train_data = train_data, test_data = test_data, 
+            targets = targets.to_numpy(dtype = 'float64'), model = model, 
+            model_params = model_params).execute())
+        
+        actual = targets.to_numpy(dtype = 'float64')[len(train_data.index):]
+        validation_size = len(validation_data.index)
+        
+        # Weights from the validation residuals, the test forecasts reconciled
+        reconciled = rc.reconcile(forecasts[validation_size:], 
+            actual[:validation_size] - forecasts[:validation_size], method)
+        
+        scores = pd.DataFrame([dict({m + '_base': v for m, v in _scores(
+            actual[validation_size:, i], forecasts[validation_size:, i]).items()},
+            **_scores(actual[validation_size:, i], reconciled[:, i])) for i in 
+            range(len(targets.columns))], index = targets.columns)
+            
+        print('- Reconciliation scores (', method, '):\n', scores.to_string(), 
+            sep = '')
+        
+        return pd.DataFrame(reconciled, index = targets.index[len(
+            train_data.index) + validation_size:], columns = targets.columns), \
+            scores
@@ -7,7 +7,7 @@ email: vsaveris@gmail.com
 
 License: MIT
 
-Date last modified: 10.04.2020
+Date last modified: 17.10.2026
 
 Python Version: 3.8
 '''
@@ -85,7 +85,8 @@ def normalizeData(data):
     return Normalizer().transform(data)
 
 
-def standardizeData(data, save_scaler_file = None, load_scaler_file = None):
+def standardizeData(data, save_scaler_file = None, load_scaler_file = None,
+    scaler = None, update = False):
     '''
     Scaling data to have zero mean and unit variance.
     
@@ -96,6 +97,14 @@ def standardizeData(data, save_scaler_file = None, load_scaler_file = None):
         
         load_scaler_file (string): Load dumped scaler instead of creating a new
             one.
+            
+        scaler (StandardScaler, default is None): Fitted scaler to be used 
+            instead of creating a new one.
+            
+        update (boolean, default is False): If True, the statistics of the 
+            loaded or given scaler are updated with the data before they are
+            standardized (running mean and variance, the previous data are not
+            needed). The given scaler is updated in place.
         
     Raises:
         -
@@ -104,18 +113,102 @@ def standardizeData(data, save_scaler_file = None, load_scaler_file = None):
         DataFrame: Standardized data.
     '''
     
-    if load_scaler_file is None:
-        scaler = StandardScaler().fit(data)     
-    else:
+    if scaler is None and load_scaler_file is not None:
         scaler = load(load_scaler_file)
         
+    if scaler is None:
+        scaler = StandardScaler().fit(data)
+    elif update:
+        scaler.partial_fit(data)
+        
     if save_scaler_file is not None:
         dump(scaler, save_scaler_file)
     
     return scaler.transform(data)
   
 
-def timeSeriesCV(data, splits = 5):
+def preprocessData(data, normalize = False, scaler = None, update = False):
+    '''
+    Normalizes and standardizes the features (all the columns but the last one)
+    of a data set, with an already fitted scaler.
+    
+    Args:
+        data (DataFrame): The data.
+        
+        normalize (boolean, default is False): Data normalization flag.
+        
+        scaler (StandardScaler, default is None): The fitted scaler. If None,
+            the data are not standardized.
+            
+        update (boolean, default is False): If True, the statistics of the 
+            scaler are updated with the data first (online updates, see 
+            standardizeData()).
+        
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The preprocessed data (copy if preprocessed).
+    '''
+    
+    if not normalize and scaler is None:
+        return data
+    
+    # The scaled features are floats, the schema types are integers
+    data = data.astype({c: 'float64' for c in data.columns[:-1]})
+    
+    if normalize:
+        data.iloc[:, :-1] = normalizeData(data.iloc[:, :-1])
+        
+    if scaler is not None:
+        data.iloc[:, :-1] = standardizeData(data.iloc[:, :-1], scaler = scaler,
+            update = update)
+        
+    return data
+    
+
+def preprocessDataSets(train_data, test_data, normalize = False,
+    standardize = False):
+    '''
+    Normalizes and standardizes the features (all the columns but the last one)
+    of a train and a test data set. The standardization is fitted on the train
+    data only.
+    
+    Args:
+        train_data (DataFrame): The train data.
+        
+        test_data (DataFrame): The test data, None if there are no test data.
+        
+        normalize (boolean, default is False): Data normalization flag.
+        
+        standardize (boolean, default is False): Data standardization flag.
+        
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The preprocessed train data (copy if preprocessed).
+        
+        DataFrame: The preprocessed test data (copy if preprocessed), None if
+            there are no test data.
+        
+        StandardScaler: The scaler fitted on the train data, None if the data 
+            are not standardized.
+    '''
+    
+    scaler = None
+    
+    if standardize:
+        scaler = StandardScaler().fit(preprocessData(train_data, 
+            normalize).iloc[:, :-1])
+        
+    if test_data is not None:
+        test_data = preprocessData(test_data, normalize, scaler)
+        
+    return preprocessData(train_data, normalize, scaler), test_data, scaler
+    
+
+def timeSeriesCV(data, splits = 5, max_train_size = None):
     '''
     Create Time Series Cross Validation indices for the input data.
     
@@ -124,6 +217,10 @@ def timeSeriesCV(data, splits = 5):
         
         splits (integer >= 2): The number of folds to be used.
         
+        max_train_size (integer, default is None): Maximum size of the train
+            data of a fold (rolling window). If None, the train data of each
+            fold start from the first row (expanding window).
+        
     Raises:
         -
 
@@ -131,4 +228,5 @@ def timeSeriesCV(data, splits = 5):
         generator: Indices of train and test data for each fold.
     '''
     
-    return TimeSeriesSplit(n_splits = splits).split(data)
\ No newline at end of file
+    return TimeSeriesSplit(n_splits = splits, 
+        max_train_size = max_train_size).split(data)
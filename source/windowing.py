@@ -0,0 +1,318 @@
+'''
+File name: windowing.py
+    Windowing of the processed time series: lag, rolling mean and seasonal lag
+    features of the requests, and sequence windows for the recurrent models.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+# My packages
+import schema as sc
+import timeIndex as ti
+
+# Python packages
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+'''
+Constants
+'''
+# Time step of the series per granularity (pandas frequency)
+C_FREQUENCIES = {'HOURLY': 'h', 'DAILY': 'D', 'MONTHLY': 'MS', 'YEARLY': 'YS'}
+
+# Time step of the series per granularity (pandas period)
+C_PERIODS = {'HOURLY': 'h', 'DAILY': 'D', 'MONTHLY': 'M', 'YEARLY': 'Y'}
+
+# Default lags (in time steps) per granularity: previous step and seasonal lags
+# (day and week for the hourly series, week for the daily one, year for the
+# monthly one)
+C_LAGS = {'HOURLY': (1, 24, 168), 'DAILY': (1, 7), 'MONTHLY': (1, 12),
+    'YEARLY': (1,)}
+
+# Default rolling mean windows (in time steps) per granularity
+C_ROLLING_WINDOWS = {'HOURLY': (24,), 'DAILY': (7,), 'MONTHLY': (3,),
+    'YEARLY': ()}
+
+
+def granularity(data):
+    '''
+    Returns the granularity of the processed data, from their date tokens.
+
+    Args:
+        data (DataFrame): The processed data.
+
+    Raises:
+        -
+
+    Returns:
+        string: One of C_FREQUENCIES.keys().
+    '''
+
+    for column, data_granularity in [('hour', 'HOURLY'), ('day', 'DAILY'),
+        ('month', 'MONTHLY')]:
+        if column in data.columns:
+            return data_granularity
+
+    return 'YEARLY'
+
+
+def dateTokens(steps, columns):
+    '''
+    Returns the date tokens of a sequence of time steps.
+
+    Args:
+        steps (DatetimeIndex): The time steps.
+
+        columns (list of strings): The data columns, only the date tokens ones
+            are returned.
+
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The date tokens, one row per time step.
+    '''
+
+    date_time = steps.to_series()
+    tokens = {'year': date_time.dt.year, 'month': date_time.dt.month,
+        'day': date_time.dt.day, 'week_day': date_time.dt.weekday,
+        'hour': date_time.dt.hour}
+
+    return pd.DataFrame({c: tokens[c] for c in columns if c in tokens})
+
+
+def regularize(data, column = 'requests'):
+    '''
+    Completes a series with the missing time steps, e.g. hours without any
+    request or the hours skipped by the daylight saving time changes, so that a
+    lag of k rows is a lag of k time steps. The requests of the missing steps
+    are linearly interpolated from their neighbours (a zero would enter the lag
+    and rolling mean features as a fake traffic drop). The number of completed
+    steps is reported in the attrs['filled_steps'] of the returned data.
+
+    Args:
+        data (DataFrame): The processed data of a single series (combined
+            hosts), in time order.
+
+        column (string, default is 'requests'): The requests column.
+
+    Raises:
+        ValueError: When the data contain a host column.
+
+    Returns:
+        DataFrame: The data, one row per time step.
+    '''
+
+    if 'host' in data.columns:
+        raise ValueError('data argument error. Windowing applies to a single ' +
+            'series, where the data given contain a host column')
+
+    times = pd.DatetimeIndex(ti.timestamps(data))
+    steps = pd.date_range(times[0], times[-1],
+        freq = C_FREQUENCIES[granularity(data)])
+
+    if len(steps) == len(times):
+        regular = data.copy(deep = False)
+        regular.attrs['filled_steps'] = 0
+
+        return regular
+
+    regular = dateTokens(steps, data.columns)
+    regular[column] = data[column].set_axis(times).reindex(steps).astype(
+        'float64').interpolate().round()
+
+    regular = sc.applySchema(regular[list(data.columns)].reset_index(
+        drop = True))
+    regular.attrs['filled_steps'] = len(steps) - len(times)
+
+    return regular
+
+
+def futureSteps(data, horizon):
+    '''
+    Returns the date tokens of the time steps that follow the data.
+
+    Args:
+        data (DataFrame): The processed data of a single series, in time order.
+
+        horizon (integer): Number of time steps.
+
+    Raises:
+        -
+
+    Returns:
+        DataFrame: The date tokens columns of the data, one row per time step,
+            with the schema types (see schema.py).
+    '''
+
+    steps = pd.date_range(pd.Timestamp(ti.timestamps(data.iloc[-1:])[0]),
+        periods = horizon + 1, freq = C_FREQUENCIES[granularity(data)])[1:]
+
+    return sc.applySchema(dateTokens(steps, data.columns).reset_index(
+        drop = True))
+
+
+def shiftSteps(times, steps, data_granularity):
+    '''
+    Returns times shifted by a number of time steps, for many times at once.
+
+    Args:
+        times (DatetimeIndex): The times.
+
+        steps (Numpy Array): The number of time steps per time (integers).
+
+        data_granularity (string): One of C_PERIODS.keys().
+
+    Raises:
+        -
+
+    Returns:
+        DatetimeIndex: The shifted times.
+    '''
+
+    return (pd.PeriodIndex(times, freq = C_PERIODS[data_granularity]) +
+        steps).to_timestamp()
+
+
+def windows(values, length):
+    '''
+    Returns the sliding windows of a series, as a view of the series (no
+    copy). Window i contains the values i, i + 1, ..., i + length - 1.
+
+    Args:
+        values (Numpy Array): The series, one row per time step (1-D), or one
+            row of features per time step (2-D).
+
+        length (integer): The length of the windows.
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The windows, read only, of shape (n - length + 1, length)
+            or (n - length + 1, length, features).
+    '''
+
+    view = sliding_window_view(values, length, axis = 0)
+
+    # The window axis is the last one, the time axis goes before the features
+    return view if values.ndim == 1 else view.swapaxes(1, 2)
+
+
+def lagFeatures(values, lags):
+    '''
+    Returns the lagged values of a series, for each time step with a complete
+    history (the first max(lags) steps have none).
+
+    Args:
+        values (Numpy Array): The series (1-D).
+
+        lags (list of integers): The lags, in time steps.
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The lagged values, of shape (n - max(lags), len(lags)).
+            Row i corresponds to the time step i + max(lags).
+    '''
+
+    max_lag = max(lags)
+
+    # The last value of each window is the current time step. The windows are
+    # a view, but selecting the lag columns (fancy indexing) copies them
+    return windows(values, max_lag + 1)[:, [max_lag - l for l in lags]]
+
+
+def rollingMean(values, window):
+    '''
+    Returns the mean of the previous values of a series over a window, for each
+    time step with a complete window (the first window steps have none). The
+    current value is not included.
+
+    Args:
+        values (Numpy Array): The series (1-D).
+
+        window (integer): The length of the window, in time steps.
+
+    Raises:
+        -
+
+    Returns:
+        Numpy Array: The means, of shape (n - window,). Element i corresponds
+            to the time step i + window.
+    '''
+
+    # Differences of the cumulative sums, linear for any window length
+    sums = np.concatenate(([0.], np.cumsum(values, dtype = 'float64')))
+
+    return (sums[window:-1] - sums[:-window - 1])/window
+
+
+def addLagFeatures(data, lags = None, rolling_windows = None,
+    column = 'requests'):
+    '''
+    Adds the lag and rolling mean features of the requests to the processed
+    data. The series is regularized first (see regularize()) and the first time
+    steps, without a complete history, are dropped. The requests column is kept
+    as the last one (target column).
+
+    Args:
+        data (DataFrame): The processed data of a single series (combined
+            hosts), in time order.
+
+        lags (list of integers, default is None): The lags, in time steps. If
+            None, the defaults of the data granularity are used (see C_LAGS).
+
+        rolling_windows (list of integers, default is None): The rolling mean
+            windows, in time steps. If None, the defaults of the data
+            granularity are used (see C_ROLLING_WINDOWS).
+
+        column (string, default is 'requests'): The requests column.
+
+    Raises:
+        ValueError: When the data contain a host column.
+
+    Returns:
+        DataFrame: The data with the columns <column>_lag_<lag> and
+            <column>_mean_<window> added before the requests column. The
+            number of completed time steps is in attrs['filled_steps'].
+    '''
+
+    data = regularize(data, column)
+
+    if lags is None:
+        lags = C_LAGS[granularity(data)]
+
+    if rolling_windows is None:
+        rolling_windows = C_ROLLING_WINDOWS[granularity(data)]
+
+    values = data[column].to_numpy()
+    start = max(list(lags) + list(rolling_windows))
+
+    features = {}
+
+    if len(lags) > 0:
+        lagged = lagFeatures(values, lags)[start - max(lags):]
+
+        for i, l in enumerate(lags):
+            features[column + '_lag_' + str(l)] = lagged[:, i]
+
+    for w in rolling_windows:
+        features[column + '_mean_' + str(w)] = rollingMean(values, w)[start - w:]
+
+    features = pd.DataFrame(features, index = data.index[start:])
+
+    features = pd.concat([data.iloc[start:].drop(columns = column), features,
+        data.iloc[start:][[column]]], axis = 1).reset_index(drop = True)
+    features.attrs['filled_steps'] = data.attrs['filled_steps']
+
+    return features
@@ -0,0 +1,26 @@
+'''
+File name: conftest.py
+    Pytest configuration: the modules of the source directory are imported
+    as they are by the scripts (executed in the source directory).
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import os
+import sys
+
+'''
+Constants
+'''
+# Directory of the source modules
+C_SOURCE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    '..', 'source')
+
+sys.path.insert(0, C_SOURCE_DIRECTORY)
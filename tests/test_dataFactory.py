@@ -0,0 +1,186 @@
+'''
+File name: test_dataFactory.py
+    Tests of the data factory: the streaming (chunked) and the incremental
+    modes give the same files as a run over the whole input at once, and the
+    incremental mode reads only the new rows of the input file.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataIO as dio
+from dataFactory import DataFactory, C_GRANULARITY_COLUMNS
+
+
+@pytest.fixture
+def inputData():
+    '''
+    Hourly input data of two hosts (date, host, requests), in time order.
+    '''
+
+    rng = np.random.RandomState(0)
+    dates = pd.date_range('2020-01-30', periods = 24*40, freq = 'h').strftime(
+        '%Y-%m-%d %H:%M:%S')
+
+    return pd.DataFrame({'date': np.repeat(dates, 2), 'host': np.tile(
+        ['as-01', 'as-02'], len(dates)), 'requests': rng.randint(100, 1000,
+        2*len(dates))})
+
+
+@pytest.fixture
+def minuteData():
+    '''
+    Input data per minute of three hosts, as the raw input file: an hour has 
+    180 rows, and a chunk boundary falls inside most of the hourly groups.
+    '''
+
+    rng = np.random.RandomState(1)
+    dates = pd.date_range('2020-03-31 20:00:00', periods = 60*30,
+        freq = 'min').strftime('%Y-%m-%d %H:%M:%S')
+
+    return pd.DataFrame({'date': np.repeat(dates, 3), 'host': np.tile(
+        ['as-01', 'as-02', 'as-03'], len(dates)), 'requests': rng.randint(0,
+        500, 3*len(dates))})
+
+
+def _aggregations(prefix):
+    '''
+    The saved aggregations of all the granularities, in group order.
+    '''
+
+    aggregations = {}
+
+    for granularity in C_GRANULARITY_COLUMNS.keys():
+        for suffix in ['', '_CHs']:
+            data = dio.readData(prefix + granularity + suffix + '.csv')
+            aggregations[granularity + suffix] = data.sort_values(list(
+                data.columns[:-1])).reset_index(drop = True)
+
+    return aggregations
+
+
+@pytest.mark.parametrize('chunk_size', [None, 333])
+def test_incrementalMatchesFullRun(inputData, tmp_path, monkeypatch,
+    chunk_size):
+    monkeypatch.chdir(tmp_path)
+
+    inputData.to_csv('full.csv', index = False)
+    DataFactory('full.csv', True, 'tokenized_full.csv').aggregateAll('full_')
+
+    # The input file grows with new rows between the runs. A run without
+    # aggregateAll() (e.g. interrupted) does not update the watermark.
+    inputData.iloc[:1000].to_csv('input.csv', index = False)
+
+    for first, last, aggregate in [(0, 1000, True), (1000, 1300, False),
+        (1300, 1300, True), (1300, len(inputData.index), True),
+        (None, None, True)]:
+
+        if first is not None and first > 0:
+            inputData.iloc[first:last].to_csv('input.csv', mode = 'a',
+                header = False, index = False)
+
+        factory = DataFactory('input.csv', True, 'tokenized.csv', chunk_size,
+            watermark_file = 'traffic_watermark.txt')
+
+        if aggregate:
+            factory.aggregateAll('incremental_')
+
+    assert dio.readData('tokenized.csv').equals(dio.readData(
+        'tokenized_full.csv'))
+
+    full = _aggregations('full_')
+
+    for name, data in _aggregations('incremental_').items():
+        assert data.equals(full[name]), name
+
+
+def test_incrementalSkipsProcessedRows(inputData, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    inputData.iloc[:1000].to_csv('input.csv', index = False)
+    DataFactory('input.csv', True, 'tokenized.csv', watermark_file =
+        'traffic_watermark.txt').aggregateAll('incremental_')
+
+    # The processed rows are made unreadable (same size), only the new rows
+    # after the watermark offset should be parsed
+    with open('input.csv', 'r+b') as f:
+        f.readline()
+        f.write(f.readline().replace(b'as-01', b'#####').replace(b'-',
+            b'x'))
+
+    inputData.iloc[1000:].to_csv('input.csv', mode = 'a', header = False,
+        index = False)
+
+    factory = DataFactory('input.csv', True, watermark_file =
+        'traffic_watermark.txt')
+
+    assert len(factory._data_file.index) == len(inputData.index) - 1000
+    assert factory._data_file.date.iloc[0] == inputData.date.iloc[1000]
+
+
+def test_incrementalNewRowsFile(inputData, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    inputData.iloc[:1000].to_csv('input.csv', index = False)
+    DataFactory('input.csv', True, watermark_file =
+        'traffic_watermark.txt').aggregateAll('incremental_')
+
+    # A file of the last rows only: the offset does not apply, the rows up to
+    # the watermark are dropped
+    inputData.iloc[900:].to_csv('new.csv', index = False)
+
+    factory = DataFactory('new.csv', True, watermark_file =
+        'traffic_watermark.txt')
+
+    assert len(factory._data_file.index) == len(inputData.index) - 1000
+
+
+@pytest.mark.parametrize('chunk_size', [77, 179, 180, 1000, 100000])
+def test_streamingMatchesInMemory(minuteData, tmp_path, monkeypatch,
+    chunk_size):
+    monkeypatch.chdir(tmp_path)
+    minuteData.to_csv('input.csv', index = False)
+
+    in_memory = DataFactory('input.csv', True, 'tokenized.csv')
+    in_memory.aggregateAll('memory_')
+
+    streaming = DataFactory('input.csv', True, 'tokenized_stream.csv',
+        chunk_size)
+    streaming.aggregateAll('stream_')
+
+    with open('tokenized.csv', 'rb') as f, open('tokenized_stream.csv',
+        'rb') as g:
+        assert f.read() == g.read()
+
+    # The partial sums of the chunks are merged in to one row per hour and
+    # host, split groups included
+    assert streaming._data_file.equals(in_memory.aggregateData('HOURLY'))
+
+    memory = _aggregations('memory_')
+
+    for name, data in _aggregations('stream_').items():
+        assert data.equals(memory[name]), name
+
+    for granularity in C_GRANULARITY_COLUMNS.keys():
+        assert streaming.aggregateData(granularity).equals(
+            in_memory.aggregateData(granularity)), granularity
+
+
+def test_streamingEmptyInput(minuteData, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    minuteData.iloc[:0].to_csv('input.csv', index = False)
+
+    aggregations = DataFactory('input.csv', True, chunk_size = 10
+        ).aggregateAll()
+
+    assert all(len(data.index) == 0 for data in aggregations.values())
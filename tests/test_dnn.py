@@ -0,0 +1,85 @@
+'''
+File name: test_dnn.py
+    Tests of the DNN model: the learning curve of a single incrementally
+    trained model matches separate fits for each number of iterations.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sklearn.base import clone
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.metrics import r2_score
+from sklearn.neural_network import MLPRegressor
+
+from dnn import DNN
+
+
+@pytest.fixture
+def data():
+    '''
+    Train and test data (date tokens like features, requests last).
+    '''
+
+    rng = np.random.RandomState(0)
+    features = rng.uniform(size = (300, 4))
+    requests = features @ [3., -2., 1., 0.5] + np.sin(6.*features[:, 0]) + \
+        rng.normal(scale = 0.1, size = 300)
+
+    frame = pd.DataFrame(features, columns = ['month', 'day', 'week_day',
+        'hour']).assign(requests = requests)
+
+    return {'train_data': frame.iloc[:240], 'test_data': frame.iloc[240:],
+        'data_hash': None}
+
+
+def _fittedScores(model, data, max_iter):
+    '''
+    The train and test r2 scores of a model fitted with max_iter iterations.
+    '''
+
+    train_data, test_data = data['train_data'], data['test_data']
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', ConvergenceWarning)
+        model = clone(model).set_params(max_iter = max_iter).fit(
+            train_data.iloc[:, :-1], train_data.iloc[:, -1])
+
+    return r2_score(train_data.iloc[:, -1], model.predict(
+        train_data.iloc[:, :-1])), r2_score(test_data.iloc[:, -1],
+        model.predict(test_data.iloc[:, :-1]))
+
+
+# Without stopping, with an early stop, and with the 'adaptive' learning rate
+# divided until the training stops
+@pytest.mark.parametrize('model_params', [
+    {'solver': 'adam', 'tol': 0.},
+    {'solver': 'adam', 'tol': 1e-2, 'n_iter_no_change': 3},
+    {'solver': 'sgd', 'learning_rate': 'adaptive', 'learning_rate_init': 0.01,
+        'tol': 1e-2, 'n_iter_no_change': 2}])
+def test_learningCurveMatchesFits(data, model_params):
+    model = MLPRegressor(hidden_layer_sizes = (8,), shuffle = False,
+        random_state = 1, **model_params)
+    iterations = list(range(1, 41))
+
+    train_scores, test_scores = DNN()._calculateLearningCurve(clone(model),
+        data, iterations)
+
+    expected = [_fittedScores(model, data, i) for i in iterations]
+
+    assert np.allclose(train_scores, [e[0] for e in expected], rtol = 0.,
+        atol = 1e-12)
+    assert np.allclose(test_scores, [e[1] for e in expected], rtol = 0.,
+        atol = 1e-12)
@@ -0,0 +1,129 @@
+'''
+File name: test_mpt.py
+    Tests of the Multi Process Task: several jobs on a kept process pool with
+    shared data arguments, an execution closed early and the measurements
+    report.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import os
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mpt
+from mpt import MPT
+
+
+def _columnSum(member, data):
+    return float(data['frame'].iloc[:, member].sum())
+
+
+def _scaledRow(member, data):
+    return data['array'][member]*data['factor']
+
+
+def _slowMarker(member, data):
+    '''
+    Sleeps, then writes the sum of a row of the shared array in a file of the
+    member (the task runs after its generator is closed).
+    '''
+
+    time.sleep(0.05)
+
+    with open(os.path.join(data['directory'], str(member)), 'w') as f:
+        f.write(str(data['array'][member].sum()))
+
+    return member
+
+
+def test_jobsOnKeptPool():
+    rng = np.random.RandomState(0)
+    frame = pd.DataFrame(rng.uniform(size = (1000, 6)))
+    array = rng.normal(size = (50, 20))
+
+    with MPT(processes = 2, chunksize = 3) as m:
+        sums = m.execute(range(6), _columnSum, frame = frame)
+        workers = set(m.report().worker)
+
+        rows = m.execute(range(50), _scaledRow, array = array, factor = 2.)
+        workers |= set(m.report().worker)
+
+        # The arguments of the constructor are replaced per execution
+        sums_again = m.execute(range(5, -1, -1), _columnSum, frame = frame*2)
+        workers |= set(m.report().worker)
+
+    assert np.allclose(sums, frame.sum())
+    assert np.allclose(rows, array*2.)
+    assert np.allclose(sums_again, frame.sum()[::-1]*2)
+
+    # The same processes executed all the jobs
+    assert len(workers) <= 2
+
+
+def test_iterateClosedEarly(tmp_path, monkeypatch):
+    released = []
+    release = mpt.SharedData.release
+
+    def recordRelease(shared):
+        released.append(shared._name)
+        release(shared)
+
+    monkeypatch.setattr(mpt.SharedData, 'release', recordRelease)
+
+    array = np.arange(80.).reshape(40, 2)
+
+    with MPT(processes = 2, chunksize = 4) as m:
+        results = m.iterate(range(40), _slowMarker, array = array,
+            directory = str(tmp_path))
+        next(results)
+        results.close()
+
+        # The pending chunks still attach the shared data
+        assert released == []
+        assert len(m.report().index) < 40
+
+        # The pool is still usable
+        assert np.allclose(m.execute([3, 1], _scaledRow, array = array,
+            factor = 1.), array[[3, 1]])
+
+    # After the pool is closed, all the pending tasks are completed and the
+    # shared data of both executions are released
+    assert sorted(int(f) for f in os.listdir(tmp_path)) == list(range(40))
+
+    for member in range(40):
+        with open(os.path.join(tmp_path, str(member))) as f:
+            assert float(f.read()) == array[member].sum()
+
+    assert len(released) == 4
+
+    for name in released:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name = name)
+
+
+def test_report():
+    with MPT(processes = 2) as m:
+        m.execute([4, 2, 7], _scaledRow, array = np.ones((8, 3)),
+            factor = 3.)
+
+        report = m.report()
+
+    assert report.index.name == 'position'
+    assert list(report.index.sort_values()) == [0, 1, 2]
+    assert list(report.columns) == ['member', 'worker', 'wall_time',
+        'cpu_time', 'rss_delta', 'worker_peak_rss']
+    assert list(report.sort_index().member) == ['4', '2', '7']
+    assert (report.wall_time >= 0).all() and (report.cpu_time >= 0).all()
+    assert (report.worker_peak_rss > 0).all()
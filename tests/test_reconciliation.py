@@ -0,0 +1,104 @@
+'''
+File name: test_reconciliation.py
+    Tests of the reconciliation module: the reconciled forecasts are coherent
+    for every method.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+import pytest
+
+import reconciliation as rc
+
+
+def _residuals(steps = 50, bottom = 4, seed = 0):
+    '''
+    Correlated residuals of a two level hierarchy, total first.
+    '''
+
+    rng = np.random.RandomState(seed)
+    bottom_residuals = rng.normal(size = (steps, bottom)) @ rng.normal(
+        size = (bottom, bottom))
+
+    return np.column_stack((bottom_residuals.sum(axis = 1) +
+        rng.normal(size = steps), bottom_residuals))
+
+
+@pytest.mark.parametrize('method', rc.C_RECONCILIATION_METHODS)
+def test_reconciliationMatrixIsCoherent(method):
+    residuals = _residuals()
+    s = rc.summingMatrix(residuals.shape[1] - 1)
+    m = rc.reconciliationMatrix(residuals, method)
+
+    # S G S = S: coherent forecasts are kept as they are, and M is a projection
+    assert np.allclose(m @ s, s)
+    assert np.allclose(m @ m, m)
+
+
+@pytest.mark.parametrize('method', rc.C_RECONCILIATION_METHODS)
+def test_reconcileSumsTheBottomSeries(method):
+    residuals = _residuals()
+    forecasts = np.random.RandomState(1).normal(size = (10, 5))
+
+    coherent = rc.reconcile(forecasts, residuals, method)
+
+    assert coherent.shape == forecasts.shape
+    assert np.allclose(coherent[:, 0], coherent[:, 1:].sum(axis = 1))
+
+
+def test_bottomUpKeepsTheBottomForecasts():
+    forecasts = np.random.RandomState(1).normal(size = (10, 5))
+
+    coherent = rc.reconcile(forecasts, _residuals(), 'bottom_up')
+
+    assert np.allclose(coherent[:, 1:], forecasts[:, 1:])
+
+
+def test_shrinkCovarianceIsPositiveDefinite():
+    # Fewer time steps than series, the sample covariance is singular
+    shrunk, intensity = rc.shrinkCovariance(_residuals(steps = 4, bottom = 6))
+
+    assert 0. <= intensity <= 1.
+    assert np.all(np.linalg.eigvalsh(shrunk) > 0.)
+
+
+def test_shrinkCovarianceConstantSeries():
+    residuals = _residuals()
+    residuals[:, 2] = 0.
+
+    shrunk, intensity = rc.shrinkCovariance(residuals)
+
+    assert np.all(np.isfinite(shrunk)) and 0. <= intensity <= 1.
+    assert np.all(shrunk[2] == 0.) and np.all(shrunk[:, 2] == 0.)
+
+    # Nothing to shrink when all the residuals are zero
+    shrunk, intensity = rc.shrinkCovariance(np.zeros((10, 3)))
+
+    assert np.all(shrunk == 0.) and intensity == 1.
+
+
+@pytest.mark.parametrize('method', rc.C_RECONCILIATION_METHODS)
+@pytest.mark.parametrize('zero_series', [[2], [0, 1, 2, 3, 4]])
+def test_reconcileZeroResiduals(method, zero_series):
+    # Series with perfect (zero residual) forecasts, e.g. an all zero node
+    residuals = _residuals()
+    residuals[:, zero_series] = 0.
+    forecasts = np.random.RandomState(1).normal(size = (10, 5))
+
+    coherent = rc.reconcile(forecasts, residuals, method)
+
+    assert np.all(np.isfinite(coherent))
+    assert np.allclose(coherent[:, 0], coherent[:, 1:].sum(axis = 1))
+
+
+def test_unsupportedMethod():
+    with pytest.raises(ValueError):
+        rc.reconciliationMatrix(_residuals(), 'median')
@@ -0,0 +1,108 @@
+'''
+File name: test_resultCache.py
+    Tests of the Result Cache: stored results, eviction of the least recently
+    used results and removal of the temporary files of interrupted writes.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+import resultCache
+from resultCache import ResultCache
+
+
+def _files(directory, suffix):
+    return sorted(f for f in os.listdir(directory) if f.endswith(suffix))
+
+
+def _tempFile(directory, name, size, age):
+    path = os.path.join(directory, name)
+
+    with open(path, 'wb') as f:
+        f.write(b'0'*size)
+
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+    return path
+
+
+def test_putGet(tmp_path):
+    cache = ResultCache(str(tmp_path), context = 'ctx')
+    key = cache.key('data', {'alpha': 1})
+
+    assert cache.get(key) is None
+    assert cache.get(key, default = -1) == -1
+
+    cache.put(key, {'score': 0.5})
+
+    assert cache.get(key) == {'score': 0.5}
+    assert cache.key('data', {'alpha': 1}) == key
+    assert cache.key('data', {'alpha': 2}) != key
+    assert _files(str(tmp_path), '.tmp') == []
+
+
+def test_evictLeastRecentlyUsed(tmp_path):
+    value = np.zeros(1000)
+    cache = ResultCache(str(tmp_path), max_size = 2*value.nbytes + 2000)
+
+    keys = [cache.key(i) for i in range(3)]
+
+    cache.put(keys[0], value)
+    cache.put(keys[1], value)
+
+    # The first result becomes the most recently used
+    old = time.time() - 100
+    os.utime(os.path.join(str(tmp_path), keys[1] + '.dump'), (old, old))
+    assert cache.get(keys[0]) is not None
+
+    cache.put(keys[2], value)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_staleTempFiles(tmp_path):
+    directory = str(tmp_path)
+    cache = ResultCache(directory, max_size = 10000)
+
+    stale = _tempFile(directory, 'stale.tmp',
+        size = 100000, age = resultCache.C_TEMP_FILE_MAX_AGE + 60)
+    fresh = _tempFile(directory, 'fresh.tmp', size = 9000, age = 0)
+
+    key = cache.key('a')
+    cache.put(key, np.zeros(200))
+
+    # The stale file is removed, the fresh one (a write in progress) is kept
+    # and counted in the size, which evicts the stored result
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+    assert cache.get(key) is None
+
+    os.remove(fresh)
+    cache.put(key, np.zeros(200))
+
+    assert cache.get(key) is not None
+
+
+def test_interruptedWrite(tmp_path):
+    cache = ResultCache(str(tmp_path))
+
+    with pytest.raises(Exception):
+        cache.put(cache.key('a'), lambda x: x)
+
+    assert _files(str(tmp_path), '.tmp') == []
+    assert _files(str(tmp_path), '.dump') == []
@@ -0,0 +1,168 @@
+'''
+File name: test_rnn.py
+    Tests of the recurrent models: the gradients of the backward passes are
+    checked against finite differences of the loss, and the online updates.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rnn import RNN
+from lstm import LSTM
+
+'''
+Constants
+'''
+# Relative tolerance of the gradients, and finite differences step
+C_GRADIENT_TOLERANCE = 1e-5
+C_EPSILON = 1e-6
+
+
+def _model(model_class, window = 6, features = 3, **model_params):
+    '''
+    A model with initialized weights (random biases, so that none of the
+    gradients is trivially zero), and a mini-batch of windows and targets.
+    '''
+
+    model = model_class(model_params = dict({'hidden_size': 5,
+        'window': window}, **model_params))
+
+    rng = np.random.RandomState(0)
+    model._weights = model._initialize(features)
+
+    for name, weight in model._weights.items():
+        if name.startswith('b'):
+            weight += rng.normal(scale = 0.5, size = weight.shape)
+
+    return model, rng.normal(size = (4, window, features)), rng.normal(size = 4)
+
+
+def _loss(model, x, y):
+    '''
+    The training loss of the models: mean squared error (halved).
+    '''
+
+    error = model._forward(x, store = False)[0] - y
+
+    return np.dot(error, error)/(2.*len(y))
+
+
+def _numericalGradients(model, x, y):
+    '''
+    Central finite differences of the loss for each weight.
+    '''
+
+    grads = {}
+
+    for name, weight in model._weights.items():
+        grads[name] = np.zeros_like(weight)
+
+        for i in np.ndindex(weight.shape):
+            value = weight[i]
+
+            weight[i] = value + C_EPSILON
+            loss_plus = _loss(model, x, y)
+            weight[i] = value - C_EPSILON
+            loss_minus = _loss(model, x, y)
+            weight[i] = value
+
+            grads[name][i] = (loss_plus - loss_minus)/(2.*C_EPSILON)
+
+    return grads
+
+
+def _gradients(model, x, y):
+    '''
+    The gradients of the backward pass.
+    '''
+
+    prediction, activations = model._forward(x)
+
+    return model._backward(x, activations, (prediction - y)/len(y))
+
+
+@pytest.mark.parametrize('model_class, model_params', [(RNN, {}),
+    (LSTM, {'bptt_steps': None})])
+def test_gradients(model_class, model_params):
+    model, x, y = _model(model_class, **model_params)
+
+    grads = _gradients(model, x, y)
+    expected = _numericalGradients(model, x, y)
+
+    assert grads.keys() == expected.keys()
+
+    for name in grads.keys():
+        assert np.allclose(grads[name], expected[name], rtol =
+            C_GRADIENT_TOLERANCE, atol = C_GRADIENT_TOLERANCE), name
+
+
+def test_lstmWholeWindowTruncation():
+    # bptt_steps equal to the window is the untruncated backward pass
+    model, x, y = _model(LSTM, window = 6, bptt_steps = None)
+    full = _gradients(model, x, y)
+
+    model._params['bptt_steps'] = 6
+    truncated = _gradients(model, x, y)
+
+    for name in full.keys():
+        assert np.allclose(full[name], truncated[name]), name
+
+
+def test_lstmTruncationKeepsPredictions():
+    model, x, y = _model(LSTM, window = 6, bptt_steps = 2)
+
+    stored = model._forward(x)[0].copy()
+
+    assert np.allclose(stored, model._forward(x, store = False)[0])
+
+
+@pytest.mark.parametrize('model_class', [RNN, LSTM])
+def test_trainingReducesLoss(model_class):
+    steps = np.arange(300)
+    data = pd.DataFrame({'hour': steps % 24, 'requests': 100. + 50.*np.sin(
+        2.*np.pi*steps/24.)})
+
+    model = model_class(model_params = {'hidden_size': 8, 'window': 24,
+        'epochs': 5, 'learning_rate': 0.01})
+    model.train(data)
+
+    assert model.loss_curve[-1] < model.loss_curve[0]
+
+
+@pytest.mark.parametrize('model_class', [RNN, LSTM])
+def test_updateInChunks(model_class):
+    steps = np.arange(300)
+    data = pd.DataFrame({'hour': steps % 24, 'requests': 100. + 50.*np.sin(
+        2.*np.pi*steps/24.)})
+    model_params = {'hidden_size': 8, 'window': 24, 'epochs': 2,
+        'batch_size': 12}
+
+    # An untrained model is trained by its first update
+    models = [model_class(model_params = model_params) for _ in range(3)]
+    models[0].train(data.iloc[:240])
+
+    for model in models[1:]:
+        model.update(data.iloc[:240])
+
+    # The mini-batches of an update follow the time steps, so chunks of whole
+    # mini-batches give the same model as a single update
+    models[1].update(data.iloc[240:300])
+    models[2].update(data.iloc[240:264])
+    models[2].update(data.iloc[264:300])
+
+    for name, weight in models[0]._weights.items():
+        assert not np.array_equal(weight, models[1]._weights[name])
+        assert np.allclose(models[1]._weights[name], models[2]._weights[name])
+
+    assert np.allclose(models[1].predict(data.iloc[:24]),
+        models[2].predict(data.iloc[:24]))
@@ -0,0 +1,115 @@
+'''
+File name: test_timeIndex.py
+    Tests of the time index: the range lookups are checked against boolean
+    masks of the data, and an extended index against a rebuilt one.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import timeIndex as ti
+
+
+def _data(rows = 500, hosts = ('host_a', 'host_b', 'host_c'), seed = 0):
+    '''
+    Hourly data of a few hosts, not in time order, with repeated times.
+    '''
+
+    rng = np.random.RandomState(seed)
+    dates = pd.Timestamp('2020-03-01') + pd.to_timedelta(rng.randint(0, 200,
+        rows), unit = 'h')
+
+    return pd.DataFrame({'date': dates.strftime('%Y-%m-%d %H:%M:%S'),
+        'host': rng.choice(hosts, rows), 'requests': rng.randint(0, 100,
+        rows)})
+
+
+def _mask(data, start, end, host):
+    '''
+    Boolean mask of the rows in a time range, for a host or all the hosts.
+    '''
+
+    times = pd.to_datetime(data.date)
+    mask = np.ones(len(data.index), dtype = bool)
+
+    if start is not None:
+        mask &= times >= pd.Timestamp(start)
+
+    if end is not None:
+        mask &= times <= pd.Timestamp(end)
+
+    if host is not None:
+        mask &= data.host == host
+
+    return mask
+
+
+@pytest.mark.parametrize('start, end', [(None, None), ('2020-03-02', None),
+    (None, '2020-03-05 12:00:00'), ('2020-03-03 07:00:00',
+    '2020-03-03 07:00:00'), ('2020-03-04', '2020-03-06 23:00:00'),
+    ('2021-01-01', None)])
+@pytest.mark.parametrize('host', [None, 'host_a', 'host_c', 'host_z'])
+def test_sliceMatchesMask(start, end, host):
+    data = _data()
+    index = ti.TimeIndex(data)
+
+    rows = index.slice(data, start, end, host)
+    expected = data[_mask(data, start, end, host)]
+
+    # Same rows, in time order
+    assert sorted(rows.index) == sorted(expected.index)
+    assert pd.to_datetime(rows.date).is_monotonic_increasing
+
+
+def test_hostOnDataWithoutHost():
+    data = _data().drop(columns = 'host')
+
+    with pytest.raises(ValueError):
+        ti.TimeIndex(data).query(host = 'host_a')
+
+
+def test_timestampsFromTokens():
+    data = pd.DataFrame({'year': [2020, 2021], 'month': [3, 12],
+        'day': [1, 31], 'hour': [0, 23]})
+
+    assert list(ti.timestamps(data)) == list(np.array(['2020-03-01T00',
+        '2021-12-31T23'], dtype = 'datetime64[s]'))
+
+
+@pytest.mark.parametrize('split, hosts', [(300, ('host_a', 'host_b',
+    'host_c')), (300, ('host_b', 'host_d')), (0, ('host_a',))])
+def test_extendMatchesRebuild(split, hosts):
+    data = pd.concat([_data(), _data(200, hosts, seed = 1)],
+        ignore_index = True)
+
+    index = ti.TimeIndex(data.iloc[:split]).extend(data.iloc[split:])
+    rebuilt = ti.TimeIndex(data)
+
+    assert index.rows == rebuilt.rows
+    assert index.end() == rebuilt.end()
+
+    for name in ['_times', '_time_order', '_hosts', '_host_order',
+        '_host_codes', '_host_times']:
+        assert np.array_equal(getattr(index, name), getattr(rebuilt, name))
+
+
+def test_saveLoad(tmp_path):
+    data = _data()
+    index_file = str(tmp_path/'data.csv') + ti.C_INDEX_EXTENSION
+
+    ti.TimeIndex(data).save(index_file)
+    index = ti.TimeIndex.load(index_file)
+
+    assert index.rows == len(data.index)
+    assert np.array_equal(index.query('2020-03-02', '2020-03-04', 'host_b'),
+        ti.TimeIndex(data).query('2020-03-02', '2020-03-04', 'host_b'))
@@ -0,0 +1,141 @@
+'''
+File name: test_trafficForecast.py
+    Tests of the rolling origin backtesting: the parallel folds match the
+    folds executed one by one, and a fold does not depend on the data after
+    its test data (the preprocessing is fitted on its train data only). The
+    online update of a recurrent model artifact.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import trafficForecast as tf
+import utils as ut
+
+'''
+Constants
+'''
+# Small and fast model of the backtests
+C_MODEL = 'RNN'
+C_MODEL_PARAMS = {'hidden_size': 4, 'window': 7, 'epochs': 2}
+
+
+@pytest.fixture
+def inputData():
+    '''
+    Daily processed data of a single series, with a trend and a weekly season.
+    '''
+
+    times = pd.date_range('2019-01-01', periods = 240, freq = 'D')
+    steps = np.arange(len(times))
+
+    return pd.DataFrame({'year': times.year, 'month': times.month,
+        'day': times.day, 'week_day': times.weekday, 'requests': (1000. +
+        5.*steps + 200.*np.sin(2.*np.pi*steps/7.)).astype('int64')})
+
+
+@pytest.fixture
+def trafficForecast(inputData, tmp_path, monkeypatch):
+    '''
+    A TF object of the input data, executed in a directory next to a graphs
+    directory (the backtest plot is saved in ../graphs/forecasts/).
+    '''
+
+    (tmp_path/'graphs'/'forecasts').mkdir(parents = True)
+    (tmp_path/'source').mkdir()
+    monkeypatch.chdir(tmp_path/'source')
+
+    input_file = str(tmp_path/'traffic_stats_DAILY_CHs.csv')
+    inputData.to_csv(input_file, index = False)
+
+    return tf.TF(input_file, 0.2)
+
+
+def _folds(data, folds, max_train_size = None):
+    '''
+    The folds of the backtest, see TF.backtest().
+    '''
+
+    return [(i, train[0], train[-1] + 1, test[-1] + 1) for i, (train, test) in
+        enumerate(ut.timeSeriesCV(data, folds, max_train_size))]
+
+
+def _execute(fold, data, standardize = True):
+    return tf._backtestFold(fold, {'input_data': data, 'model': C_MODEL,
+        'model_params': C_MODEL_PARAMS, 'normalize': False,
+        'standardize': standardize})
+
+
+@pytest.mark.parametrize('max_train_size', [None, 60])
+def test_backtestMatchesSerialFolds(trafficForecast, inputData,
+    max_train_size):
+    fold_scores, scores = trafficForecast.backtest(standardize = True,
+        model = C_MODEL, model_params = C_MODEL_PARAMS, folds = 3,
+        max_train_size = max_train_size)
+
+    folds = _folds(inputData, 3, max_train_size)
+    results = [_execute(fold, inputData) for fold in folds]
+
+    assert list(fold_scores.index) == [0, 1, 2]
+
+    for (number, train_start, train_end, test_end), (fold_score, _) in zip(
+        folds, results):
+        assert fold_scores.loc[number, 'train_size'] == train_end - \
+            train_start
+        assert fold_scores.loc[number, 'test_size'] == test_end - train_end
+
+        for metric in fold_scores.columns:
+            assert fold_scores.loc[number, metric] == pytest.approx(
+                fold_score[metric])
+
+    # Metrics of all the folds forecasts, and their mean over the folds
+    forecast = np.concatenate([r[1] for r in results])
+    actual = inputData.requests.iloc[folds[0][2]:folds[-1][3]]
+
+    assert scores['r2'] == pytest.approx(tf._scores(actual, forecast)['r2'])
+    assert scores['r2_mean'] == pytest.approx(fold_scores.r2.mean())
+
+
+def test_foldIgnoresLaterData(inputData):
+    fold = _folds(inputData, 3)[0]
+
+    # The data after the test data of the fold are changed
+    changed = inputData.copy()
+    changed.iloc[fold[3]:, :-1] *= 10
+
+    score, forecast = _execute(fold, inputData)
+    changed_score, changed_forecast = _execute(fold, changed)
+
+    assert np.allclose(forecast, changed_forecast)
+    assert score == pytest.approx(changed_score)
+
+
+def test_unsupportedModel(trafficForecast):
+    assert trafficForecast.backtest(model = 'ARIMA') is None
+
+
+def test_updateRecurrentModel(trafficForecast, inputData, tmp_path):
+    artifact_file = trafficForecast.train(model = C_MODEL,
+        model_params = C_MODEL_PARAMS,
+        artifact_file = str(tmp_path/'artifact.dump'))
+
+    times = pd.date_range('2019-08-29', periods = 30, freq = 'D')
+    new_data = inputData.iloc[-30:].assign(year = times.year,
+        month = times.month, day = times.day, week_day = times.weekday)
+
+    trafficForecast.update(new_data, artifact_file, batch_size = 7)
+    forecast = trafficForecast.forecast(5)
+
+    # The forecasts start after the new data
+    assert (forecast['month'].iloc[0], forecast['day'].iloc[0]) == (9, 28)
+    assert np.isfinite(forecast['requests'].to_numpy(dtype = 'float64')).all()
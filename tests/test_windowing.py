@@ -0,0 +1,103 @@
+'''
+File name: test_windowing.py
+    Tests of the windowing module: the lag and rolling mean features are
+    checked against the pandas shift and rolling of the series.
+
+Author: Vasileios Saveris
+email: vsaveris@gmail.com
+
+License: MIT
+
+Date last modified: 17.10.2026
+
+Python Version: 3.8
+'''
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import windowing as wd
+
+
+def _series(steps = 400, seed = 0):
+    '''
+    Hourly processed data of a single series (date tokens and requests).
+    '''
+
+    times = pd.date_range('2020-03-01', periods = steps, freq = 'h')
+
+    return pd.DataFrame({'year': times.year, 'month': times.month,
+        'day': times.day, 'week_day': times.weekday, 'hour': times.hour,
+        'requests': np.random.RandomState(seed).randint(0, 1000, steps)})
+
+
+@pytest.mark.parametrize('lags', [[1], [1, 24, 168], [5, 2, 12]])
+def test_lagFeaturesMatchShift(lags):
+    values = _series().requests
+
+    lagged = wd.lagFeatures(values.to_numpy(), lags)
+    expected = np.column_stack([values.shift(l) for l in lags])[max(lags):]
+
+    assert np.array_equal(lagged, expected)
+
+
+@pytest.mark.parametrize('window', [1, 3, 24, 168])
+def test_rollingMeanMatchesRolling(window):
+    values = _series().requests
+
+    means = wd.rollingMean(values.to_numpy(), window)
+    expected = values.shift(1).rolling(window).mean().to_numpy()[window:]
+
+    assert np.allclose(means, expected)
+
+
+def test_addLagFeaturesMatchesShift():
+    data = _series()
+    lags, rolling_windows = [1, 24], [6, 24]
+
+    features = wd.addLagFeatures(data, lags, rolling_windows)
+    start = max(lags + rolling_windows)
+
+    assert features.columns[-1] == 'requests'
+    assert len(features.index) == len(data.index) - start
+    assert features.attrs['filled_steps'] == 0
+
+    for l in lags:
+        assert np.array_equal(features['requests_lag_' + str(l)],
+            data.requests.shift(l)[start:])
+
+    for w in rolling_windows:
+        assert np.allclose(features['requests_mean_' + str(w)],
+            data.requests.shift(1).rolling(w).mean()[start:])
+
+
+def test_regularizeInterpolatesMissingSteps():
+    data = _series(48)
+    data.loc[:, 'requests'] = 100
+    data.loc[10, 'requests'] = 200
+
+    # Hours 11 and 12 are missing
+    regular = wd.regularize(data.drop(index = [11, 12]))
+
+    assert regular.attrs['filled_steps'] == 2
+    assert len(regular.index) == 48
+    assert regular[['year', 'month', 'day', 'week_day', 'hour']].equals(
+        data[['year', 'month', 'day', 'week_day', 'hour']].astype(
+        regular.dtypes.iloc[:5].to_dict()))
+    assert list(regular.requests[10:14]) == [200, 167, 133, 100]
+
+
+def test_windowsAreViews():
+    values = np.arange(10.)
+
+    windows = wd.windows(values, 3)
+
+    assert windows.shape == (8, 3)
+    assert np.shares_memory(windows, values)
+    assert list(windows[2]) == [2., 3., 4.]
+
+
+def test_regularizeRejectsHosts():
+    with pytest.raises(ValueError):
+        wd.regularize(_series().assign(host = 'host_a'))